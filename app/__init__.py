@@ -1,5 +1,84 @@
 """
 VyerWall GUI - Web interface for VyOS firewall management
 """
+import os
+
+from flask import Flask
 
 __version__ = "1.0.0"
+
+
+def create_app(start_background: bool = True) -> Flask:
+    """
+    Build and configure the Flask application.
+
+    Args:
+        start_background: Start the background samplers in this process. Pass
+            False when a server forks workers after loading the app (gunicorn
+            with preload_app), since threads do not survive a fork; the server
+            starts them in the worker instead.
+
+    Returns:
+        The configured Flask application with app.device set
+    """
+    from dotenv import load_dotenv
+
+    # Module-level tuning constants are read at import time, so load .env first
+    load_dotenv()
+
+    import urllib3
+
+    from app.auth.views import index, login, logout
+    from app.core import config_bp, is_config_dirty, start_samplers
+    from app.modules.dashboard import dashboard_bp
+    from app.modules.dhcp import dhcp_bp
+    from app.modules.firewall import rules_bp, zone_bp
+    from app.modules.firewall_groups import firewall_groups_bp
+    from app.modules.interfaces import interfaces_bp
+    from app.modules.logs import logs_bp
+    from app.modules.nat import nat_bp
+    from app.modules.static_routes import static_routes_bp
+    from app.pyvyos import VyDevice
+
+    urllib3.disable_warnings()
+
+    app = Flask(__name__, template_folder='templates', static_folder='static')
+    app.secret_key = os.getenv('SECRET_KEY', 'supersecretkey')
+
+    # Context processor to make config status available to all templates
+    @app.context_processor
+    def inject_config_status():
+        return dict(config_dirty=is_config_dirty())
+
+    # One client shared by every request thread; each call opens its own
+    # connection, bounded by VYDEVICE_TIMEOUT so a hung router frees the thread
+    verify_ssl = os.getenv('VYDEVICE_VERIFY_SSL')
+    app.device = VyDevice(
+        hostname=os.getenv('VYDEVICE_HOSTNAME'),
+        apikey=os.getenv('VYDEVICE_APIKEY'),
+        port=os.getenv('VYDEVICE_PORT'),
+        protocol=os.getenv('VYDEVICE_PROTOCOL'),
+        verify=verify_ssl.lower() == "true" if verify_ssl else True,
+        timeout=int(os.getenv('VYDEVICE_TIMEOUT', '30')),
+    )
+
+    # Register Blueprints
+    app.register_blueprint(dashboard_bp)
+    app.register_blueprint(interfaces_bp)
+    app.register_blueprint(logs_bp)
+    app.register_blueprint(dhcp_bp)
+    app.register_blueprint(rules_bp)
+    app.register_blueprint(zone_bp)
+    app.register_blueprint(config_bp)
+    app.register_blueprint(nat_bp)
+    app.register_blueprint(static_routes_bp)
+    app.register_blueprint(firewall_groups_bp)
+
+    app.add_url_rule('/', 'index', index)
+    app.add_url_rule('/login', 'login', login, methods=['GET', 'POST'])
+    app.add_url_rule('/logout', 'logout', logout, methods=['POST'])
+
+    if start_background:
+        start_samplers(app)
+
+    return app
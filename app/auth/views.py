@@ -0,0 +1,36 @@
+"""
+Login, logout and the root redirect
+"""
+import os
+
+from flask import render_template, request, redirect, url_for, flash, session
+
+
+def index():
+    """Redirect to dashboard or login."""
+    if 'user' in session:
+        return redirect(url_for('dashboard.dashboard'))
+    return redirect(url_for('login'))
+
+
+def login():
+    """Handle user login."""
+    if request.method == 'POST':
+        username = request.form.get('username')
+        password = request.form.get('password')
+
+        # Simple check against environment variables
+        if username == os.getenv('USERNAME') and password == os.getenv('PASSWORD'):
+            session['user'] = username
+            return redirect(url_for('dashboard.dashboard'))
+        else:
+            flash("Invalid username or password.", "error")
+
+    return render_template('login.html')
+
+
+def logout():
+    """Handle user logout."""
+    session.pop('user', None)
+    flash("You have been logged out.", "info")
+    return redirect(url_for('login'))
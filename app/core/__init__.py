@@ -7,10 +7,36 @@ from .config_manager import (
     mark_config_clean,
     is_config_dirty
 )
+from .config_cache import (
+    bump_config_revision,
+    cached_by_revision,
+    config_revision,
+    load_config_subtree
+)
+from .intervals import Interval, merge_intervals
+from .uploads import JSON_IMPORT_MAX_BYTES, load_json_upload
+from .tables import iter_fixed_width_table, iter_lines, parse_fixed_width_table
+from .storage import get_db
+from .sampler import register_sampler, start_samplers, stop_samplers
 
 __all__ = [
     'config_bp',
     'mark_config_dirty',
     'mark_config_clean',
-    'is_config_dirty'
+    'is_config_dirty',
+    'bump_config_revision',
+    'cached_by_revision',
+    'config_revision',
+    'load_config_subtree',
+    'Interval',
+    'merge_intervals',
+    'iter_fixed_width_table',
+    'iter_lines',
+    'parse_fixed_width_table',
+    'get_db',
+    'JSON_IMPORT_MAX_BYTES',
+    'load_json_upload',
+    'register_sampler',
+    'start_samplers',
+    'stop_samplers'
 ]
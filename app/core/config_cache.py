@@ -0,0 +1,83 @@
+"""
+Config-revision cache for VyOS configuration subtrees and the indexes built from them.
+
+Every configuration change made through the GUI bumps a process-wide revision
+number. Cached entries are reused until the revision moves on or they age past
+CONFIG_CACHE_TTL, so changes made directly on the router are still picked up.
+Cached values are shared between requests and must be treated as read-only.
+"""
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Sequence, Tuple
+
+from flask import current_app
+
+CONFIG_CACHE_TTL = float(os.getenv("CONFIG_CACHE_TTL", "30"))
+
+_lock = threading.Lock()
+_revision = 0
+_entries: Dict[Hashable, Tuple[int, float, Any]] = {}
+
+
+def config_revision() -> int:
+    """Return the current configuration revision number."""
+    return _revision
+
+
+def bump_config_revision() -> int:
+    """Invalidate every cached subtree and index after a configuration change."""
+    global _revision
+    with _lock:
+        _revision += 1
+        _entries.clear()
+        return _revision
+
+
+def cached_by_revision(key: Hashable, builder: Callable[[], Any]) -> Any:
+    """
+    Return builder() memoised for the current configuration revision.
+
+    Args:
+        key: Cache key, unique per cached structure
+        builder: Zero-argument callable producing the value
+
+    Returns:
+        The cached or freshly built value
+    """
+    now = time.monotonic()
+    with _lock:
+        entry = _entries.get(key)
+        if entry and entry[0] == _revision and now - entry[1] < CONFIG_CACHE_TTL:
+            return entry[2]
+        revision = _revision
+
+    value = builder()
+
+    with _lock:
+        # Only store the value if no configuration change happened while building
+        if revision == _revision:
+            _entries[key] = (revision, now, value)
+    return value
+
+
+def load_config_subtree(path: Sequence[str]) -> Dict[str, Any]:
+    """
+    Return retrieve_show_config(path).result, cached per configuration revision.
+
+    Args:
+        path: Configuration path, e.g. ["firewall", "group"]
+
+    Returns:
+        The subtree as a dict, or an empty dict if it is missing or unreadable
+    """
+    def _fetch() -> Dict[str, Any]:
+        try:
+            response = current_app.device.retrieve_show_config(path=list(path))
+            result = getattr(response, "result", {}) or {}
+        except Exception as exc:
+            current_app.logger.error(f"Error fetching config {' '.join(path)}: {exc}")
+            result = {}
+        return result if isinstance(result, dict) else {}
+
+    return cached_by_revision(("config",) + tuple(path), _fetch)
@@ -3,12 +3,14 @@ Global configuration management for tracking unsaved changes across the applicat
 """
 from flask import Blueprint, current_app, jsonify, session, request
 from app.auth import login_required
+from app.core.config_cache import bump_config_revision
 
 config_bp = Blueprint("config_manager", __name__, url_prefix="/config")
 
 
 def mark_config_dirty():
     """Mark that there are unsaved configuration changes."""
+    bump_config_revision()
     session['config_dirty'] = True
     session.modified = True
 
@@ -0,0 +1,19 @@
+"""
+Integer address intervals shared by the firewall feed importer and DHCP capacity.
+"""
+from typing import Iterable, List, Tuple
+
+# Inclusive (first, last) address range as integers
+Interval = Tuple[int, int]
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """Merge overlapping and adjacent (first, last) intervals into a sorted list."""
+    merged: List[Interval] = []
+    for first, last in sorted(intervals):
+        if merged and first <= merged[-1][1] + 1:
+            if last > merged[-1][1]:
+                merged[-1] = (merged[-1][0], last)
+        else:
+            merged.append((first, last))
+    return merged
@@ -0,0 +1,89 @@
+"""
+Background samplers that poll the router on a fixed interval.
+
+Modules register a sampler at import time; the serving entry point starts
+them once the app is configured. Each sampler runs in its own daemon thread
+inside an app context, so it can use current_app.device like a request
+handler would.
+
+Under a multi-process server every worker imports the same samplers, but only
+one should poll the router and write the history databases. start_samplers
+with exclusive=True takes a lock file in DATA_DIR and starts nothing when
+another worker already holds it; the lock is released when its holder exits.
+"""
+import os
+import threading
+from typing import IO, Callable, Dict, Optional, Tuple
+
+from flask import Flask
+
+from .storage import DATA_DIR
+
+SAMPLERS_ENABLED = os.getenv("SAMPLERS_ENABLED", "true").lower() == "true"
+
+_samplers: Dict[str, Tuple[float, Callable[[], None]]] = {}
+_threads: Dict[str, threading.Thread] = {}
+_stop = threading.Event()
+_leader_lock: Optional[IO[str]] = None
+
+
+def register_sampler(name: str, interval: float, func: Callable[[], None]) -> None:
+    """Register func to be called every interval seconds once samplers start."""
+    _samplers[name] = (interval, func)
+
+
+def _run(app: Flask, name: str, interval: float, func: Callable[[], None]) -> None:
+    while not _stop.wait(interval):
+        with app.app_context():
+            try:
+                func()
+            except Exception as exc:
+                app.logger.error(f"Sampler {name} failed: {exc}")
+
+
+def _acquire_leader_lock() -> bool:
+    global _leader_lock
+    if _leader_lock is not None:
+        return True
+
+    import fcntl
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    handle = open(os.path.join(DATA_DIR, "samplers.lock"), "w")
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return False
+    _leader_lock = handle
+    return True
+
+
+def start_samplers(app: Flask, exclusive: bool = False) -> bool:
+    """
+    Start a daemon thread for every registered sampler that is not running yet.
+
+    Args:
+        app: Application the samplers run in
+        exclusive: Only start when no other process on this host runs them
+
+    Returns:
+        True when this process runs the samplers
+    """
+    if not SAMPLERS_ENABLED or app.config.get("TESTING"):
+        return False
+    if exclusive and not _acquire_leader_lock():
+        return False
+
+    for name, (interval, func) in _samplers.items():
+        if name in _threads and _threads[name].is_alive():
+            continue
+        thread = threading.Thread(target=_run, args=(app, name, interval, func), name=f"sampler-{name}", daemon=True)
+        _threads[name] = thread
+        thread.start()
+    return True
+
+
+def stop_samplers() -> None:
+    """Signal all sampler threads to exit after their current run."""
+    _stop.set()
@@ -0,0 +1,51 @@
+"""
+Local SQLite storage for history the GUI keeps between requests.
+
+Databases live under DATA_DIR (default ./data), one file per feature. Each
+thread gets its own connection, so request handlers and background samplers
+can share a database without locking each other out.
+"""
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable
+
+DATA_DIR = os.getenv("DATA_DIR", "data")
+
+_local = threading.local()
+_schema_lock = threading.Lock()
+_initialised: Dict[str, bool] = {}
+
+
+def get_db(name: str, schema: Iterable[str] = ()) -> sqlite3.Connection:
+    """
+    Return this thread's connection to DATA_DIR/<name>.db.
+
+    Args:
+        name: Database name, e.g. "dhcp_history"
+        schema: CREATE statements run once per process (use IF NOT EXISTS)
+
+    Returns:
+        An sqlite3 connection with rows returned as sqlite3.Row
+    """
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+
+    connection = connections.get(name)
+    if connection is None:
+        os.makedirs(DATA_DIR, exist_ok=True)
+        connection = sqlite3.connect(os.path.join(DATA_DIR, f"{name}.db"), timeout=10)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connections[name] = connection
+
+    with _schema_lock:
+        if not _initialised.get(name):
+            with connection:
+                for statement in schema:
+                    connection.execute(statement)
+            _initialised[name] = True
+
+    return connection
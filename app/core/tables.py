@@ -0,0 +1,112 @@
+"""
+Parser for the fixed-width tables printed by VyOS op-mode "show" commands.
+
+Most op-mode tables are a header line, a dashed separator and data rows:
+
+    IP Address     MAC address        State    Hostname
+    -------------  -----------------  -------  ----------
+    192.168.1.10   00:11:22:33:44:55  active   laptop
+    192.168.1.11   00:11:22:33:44:66  active
+
+Splitting rows on runs of spaces breaks as soon as a cell is empty, so columns
+are sliced by the character offsets of the separator dashes instead.
+
+Large tables (conntrack, full routing tables) can be walked row by row with
+iter_lines and iter_fixed_width_table so the output is never split into a
+list of lines or rows.
+"""
+import re
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+Span = Tuple[int, Optional[int]]
+
+_DASH_RUN = re.compile(r"-+")
+_HEADER_RUN = re.compile(r"\S+(?: \S+)*")
+
+
+def iter_lines(text: str) -> Iterator[str]:
+    """Yield the lines of a large string without building a list of them."""
+    start = 0
+    while True:
+        end = text.find("\n", start)
+        if end < 0:
+            if start < len(text):
+                yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+
+def _is_separator(line: str) -> bool:
+    stripped = line.strip()
+    return bool(stripped) and set(stripped) <= {"-", " "}
+
+
+def column_spans(header: str, separator: Optional[str] = None) -> List[Span]:
+    """
+    Return (start, end) character offsets for each column.
+
+    Offsets come from the dashed separator when there is one, otherwise from
+    the header words (titles separated by two or more spaces). The last column
+    is open-ended so long trailing values are not truncated.
+    """
+    pattern = _DASH_RUN if separator else _HEADER_RUN
+    starts = [match.start() for match in pattern.finditer(separator or header)]
+    spans: List[Span] = []
+    for index, start in enumerate(starts):
+        end = starts[index + 1] if index + 1 < len(starts) else None
+        spans.append((start, end))
+    return spans
+
+
+def iter_fixed_width_table(lines: Iterable[str],
+                           header_prefix: Optional[str] = None) -> Tuple[List[str], Iterator[List[str]]]:
+    """
+    Streaming form of parse_fixed_width_table.
+
+    Lines are consumed up to the separator to find the headers; the rows are
+    then produced lazily from the rest of the input.
+
+    Returns:
+        Tuple of (headers, iterator of rows); ([], empty iterator) if no table was found
+    """
+    remaining = (line.rstrip() for line in lines if line.strip())
+
+    header = None
+    for line in remaining:
+        if header_prefix is None or line.strip().lower().startswith(header_prefix.lower()):
+            header = line
+            break
+    if header is None:
+        return [], iter(())
+
+    first = next(remaining, None)
+    separator = first if first is not None and _is_separator(first) else None
+    spans = column_spans(header, separator)
+    headers = [header[start:end].strip() for start, end in spans]
+
+    def rows() -> Iterator[List[str]]:
+        if first is not None and separator is None:
+            yield [first[start:end].strip() for start, end in spans]
+        for line in remaining:
+            if _is_separator(line):
+                continue
+            yield [line[start:end].strip() for start, end in spans]
+
+    return headers, rows()
+
+
+def parse_fixed_width_table(text: str, header_prefix: Optional[str] = None) -> Tuple[List[str], List[List[str]]]:
+    """
+    Parse an op-mode table into headers and rows of cell values.
+
+    Args:
+        text: Raw command output
+        header_prefix: Case-insensitive start of the header line, used to skip
+            any preamble; defaults to the first non-empty line
+
+    Returns:
+        Tuple of (headers, rows); empty lists if no table was found
+    """
+    headers, rows = iter_fixed_width_table(iter_lines(str(text or "")), header_prefix)
+    return headers, list(rows)
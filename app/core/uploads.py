@@ -0,0 +1,24 @@
+"""
+Helpers for reading bulk-import uploads.
+
+CSV imports are streamed row by row, but a JSON document has to be parsed
+whole, so JSON uploads are capped at JSON_IMPORT_MAX_BYTES to bound memory.
+"""
+import json
+import os
+from typing import Any
+
+JSON_IMPORT_MAX_BYTES = int(os.getenv("JSON_IMPORT_MAX_BYTES", str(8 * 1024 * 1024)))
+
+
+def load_json_upload(stream, limit: int = JSON_IMPORT_MAX_BYTES) -> Any:
+    """
+    Parse a JSON upload of at most `limit` characters.
+
+    Raises:
+        ValueError: If the upload is larger than the limit or is not valid JSON
+    """
+    text = stream.read(limit + 1)
+    if len(text) > limit:
+        raise ValueError(f"JSON imports are limited to {limit // (1024 * 1024)} MB, use CSV for larger files")
+    return json.loads(text)
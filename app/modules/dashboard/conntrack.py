@@ -0,0 +1,456 @@
+"""
+Connection tracking summary and table.
+
+The dashboard only needs counts, so it reads "show conntrack statistics"
+(a few lines per CPU) instead of downloading "show conntrack table", which
+runs to megabytes on a busy firewall. The table is fetched on demand for the
+connections page; its raw output is kept for CONNTRACK_CACHE_TTL so paging
+does not fetch it again, and each query walks it row by row without
+building a list of connections.
+
+A background sampler also walks both tables every CONNTRACK_SAMPLE_INTERVAL
+and keeps aggregates (per protocol, state and zone, top endpoints) computed
+in one pass with counters, so dashboard polls read a cached summary.
+"""
+import heapq
+import ipaddress
+import os
+import re
+import threading
+import time
+from collections import Counter
+from itertools import dropwhile
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from flask import current_app
+
+from app.core import iter_fixed_width_table, iter_lines, parse_fixed_width_table, register_sampler
+from app.modules.firewall.zone.resolver import get_zone_resolver
+from app.modules.interfaces.device import show_output
+
+CONNTRACK_CACHE_TTL = float(os.getenv("CONNTRACK_CACHE_TTL", "15"))
+CONNTRACK_SAMPLE_INTERVAL = float(os.getenv("CONNTRACK_SAMPLE_INTERVAL", "60"))
+MAX_PAGE_SIZE = 500
+TOP_ENDPOINTS = 20
+UNZONED = "unzoned"
+FAMILIES = ("ipv4", "ipv6")
+
+# Legacy (1.3) output abbreviates TCP states inside the protocol column
+TCP_STATE_CODES = {
+    "SS": "SYN_SENT",
+    "SR": "SYN_RECV",
+    "ES": "ESTABLISHED",
+    "FW": "FIN_WAIT",
+    "CW": "CLOSE_WAIT",
+    "LA": "LAST_ACK",
+    "TW": "TIME_WAIT",
+    "CL": "CLOSE",
+    "LI": "LISTEN",
+}
+
+_COLUMNS = {
+    "id": "id",
+    "conn id": "id",
+    "original src": "src",
+    "source": "src",
+    "original dst": "dst",
+    "destination": "dst",
+    "reply src": "reply_src",
+    "reply dst": "reply_dst",
+    "protocol": "protocol",
+    "state": "state",
+    "timeout": "timeout",
+    "mark": "mark",
+    "zone": "zone",
+}
+
+_STATISTIC_NAMES = {
+    "insert fail": "insert_failed",
+    "early drop": "early_drop",
+    "errors": "error",
+    "search restart": "search_restart",
+}
+
+_TABLE_HEADER = re.compile(r"^\s*(?:conn id|id)\s{2,}", re.IGNORECASE)
+_STATISTIC_PAIR = re.compile(r"([a-z_]+)=(\d+)")
+
+
+class Connection(NamedTuple):
+    id: str
+    protocol: str
+    state: str
+    src: str
+    sport: Optional[int]
+    dst: str
+    dport: Optional[int]
+    reply_src: str
+    reply_dst: str
+    timeout: Optional[int]
+    mark: str
+    zone: str
+
+
+def split_endpoint(value: str) -> Tuple[str, Optional[int]]:
+    """Split "10.0.0.1:443" or "[2001:db8::1]:443" into address and port; bare addresses have no port."""
+    value = value.strip()
+    if value.startswith("["):
+        address, _, rest = value[1:].partition("]")
+        port = rest[1:] if rest.startswith(":") else ""
+        return address, int(port) if port.isdigit() else None
+    address, separator, port = value.rpartition(":")
+    if separator and ":" not in address and port.isdigit():
+        return address, int(port)
+    return value, None
+
+
+def iter_connections(text: str) -> Iterator[Connection]:
+    """Parse "show conntrack table" output lazily, one connection per row."""
+    lines = dropwhile(lambda line: not _TABLE_HEADER.match(line), iter_lines(str(text or "")))
+    headers, rows = iter_fixed_width_table(lines)
+    index = {_COLUMNS[header.lower()]: position for position, header in enumerate(headers) if header.lower() in _COLUMNS}
+    if "src" not in index or "dst" not in index:
+        return
+
+    def column(name: str):
+        position = index.get(name)
+        return (lambda row: row[position]) if position is not None else (lambda row: "")
+
+    get_id, get_src, get_dst = column("id"), column("src"), column("dst")
+    get_reply_src, get_reply_dst = column("reply_src"), column("reply_dst")
+    get_protocol, get_state, get_timeout = column("protocol"), column("state"), column("timeout")
+    get_mark, get_zone = column("mark"), column("zone")
+
+    for row in rows:
+        src, sport = split_endpoint(get_src(row))
+        if not src:
+            continue
+        dst, dport = split_endpoint(get_dst(row))
+        protocol, state = get_protocol(row), get_state(row)
+        if " " in protocol:
+            # Legacy "tcp [6] ES"
+            parts = protocol.split()
+            protocol = parts[0]
+            if not state and len(parts) > 2:
+                state = TCP_STATE_CODES.get(parts[-1], parts[-1])
+        timeout = get_timeout(row)
+        yield Connection(
+            id=get_id(row),
+            protocol=protocol.lower(),
+            state=state.upper(),
+            src=src,
+            sport=sport,
+            dst=dst,
+            dport=dport,
+            reply_src=get_reply_src(row),
+            reply_dst=get_reply_dst(row),
+            timeout=int(timeout) if timeout.isdigit() else None,
+            mark=get_mark(row),
+            zone=get_zone(row),
+        )
+
+
+def count_connections(text: str) -> int:
+    """Number of rows in "show conntrack table" output, without splitting them into columns."""
+    lines = dropwhile(lambda line: not _TABLE_HEADER.match(line), iter_lines(str(text or "")))
+    next(lines, None)
+    return sum(1 for line in lines if line.strip() and line.strip(" -"))
+
+
+def parse_conntrack_statistics(text: str) -> Dict[str, Any]:
+    """
+    Parse "show conntrack statistics" into per-CPU counters and their totals.
+
+    Accepts the op-mode table and the raw "cpu=0 found=0 ..." form. 'entries'
+    is the global connection count when the kernel reports it (the same on
+    every CPU row), otherwise None.
+    """
+    cpus: List[Dict[str, int]] = []
+    for line in str(text or "").splitlines():
+        pairs = _STATISTIC_PAIR.findall(line)
+        if pairs:
+            cpus.append({name: int(value) for name, value in pairs})
+
+    if not cpus:
+        headers, rows = parse_fixed_width_table(text)
+        names = [_STATISTIC_NAMES.get(header.lower(), header.lower().replace(" ", "_")) for header in headers]
+        for row in rows:
+            values = {name: int(value) for name, value in zip(names, row) if name and value.isdigit()}
+            if values:
+                cpus.append(values)
+
+    totals: Dict[str, int] = {}
+    for cpu in cpus:
+        for name, value in cpu.items():
+            if name not in ("cpu", "entries"):
+                totals[name] = totals.get(name, 0) + value
+    entries = [cpu["entries"] for cpu in cpus if "entries" in cpu]
+    return {"cpus": cpus, "totals": totals, "entries": max(entries) if entries else None}
+
+
+_lock = threading.Lock()
+_table_lock = threading.Lock()
+_sample_lock = threading.Lock()
+_tables: Dict[str, Tuple[float, str]] = {}
+_summary: Dict[str, Any] = {}
+_aggregates: Dict[str, Any] = {}
+
+
+def _fetch_table(family: str, force: bool = False) -> Tuple[float, str]:
+    """
+    Raw conntrack table of a family, fetched at most once per CONNTRACK_CACHE_TTL.
+
+    A failed fetch keeps the previous table, so a router error is never shown
+    as an empty connection table.
+
+    Raises:
+        ValueError: For an unknown family
+        DeviceCommandError: If the fetch fails and no table was fetched before
+    """
+    if family not in FAMILIES:
+        raise ValueError(f"Unknown address family: {family}")
+    with _table_lock:
+        cached = _tables.get(family)
+        if cached and not force and time.monotonic() - cached[0] < CONNTRACK_CACHE_TTL:
+            return cached
+        try:
+            text = show_output(["conntrack", "table", family])
+        except Exception as exc:
+            current_app.logger.error(f"Failed to fetch {family} conntrack table: {exc}")
+            if cached is None:
+                raise
+            return cached
+        cached = _tables[family] = (time.monotonic(), text)
+        return cached
+
+
+def get_conntrack_summary() -> Dict[str, Any]:
+    """
+    Connection count and kernel conntrack counters, refreshed at most once per CONNTRACK_CACHE_TTL.
+
+    The count comes from the statistics when the kernel reports it; otherwise
+    the IPv4 table is fetched once and its rows counted without parsing them.
+    """
+    with _lock:
+        if _summary and time.monotonic() - _summary["fetched_at"] < CONNTRACK_CACHE_TTL:
+            return _summary["value"]
+
+    statistics = {"cpus": [], "totals": {}, "entries": None}
+    try:
+        statistics = parse_conntrack_statistics(show_output(["conntrack", "statistics"]))
+    except Exception as exc:
+        current_app.logger.error(f"Failed to fetch conntrack statistics: {exc}")
+
+    connections = statistics["entries"]
+    if connections is None:
+        aggregates = _fresh_aggregates()
+        if aggregates:
+            # The sampler has just walked the tables anyway
+            connections = aggregates["total"]
+        else:
+            _, text = _fetch_table("ipv4")
+            connections = count_connections(text)
+
+    value = {"connections": connections, **statistics}
+    with _lock:
+        _summary.update(fetched_at=time.monotonic(), value=value)
+    return value
+
+
+def _address_matcher(address: str):
+    """Exact address or CIDR match against either end of a connection."""
+    if "/" in address:
+        network = ipaddress.ip_network(address, strict=False)
+
+        def in_network(value: str) -> bool:
+            try:
+                return ipaddress.ip_address(value) in network
+            except ValueError:
+                return False
+
+        return lambda connection: in_network(connection.src) or in_network(connection.dst)
+    ipaddress.ip_address(address)
+    return lambda connection: address in (connection.src, connection.dst)
+
+
+def query_connections(family: str = "ipv4", protocol: Optional[str] = None, state: Optional[str] = None,
+                      address: Optional[str] = None, port: Optional[int] = None,
+                      offset: int = 0, limit: int = 100, force: bool = False) -> Dict[str, Any]:
+    """
+    Filter the conntrack table and return one page of connections.
+
+    Args:
+        family: ipv4 or ipv6
+        protocol: tcp, udp, icmp, ...
+        state: Connection state, e.g. ESTABLISHED
+        address: Address or CIDR matched against source and destination
+        port: Source or destination port
+        offset: Matches to skip
+        limit: Page size, capped at MAX_PAGE_SIZE
+        force: Fetch the table again even if the cached copy is fresh
+
+    Returns:
+        Dict with 'total' matches, 'table_size', per-protocol 'protocols'
+        counts, 'offset', 'limit' and the page of 'connections'
+
+    Raises:
+        ValueError: For an unknown family or an invalid address
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    offset = max(0, offset)
+    matches_address = _address_matcher(address.strip()) if address else None
+    protocol = protocol.strip().lower() if protocol else None
+    state = state.strip().upper() if state else None
+
+    _, text = _fetch_table(family, force)
+    table_size = 0
+    total = 0
+    protocols: Counter = Counter()
+    page: List[Connection] = []
+    for connection in iter_connections(text):
+        table_size += 1
+        protocols[connection.protocol] += 1
+        if protocol and connection.protocol != protocol:
+            continue
+        if state and connection.state != state:
+            continue
+        if port is not None and port not in (connection.sport, connection.dport):
+            continue
+        if matches_address and not matches_address(connection):
+            continue
+        if offset <= total < offset + limit:
+            page.append(connection)
+        total += 1
+
+    return {
+        "total": total,
+        "table_size": table_size,
+        "protocols": dict(sorted(protocols.items())),
+        "offset": offset,
+        "limit": limit,
+        "connections": [connection._asdict() for connection in page],
+    }
+
+
+
+def _top(counter: Counter, limit: int) -> List[Tuple[Any, int]]:
+    return heapq.nlargest(limit, counter.items(), key=itemgetter(1))
+
+
+def aggregate_connections(connections: Iterable[Connection], resolve_zone: Callable[[str], Optional[str]],
+                          top: int = TOP_ENDPOINTS) -> Dict[str, Any]:
+    """
+    Summarise connections in a single pass.
+
+    Args:
+        connections: Parsed connections, e.g. from iter_connections
+        resolve_zone: Maps an address to its firewall zone (None if unzoned)
+        top: How many endpoints to report per ranking
+
+    Returns:
+        Dict with 'total', counts by 'protocols', 'states', 'source_zones',
+        'destination_zones' and 'zone_pairs', and the busiest 'top_sources',
+        'top_destinations' and 'top_services' by flow count
+    """
+    protocols: Counter = Counter()
+    states: Counter = Counter()
+    zone_pairs: Counter = Counter()
+    sources: Counter = Counter()
+    destinations: Counter = Counter()
+    services: Counter = Counter()
+    total = 0
+
+    for connection in connections:
+        total += 1
+        protocols[connection.protocol] += 1
+        if connection.state:
+            states[connection.state] += 1
+        zone_pairs[(resolve_zone(connection.src) or UNZONED, resolve_zone(connection.dst) or UNZONED)] += 1
+        sources[connection.src] += 1
+        destinations[connection.dst] += 1
+        if connection.dport is not None:
+            services[(connection.protocol, connection.dport)] += 1
+
+    source_zones: Counter = Counter()
+    destination_zones: Counter = Counter()
+    for (source_zone, destination_zone), count in zone_pairs.items():
+        source_zones[source_zone] += count
+        destination_zones[destination_zone] += count
+
+    return {
+        "total": total,
+        "protocols": dict(protocols.most_common()),
+        "states": dict(states.most_common()),
+        "source_zones": dict(source_zones.most_common()),
+        "destination_zones": dict(destination_zones.most_common()),
+        "zone_pairs": [
+            {"source": source, "destination": destination, "count": count}
+            for (source, destination), count in _top(zone_pairs, len(zone_pairs))
+        ],
+        "top_sources": [{"address": address, "count": count} for address, count in _top(sources, top)],
+        "top_destinations": [{"address": address, "count": count} for address, count in _top(destinations, top)],
+        "top_services": [
+            {"protocol": protocol, "port": port, "count": count}
+            for (protocol, port), count in _top(services, top)
+        ],
+    }
+
+
+def _chain_tables() -> Iterator[Connection]:
+    for family in FAMILIES:
+        try:
+            _, text = _fetch_table(family, force=True)
+        except Exception as exc:
+            current_app.logger.error(f"Failed to fetch {family} conntrack table: {exc}")
+            continue
+        yield from iter_connections(text)
+
+
+def _fresh_aggregates() -> Optional[Dict[str, Any]]:
+    with _lock:
+        value = _aggregates.get("value")
+        if value and time.monotonic() - _aggregates["fetched_at"] < 2 * CONNTRACK_SAMPLE_INTERVAL:
+            return value
+    return None
+
+
+def _sample() -> Dict[str, Any]:
+    value = aggregate_connections(_chain_tables(), get_zone_resolver().resolve)
+    value["sampled_at"] = time.time()
+    with _lock:
+        _aggregates.update(fetched_at=time.monotonic(), value=value)
+    return value
+
+
+def sample_conntrack() -> Dict[str, Any]:
+    """Fetch both conntrack tables and replace the cached aggregates."""
+    with _sample_lock:
+        return _sample()
+
+
+def get_conntrack_aggregates(limit: int = TOP_ENDPOINTS, sample: bool = True) -> Optional[Dict[str, Any]]:
+    """
+    Cached aggregates; sampled inline when the background sampler has not run recently.
+
+    Args:
+        limit: Entries kept in each top-N list
+        sample: False never fetches the tables and returns None when no
+            recent aggregates exist, for hot paths such as the dashboard
+
+    Returns:
+        The aggregates, or None when sample is False and nothing is cached
+    """
+    value = _fresh_aggregates()
+    if value is None:
+        if not sample:
+            return None
+        with _sample_lock:
+            # Another request may have sampled while this one waited
+            value = _fresh_aggregates() or _sample()
+    return {
+        **value,
+        **{key: value[key][:limit] for key in ("top_sources", "top_destinations", "top_services")},
+    }
+
+
+register_sampler("conntrack-aggregates", CONNTRACK_SAMPLE_INTERVAL, sample_conntrack)
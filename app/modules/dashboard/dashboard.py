@@ -2,8 +2,14 @@ import json
 import re
 from typing import Optional
 from datetime import datetime, timedelta
-from flask import Blueprint, render_template, current_app, jsonify
+from flask import Blueprint, render_template, current_app, jsonify, request
 from app.auth import login_required
+from app.modules.dashboard.conntrack import get_conntrack_aggregates, get_conntrack_summary, query_connections
+from app.modules.dhcp.leases import get_lease_table
+from app.modules.firewall.activity import activity as firewall_log_activity, refresh_if_stale as refresh_firewall_log
+from app.modules.interfaces.inventory import parse_interface_counters
+from app.modules.interfaces.types import iter_interfaces
+from app.modules.logs.utils import fetch_log_lines, summarise_recent
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
@@ -220,40 +226,20 @@ def fetch_system_info():
 
 
 def fetch_network_traffic():
-    """Fetch network interface statistics"""
+    """Fetch network interface statistics for every interface type"""
     try:
-        data = current_app.device.show(path=["interfaces"])
-        lines = data.result.splitlines()
-
+        data = current_app.device.show(path=["interfaces", "counters"])
         interfaces = []
-        current_iface = None
-
-        for line in lines:
-            line = line.strip()
-            if line.startswith("eth") or line.startswith("lo"):
-                parts = line.split()
-                if len(parts) >= 1:
-                    current_iface = {
-                        "name": parts[0].rstrip(':'),
-                        "rx_bytes": "0",
-                        "tx_bytes": "0",
-                        "rx_packets": "0",
-                        "tx_packets": "0",
-                        "rx_errors": "0",
-                        "tx_errors": "0"
-                    }
-                    interfaces.append(current_iface)
-            elif current_iface and "RX:" in line:
-                parts = line.split()
-                if len(parts) >= 3:
-                    current_iface["rx_bytes"] = parts[1]
-                    current_iface["rx_packets"] = parts[2] if len(parts) > 2 else "0"
-            elif current_iface and "TX:" in line:
-                parts = line.split()
-                if len(parts) >= 3:
-                    current_iface["tx_bytes"] = parts[1]
-                    current_iface["tx_packets"] = parts[2] if len(parts) > 2 else "0"
-
+        for counters in parse_interface_counters(getattr(data, "result", "") or ""):
+            interfaces.append({
+                "name": counters["name"],
+                "rx_bytes": counters.get("rx_bytes", "0"),
+                "tx_bytes": counters.get("tx_bytes", "0"),
+                "rx_packets": counters.get("rx_packets", "0"),
+                "tx_packets": counters.get("tx_packets", "0"),
+                "rx_errors": counters.get("rx_errors", "0"),
+                "tx_errors": counters.get("tx_errors", "0"),
+            })
         return interfaces
     except Exception as e:
         return []
@@ -262,25 +248,15 @@ def fetch_network_traffic():
 def fetch_dhcp_leases():
     """Fetch DHCP lease information"""
     try:
-        data = current_app.device.show(path=["dhcp", "server", "leases"])
-        lines = data.result.splitlines()
-
-        active_leases = 0
-        recent_leases = []
-
-        for line in lines:
-            if "IP address" in line or "lease for" in line.lower():
-                active_leases += 1
-                if len(recent_leases) < 5:
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        recent_leases.append({
-                            "ip": parts[0] if parts[0] != "IP" else parts[2],
-                            "info": line
-                        })
+        table = get_lease_table()
+        leases = sorted(table.all(), key=lambda lease: lease["lease_start"], reverse=True)
+        recent_leases = [
+            {"ip": lease["ip"], "info": lease["hostname"] or lease["mac"]}
+            for lease in leases[:5]
+        ]
 
         return {
-            "active_count": active_leases,
+            "active_count": table.count("active"),
             "recent": recent_leases
         }
     except Exception as e:
@@ -293,10 +269,8 @@ def fetch_dhcp_leases():
 def fetch_firewall_activity():
     """Fetch firewall statistics and connections"""
     try:
-        # Get connection tracking statistics
-        conntrack_data = current_app.device.show(path=["conntrack", "table", "ipv4"])
-        connections = conntrack_data.result.splitlines()
-        active_connections = len([l for l in connections if l.strip()])
+        # Connection count from the (cached) conntrack statistics, not the full table
+        active_connections = get_conntrack_summary()["connections"]
 
         # Try to get firewall statistics
         try:
@@ -305,41 +279,45 @@ def fetch_firewall_activity():
         except:
             fw_stats = "No statistics available"
 
+        blocks = fetch_firewall_blocks(limit=5)
+
+        # Only what the sampler (or the connections page) has already aggregated;
+        # the dashboard never downloads the full tables itself
+        aggregates = get_conntrack_aggregates(limit=5, sample=False)
+        zone_pairs = aggregates["zone_pairs"][:5] if aggregates else []
+
         return {
             "active_connections": active_connections,
-            "recent_blocks": [],  # Would need log parsing
+            "blocked_today": blocks["blocked_today"],
+            "recent_blocks": blocks["recent_blocks"][:5],
+            "top_sources": blocks["top_sources"],
+            "zone_pairs": zone_pairs,
             "statistics": fw_stats
         }
     except Exception as e:
         return {
             "active_connections": 0,
+            "blocked_today": 0,
             "recent_blocks": [],
+            "top_sources": [],
+            "zone_pairs": [],
             "statistics": "N/A"
         }
 
 
+def fetch_firewall_blocks(minutes=None, limit=10):
+    """Windowed aggregates of logged firewall packets (top sources, ports, rule rates)"""
+    try:
+        refresh_firewall_log()
+    except Exception as e:
+        current_app.logger.error(f"Failed to read firewall log lines: {e}")
+    return firewall_log_activity.summary(minutes=minutes, limit=limit)
+
+
 def fetch_recent_logs():
     """Fetch recent system logs"""
     try:
-        log_data = current_app.device.show(path=["log", "tail"])
-        lines = log_data.result.splitlines()
-
-        logs = []
-        for line in lines[-10:]:  # Last 10 lines
-            if line.strip():
-                # Determine severity based on keywords
-                severity = "info"
-                if "error" in line.lower() or "fail" in line.lower():
-                    severity = "error"
-                elif "warn" in line.lower():
-                    severity = "warning"
-
-                logs.append({
-                    "message": line.strip(),
-                    "severity": severity
-                })
-
-        return logs
+        return summarise_recent(fetch_log_lines(10)[-10:])
     except Exception as e:
         return []
 
@@ -368,6 +346,72 @@ def get_firewall_activity():
     return jsonify(fetch_firewall_activity())
 
 
+@dashboard_bp.route('/api/firewall-activity/top')
+@login_required
+def get_firewall_top_talkers():
+    minutes = request.args.get('minutes', type=float)
+    limit = request.args.get('limit', default=10, type=int)
+    return jsonify(fetch_firewall_blocks(minutes=minutes, limit=limit))
+
+
+@dashboard_bp.route('/api/conntrack/statistics')
+@login_required
+def get_conntrack_statistics():
+    try:
+        return jsonify({"status": "ok", **get_conntrack_summary()})
+    except Exception as e:
+        current_app.logger.error(f"Error reading conntrack statistics: {e}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+@dashboard_bp.route('/api/conntrack/aggregates')
+@login_required
+def get_conntrack_aggregate_view():
+    """API endpoint returning connection counts by protocol, state and zone plus the busiest endpoints."""
+    try:
+        limit = max(1, int(request.args.get('limit', 10)))
+        return jsonify({"status": "ok", **get_conntrack_aggregates(limit=limit)})
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except Exception as e:
+        current_app.logger.error(f"Error aggregating conntrack table: {e}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+@dashboard_bp.route('/conntrack')
+@login_required
+def conntrack():
+    """Display the connection tracking table; rows are paged in by the API."""
+    return render_template('conntrack.html')
+
+
+@dashboard_bp.route('/api/conntrack/table')
+@login_required
+def get_conntrack_table():
+    """API endpoint returning one filtered page of the connection tracking table."""
+    args = request.args
+    family = args.get('family', 'ipv4').strip().lower()
+    try:
+        port = args.get('port', '').strip()
+        page = query_connections(
+            family=family,
+            protocol=args.get('protocol', '').strip() or None,
+            state=args.get('state', '').strip() or None,
+            address=args.get('address', '').strip() or None,
+            port=int(port) if port else None,
+            offset=int(args.get('offset', 0)),
+            limit=int(args.get('limit', 100)),
+            force=args.get('refresh', '').lower() in ('1', 'true', 'yes')
+        )
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except Exception as e:
+        current_app.logger.error(f"Error reading conntrack table: {e}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+    return jsonify({"status": "ok", "family": family, **page})
+
+
 @dashboard_bp.route('/api/recent-logs')
 @login_required
 def get_recent_logs():
@@ -405,29 +449,14 @@ def dashboard():
     service_names = list(service.keys())
 
 
-    # Interfaces Information
-    data = current_app.device.show(path=["configuration", "json"])
-
-    interfaces = config.get('interfaces', {}).get('ethernet', {})
-
-    # Flatten VLANs into the same dict for easy display
-    flat_interfaces = {}
-
-    for iface_name, iface_data in interfaces.items():
-        # Add the parent interface
-        flat_interfaces[iface_name] = {
-            "address": iface_data.get("address", ["N/A"]),
-            "description": iface_data.get("description", "N/A")
+    # Interfaces Information, with VLANs flattened into the same dict for easy display
+    flat_interfaces = {
+        entry["name"]: {
+            "address": entry["config"].get("address", ["N/A"]),
+            "description": entry["config"].get("description", "N/A"),
         }
-
-        # If VLANs (vif) exist, add them too
-        if "vif" in iface_data:
-            for vlan_id, vlan_data in iface_data["vif"].items():
-                vlan_name = f"{iface_name}.{vlan_id}"  # e.g. eth1.5
-                flat_interfaces[vlan_name] = {
-                    "address": vlan_data.get("address", ["N/A"]),
-                    "description": vlan_data.get("description", "N/A")
-                }
+        for entry in iter_interfaces(config.get('interfaces', {}))
+    }
 
     return render_template('dashboard.html',
                           storage_result=storage_result,
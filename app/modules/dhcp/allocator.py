@@ -0,0 +1,148 @@
+"""
+DHCP subnet-id allocation shared by the DHCP and interface modules.
+
+Used IDs are read from the cached 'service dhcp-server' subtree and kept as a
+sorted list, so the lowest free ID is found by binary search instead of
+probing. Handed-out IDs are reserved under a lock until they show up in the
+configuration (or the reservation expires), so two scopes created at the same
+time never receive the same ID.
+"""
+import bisect
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.core import load_config_subtree
+
+from .utils import ensure_dict
+
+SUBNET_ID_RESERVATION_TTL = float(os.getenv("DHCP_SUBNET_ID_RESERVATION_TTL", "120"))
+
+
+def _as_id(value: Any) -> Optional[int]:
+    # retrieve_show_config returns leaf values as strings; some callers pass {"<id>": {}}
+    if isinstance(value, dict):
+        value = next(iter(value), None)
+    try:
+        subnet_id = int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+    return subnet_id if subnet_id > 0 else None
+
+
+def used_subnet_ids(dhcp_config: Dict[str, Any]) -> List[int]:
+    """Return the sorted, distinct subnet-ids configured under 'service dhcp-server'."""
+    shared_networks = dhcp_config.get("shared-network-name")
+    networks: Iterable[Any] = shared_networks if isinstance(shared_networks, list) else ensure_dict(shared_networks).values()
+
+    used = set()
+    for network_config in networks:
+        subnets = ensure_dict(network_config).get("subnet")
+        for subnet_config in subnets if isinstance(subnets, list) else ensure_dict(subnets).values():
+            subnet_id = _as_id(ensure_dict(subnet_config).get("subnet-id"))
+            if subnet_id is not None:
+                used.add(subnet_id)
+    return sorted(used)
+
+
+def lowest_free_id(taken: List[int]) -> int:
+    """
+    Return the lowest positive integer missing from a sorted list of distinct IDs.
+
+    taken[i] - i only grows along the list, so the first gap is found by
+    bisecting on it rather than scanning.
+    """
+    low, high = 0, len(taken)
+    while low < high:
+        middle = (low + high) // 2
+        if taken[middle] == middle + 1:
+            low = middle + 1
+        else:
+            high = middle
+    return low + 1
+
+
+class SubnetIdAllocator:
+    """Hands out DHCP subnet-ids atomically, holding each one until it is configured."""
+
+    def __init__(self, reservation_ttl: float = SUBNET_ID_RESERVATION_TTL):
+        self.reservation_ttl = reservation_ttl
+        self._lock = threading.Lock()
+        self._reserved: Dict[int, float] = {}
+
+    def _taken(self, used: List[int]) -> List[int]:
+        # Caller holds the lock. Expired reservations and ones now in the config are dropped.
+        now = time.monotonic()
+        used_set = set(used)
+        self._reserved = {
+            subnet_id: expires for subnet_id, expires in self._reserved.items()
+            if expires > now and subnet_id not in used_set
+        }
+        if not self._reserved:
+            return used
+        taken = list(used)
+        for subnet_id in self._reserved:
+            index = bisect.bisect_left(taken, subnet_id)
+            if index == len(taken) or taken[index] != subnet_id:
+                taken.insert(index, subnet_id)
+        return taken
+
+    def peek(self, dhcp_config: Optional[Dict[str, Any]] = None) -> int:
+        """Return the ID the next allocation would get, without reserving it."""
+        used = used_subnet_ids(dhcp_config if dhcp_config is not None else load_config_subtree(["service", "dhcp-server"]))
+        with self._lock:
+            return lowest_free_id(self._taken(used))
+
+    def allocate(self, dhcp_config: Optional[Dict[str, Any]] = None) -> int:
+        """Reserve and return the lowest free subnet-id."""
+        used = used_subnet_ids(dhcp_config if dhcp_config is not None else load_config_subtree(["service", "dhcp-server"]))
+        with self._lock:
+            subnet_id = lowest_free_id(self._taken(used))
+            self._reserved[subnet_id] = time.monotonic() + self.reservation_ttl
+            return subnet_id
+
+    def claim(self, subnet_id: Any, dhcp_config: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Reserve a specific subnet-id.
+
+        Returns:
+            False if the ID is invalid, already configured or reserved by another request
+        """
+        requested = _as_id(subnet_id)
+        if requested is None:
+            return False
+        used = used_subnet_ids(dhcp_config if dhcp_config is not None else load_config_subtree(["service", "dhcp-server"]))
+        with self._lock:
+            taken = self._taken(used)
+            index = bisect.bisect_left(taken, requested)
+            if index < len(taken) and taken[index] == requested:
+                return False
+            self._reserved[requested] = time.monotonic() + self.reservation_ttl
+            return True
+
+    def release(self, subnet_id: Any) -> None:
+        """Drop a reservation whose scope was never created."""
+        requested = _as_id(subnet_id)
+        with self._lock:
+            self._reserved.pop(requested, None)
+
+
+_allocator = SubnetIdAllocator()
+
+
+def next_subnet_id(dhcp_config: Optional[Dict[str, Any]] = None) -> int:
+    """Lowest free subnet-id, for display; use allocate_subnet_id when creating a scope."""
+    return _allocator.peek(dhcp_config)
+
+
+def allocate_subnet_id(dhcp_config: Optional[Dict[str, Any]] = None) -> int:
+    return _allocator.allocate(dhcp_config)
+
+
+def claim_subnet_id(subnet_id: Any, dhcp_config: Optional[Dict[str, Any]] = None) -> bool:
+    return _allocator.claim(subnet_id, dhcp_config)
+
+
+def release_subnet_id(subnet_id: Any) -> None:
+    _allocator.release(subnet_id)
@@ -0,0 +1,121 @@
+"""
+DHCP pool capacity accounting.
+
+Capacity is worked out on integer address intervals: every range of a subnet
+is merged into sorted intervals, and excludes, static mappings and active
+leases are counted by bisecting into them. Nothing is expanded into address
+lists, so a /16 pool costs the same as a /28.
+"""
+import bisect
+import ipaddress
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.core import Interval, merge_intervals
+
+from .utils import ensure_dict, ensure_list, strip_or_none
+
+DHCP_CAPACITY_THRESHOLD = float(os.getenv("DHCP_CAPACITY_THRESHOLD", "80"))
+
+
+def _address(value: Any) -> Optional[int]:
+    try:
+        return int(ipaddress.ip_address(str(value).strip()))
+    except ValueError:
+        return None
+
+
+def count_in_ranges(addresses: Iterable[int], ranges: List[Interval]) -> int:
+    """Count distinct addresses falling inside sorted, merged intervals."""
+    starts = [start for start, _ in ranges]
+    count = 0
+    for address in set(addresses):
+        index = bisect.bisect_right(starts, address) - 1
+        if index >= 0 and address <= ranges[index][1]:
+            count += 1
+    return count
+
+
+def subnet_capacity(subnet_config: Any) -> Dict[str, Any]:
+    """
+    Work out the dynamic address capacity of one subnet.
+
+    Returns:
+        Dict with 'ranges', 'rangeSize', 'excluded', 'static', 'capacity' and
+        the merged integer intervals under '_intervals'
+    """
+    subnet_map = ensure_dict(subnet_config)
+
+    raw_ranges = []
+    range_labels = []
+    for range_id, range_config in ensure_dict(subnet_map.get("range")).items():
+        range_map = ensure_dict(range_config)
+        start = _address(range_map.get("start"))
+        stop = _address(range_map.get("stop"))
+        if start is None or stop is None or stop < start:
+            continue
+        raw_ranges.append((start, stop))
+        range_labels.append({
+            "id": str(range_id),
+            "start": strip_or_none(range_map.get("start")),
+            "stop": strip_or_none(range_map.get("stop")),
+            "size": stop - start + 1,
+        })
+    ranges = merge_intervals(raw_ranges)
+    range_size = sum(stop - start + 1 for start, stop in ranges)
+
+    excludes = {address for address in (_address(e) for e in ensure_list(subnet_map.get("exclude"))) if address is not None}
+    excluded = count_in_ranges(excludes, ranges)
+
+    statics = set()
+    for mapping in ensure_dict(subnet_map.get("static-mapping")).values():
+        address = _address(ensure_dict(mapping).get("ip-address") or "")
+        if address is not None and address not in excludes:
+            statics.add(address)
+    static = count_in_ranges(statics, ranges)
+
+    return {
+        "ranges": range_labels,
+        "rangeSize": range_size,
+        "excluded": excluded,
+        "static": static,
+        "capacity": max(0, range_size - excluded - static),
+        "_intervals": ranges,
+        "_reserved": excludes | statics,
+    }
+
+
+def pool_capacity_report(dhcp_config: Dict[str, Any], leases_by_pool: Dict[str, List[str]],
+                         threshold: float = DHCP_CAPACITY_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Compare each subnet's dynamic capacity against its active leases.
+
+    Args:
+        dhcp_config: 'service dhcp-server' config
+        leases_by_pool: Active lease IPs keyed by pool (shared network) name
+        threshold: Utilisation percentage above which a subnet is flagged
+
+    Returns:
+        One entry per shared network and subnet, busiest first
+    """
+    report = []
+    for shared_name, shared_config in ensure_dict(dhcp_config.get("shared-network-name")).items():
+        pool_addresses = [address for address in (_address(ip) for ip in leases_by_pool.get(shared_name, [])) if address is not None]
+        for subnet, subnet_config in ensure_dict(ensure_dict(shared_config).get("subnet")).items():
+            capacity = subnet_capacity(subnet_config)
+            reserved = capacity.pop("_reserved")
+            intervals = capacity.pop("_intervals")
+            active = count_in_ranges((address for address in pool_addresses if address not in reserved), intervals)
+            utilisation = round(active * 100.0 / capacity["capacity"], 1) if capacity["capacity"] else (100.0 if active else 0.0)
+            report.append({
+                "sharedNetwork": shared_name,
+                "subnet": subnet,
+                **capacity,
+                "active": active,
+                "available": max(0, capacity["capacity"] - active),
+                "utilisation": utilisation,
+                "overThreshold": utilisation >= threshold,
+            })
+
+    report.sort(key=lambda entry: entry["utilisation"], reverse=True)
+    return report
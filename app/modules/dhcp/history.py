@@ -0,0 +1,231 @@
+"""
+Persistent DHCP lease history built from periodic lease snapshots.
+
+Every snapshot is compared with the previous one and the differences are
+appended to an event log:
+
+- new:     an IP that was not leased before is now leased
+- renewed: same IP and MAC, later lease expiration
+- moved:   a MAC now holds a different IP than before (prev_ip is recorded)
+- expired: a previously leased IP is no longer active
+
+Active lease counts per pool are stored with every snapshot for utilisation
+graphs over time.
+"""
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from app.core import get_db, register_sampler
+
+from .leases import LeaseTable, add_snapshot_listener, get_lease_table
+
+LEASE_HISTORY_INTERVAL = float(os.getenv("DHCP_LEASE_HISTORY_INTERVAL", "60"))
+LEASE_HISTORY_RETENTION_DAYS = float(os.getenv("DHCP_LEASE_HISTORY_RETENTION_DAYS", "30"))
+
+EVENT_TYPES = ("new", "renewed", "moved", "expired")
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS lease_events (
+        ts REAL NOT NULL,
+        event TEXT NOT NULL,
+        ip TEXT NOT NULL,
+        mac TEXT,
+        pool TEXT,
+        hostname TEXT,
+        prev_ip TEXT
+    )""",
+    "CREATE INDEX IF NOT EXISTS lease_events_ts ON lease_events (ts)",
+    "CREATE INDEX IF NOT EXISTS lease_events_pool_ts ON lease_events (pool, ts)",
+    "CREATE INDEX IF NOT EXISTS lease_events_mac ON lease_events (mac)",
+    """CREATE TABLE IF NOT EXISTS lease_state (
+        ip TEXT PRIMARY KEY,
+        mac TEXT,
+        pool TEXT,
+        hostname TEXT,
+        lease_expiration TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS pool_samples (
+        ts REAL NOT NULL,
+        pool TEXT NOT NULL,
+        active INTEGER NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS pool_samples_pool_ts ON pool_samples (pool, ts)",
+)
+
+_record_lock = threading.Lock()
+
+
+def _db():
+    return get_db("dhcp_history", _SCHEMA)
+
+
+def diff_snapshots(previous: Dict[str, Dict[str, str]], current: Dict[str, Dict[str, str]]) -> List[Dict[str, Any]]:
+    """
+    Compare two {ip: lease} snapshots and return the lease events between them.
+
+    Args:
+        previous: Active leases from the last snapshot, keyed by IP
+        current: Active leases from this snapshot, keyed by IP
+
+    Returns:
+        List of event dicts (event, ip, mac, pool, hostname, prev_ip)
+    """
+    previous_ip_by_mac = {lease["mac"]: ip for ip, lease in previous.items() if lease.get("mac")}
+    events = []
+
+    for ip, lease in current.items():
+        before = previous.get(ip)
+        mac = lease.get("mac", "")
+        event = None
+        prev_ip = None
+        if before is None or before.get("mac") != mac:
+            old_ip = previous_ip_by_mac.get(mac)
+            if old_ip and old_ip != ip:
+                event, prev_ip = "moved", old_ip
+            else:
+                event = "new"
+        elif lease.get("lease_expiration") != before.get("lease_expiration"):
+            event = "renewed"
+
+        if event:
+            events.append({
+                "event": event,
+                "ip": ip,
+                "mac": mac,
+                "pool": lease.get("pool", ""),
+                "hostname": lease.get("hostname", ""),
+                "prev_ip": prev_ip,
+            })
+
+    for ip, lease in previous.items():
+        if ip not in current:
+            events.append({
+                "event": "expired",
+                "ip": ip,
+                "mac": lease.get("mac", ""),
+                "pool": lease.get("pool", ""),
+                "hostname": lease.get("hostname", ""),
+                "prev_ip": None,
+            })
+
+    return events
+
+
+def record_snapshot(table: LeaseTable, now: Optional[float] = None) -> int:
+    """
+    Diff a lease snapshot against the stored state and append the events.
+
+    Returns:
+        Number of events recorded
+    """
+    now = time.time() if now is None else now
+    current = {lease["ip"]: lease for lease in table.all() if lease.get("state", "active") == "active"}
+
+    with _record_lock:
+        db = _db()
+        previous = {
+            row["ip"]: dict(row)
+            for row in db.execute("SELECT ip, mac, pool, hostname, lease_expiration FROM lease_state")
+        }
+        events = diff_snapshots(previous, current)
+
+        pool_counts: Dict[str, int] = {}
+        for lease in current.values():
+            pool_counts[lease.get("pool", "")] = pool_counts.get(lease.get("pool", ""), 0) + 1
+        for pool in {lease.get("pool", "") for lease in previous.values()} - set(pool_counts):
+            pool_counts[pool] = 0
+
+        with db:
+            db.executemany(
+                "INSERT INTO lease_events (ts, event, ip, mac, pool, hostname, prev_ip) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(now, e["event"], e["ip"], e["mac"].lower(), e["pool"], e["hostname"], e["prev_ip"]) for e in events],
+            )
+            db.execute("DELETE FROM lease_state")
+            db.executemany(
+                "INSERT INTO lease_state (ip, mac, pool, hostname, lease_expiration) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (ip, lease.get("mac", ""), lease.get("pool", ""), lease.get("hostname", ""),
+                     lease.get("lease_expiration", ""))
+                    for ip, lease in current.items()
+                ],
+            )
+            db.executemany(
+                "INSERT INTO pool_samples (ts, pool, active) VALUES (?, ?, ?)",
+                [(now, pool, count) for pool, count in pool_counts.items()],
+            )
+            cutoff = now - LEASE_HISTORY_RETENTION_DAYS * 86400
+            db.execute("DELETE FROM lease_events WHERE ts < ?", (cutoff,))
+            db.execute("DELETE FROM pool_samples WHERE ts < ?", (cutoff,))
+
+    return len(events)
+
+
+def query_events(start: Optional[float] = None, end: Optional[float] = None, pool: Optional[str] = None,
+                 mac: Optional[str] = None, ip: Optional[str] = None, event: Optional[str] = None,
+                 limit: int = 500) -> List[Dict[str, Any]]:
+    """Return lease events in a time range, newest first, with optional filters."""
+    clauses = []
+    params: List[Any] = []
+    for column, operator, value in (
+        ("ts", ">=", start),
+        ("ts", "<=", end),
+        ("pool", "=", pool),
+        ("mac", "=", mac.lower() if mac else None),
+        ("ip", "=", ip),
+        ("event", "=", event),
+    ):
+        if value is not None:
+            clauses.append(f"{column} {operator} ?")
+            params.append(value)
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    rows = _db().execute(
+        f"SELECT ts, event, ip, mac, pool, hostname, prev_ip FROM lease_events {where} ORDER BY ts DESC LIMIT ?",
+        params + [limit],
+    )
+    return [dict(row) for row in rows]
+
+
+def pool_utilisation(start: Optional[float] = None, end: Optional[float] = None, pool: Optional[str] = None,
+                     bucket: float = 3600) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Return active lease counts per pool over time.
+
+    Samples are grouped into buckets of the given size in seconds; each point
+    carries the average and peak active count seen in that bucket.
+    """
+    clauses = []
+    params: List[Any] = [bucket, bucket]
+    for column, operator, value in (("ts", ">=", start), ("ts", "<=", end), ("pool", "=", pool)):
+        if value is not None:
+            clauses.append(f"{column} {operator} ?")
+            params.append(value)
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    rows = _db().execute(
+        f"""SELECT pool, CAST(ts / ? AS INTEGER) * ? AS bucket_ts,
+                   AVG(active) AS average, MAX(active) AS peak
+            FROM pool_samples {where}
+            GROUP BY pool, bucket_ts ORDER BY pool, bucket_ts""",
+        params,
+    )
+
+    series: Dict[str, List[Dict[str, Any]]] = {}
+    for row in rows:
+        series.setdefault(row["pool"], []).append({
+            "ts": row["bucket_ts"],
+            "average": round(row["average"], 2),
+            "peak": row["peak"],
+        })
+    return series
+
+
+def _sample_leases() -> None:
+    # Refreshing the snapshot notifies record_snapshot through the listener
+    get_lease_table(force=True)
+
+
+add_snapshot_listener(record_snapshot)
+register_sampler("dhcp-lease-history", LEASE_HISTORY_INTERVAL, _sample_leases)
@@ -0,0 +1,185 @@
+"""
+DHCP lease service: one lease fetch per interval, indexed for fast lookups.
+"""
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from flask import current_app
+
+from app.core import parse_fixed_width_table
+from app.modules.interfaces.device import show_output
+
+LEASE_CACHE_TTL = float(os.getenv("DHCP_LEASE_CACHE_TTL", "10"))
+
+LEASE_FIELDS = (
+    "ip",
+    "mac",
+    "state",
+    "lease_start",
+    "lease_expiration",
+    "remaining",
+    "pool",
+    "hostname",
+    "origin",
+)
+
+# Op-mode column titles for each lease field (titles vary in case between VyOS releases)
+_HEADER_FIELDS = {
+    "ip address": "ip",
+    "mac address": "mac",
+    "state": "state",
+    "lease start": "lease_start",
+    "lease expiration": "lease_expiration",
+    "remaining": "remaining",
+    "pool": "pool",
+    "hostname": "hostname",
+    "origin": "origin",
+}
+
+
+class LeaseTable:
+    """
+    Column-oriented lease snapshot with indexes by IP, MAC, hostname and pool.
+
+    Each field is stored as one list, so a lease is a row number shared by all
+    columns. Lookups go through the indexes and only the matching rows are
+    turned back into dicts.
+    """
+
+    def __init__(self, records: Iterable[Dict[str, str]] = (), fetched_at: float = 0.0):
+        self.columns: Dict[str, List[str]] = {field: [] for field in LEASE_FIELDS}
+        self.by_ip: Dict[str, int] = {}
+        self.by_mac: Dict[str, List[int]] = {}
+        self.by_hostname: Dict[str, List[int]] = {}
+        self.by_pool: Dict[str, List[int]] = {}
+        self.fetched_at = fetched_at
+
+        for record in records:
+            row = len(self.columns["ip"])
+            for field in LEASE_FIELDS:
+                self.columns[field].append(record.get(field, "") or "")
+
+            self.by_ip[record.get("ip", "")] = row
+            self.by_mac.setdefault(record.get("mac", "").lower(), []).append(row)
+            if record.get("hostname"):
+                self.by_hostname.setdefault(record["hostname"].lower(), []).append(row)
+            self.by_pool.setdefault(record.get("pool", ""), []).append(row)
+
+    def __len__(self) -> int:
+        return len(self.columns["ip"])
+
+    def row(self, index: int) -> Dict[str, str]:
+        return {field: self.columns[field][index] for field in LEASE_FIELDS}
+
+    def rows(self, indexes: Iterable[int]) -> List[Dict[str, str]]:
+        return [self.row(index) for index in indexes]
+
+    def all(self) -> List[Dict[str, str]]:
+        return self.rows(range(len(self)))
+
+    def for_pool(self, pool: str) -> List[Dict[str, str]]:
+        return self.rows(self.by_pool.get(pool, []))
+
+    def count(self, state: Optional[str] = None) -> int:
+        if state is None:
+            return len(self)
+        return sum(1 for value in self.columns["state"] if value == state)
+
+    def lookup(self, ip: Optional[str] = None, mac: Optional[str] = None,
+               hostname: Optional[str] = None) -> List[Dict[str, str]]:
+        """Return leases matching an exact IP, MAC or hostname."""
+        if ip:
+            return self.rows([self.by_ip[ip]] if ip in self.by_ip else [])
+        if mac:
+            return self.rows(self.by_mac.get(mac.lower(), []))
+        if hostname:
+            return self.rows(self.by_hostname.get(hostname.lower(), []))
+        return []
+
+    def search(self, query: str, pool: Optional[str] = None, limit: int = 100) -> List[Dict[str, str]]:
+        """
+        Return leases whose IP, MAC or hostname contains the query.
+
+        Exact index hits come first, then substring matches in row order.
+        """
+        needle = (query or "").strip().lower()
+        if not needle:
+            return []
+
+        candidates = self.by_pool.get(pool, []) if pool else range(len(self))
+        allowed = set(candidates) if pool else None
+
+        matches: List[int] = []
+        seen = set()
+        exact = ([self.by_ip[needle]] if needle in self.by_ip else []) + \
+            self.by_mac.get(needle, []) + self.by_hostname.get(needle, [])
+        for index in exact:
+            if index not in seen and (allowed is None or index in allowed):
+                seen.add(index)
+                matches.append(index)
+
+        ips, macs, hostnames = self.columns["ip"], self.columns["mac"], self.columns["hostname"]
+        for index in candidates:
+            if len(matches) >= limit:
+                break
+            if index in seen:
+                continue
+            if needle in ips[index] or needle in macs[index].lower() or needle in hostnames[index].lower():
+                seen.add(index)
+                matches.append(index)
+
+        return self.rows(matches[:limit])
+
+
+def parse_leases(raw: Any) -> List[Dict[str, str]]:
+    """Parse "show dhcp server leases" output into lease dicts."""
+    headers, rows = parse_fixed_width_table(raw, header_prefix="ip address")
+    fields = [_HEADER_FIELDS.get(header.lower()) for header in headers]
+    leases = []
+    for row in rows:
+        record = {field: value for field, value in zip(fields, row) if field}
+        if record.get("ip"):
+            leases.append(record)
+    return leases
+
+
+_lock = threading.Lock()
+_snapshot = LeaseTable()
+_listeners: List[Callable[[LeaseTable], Any]] = []
+
+
+def add_snapshot_listener(callback: Callable[[LeaseTable], Any]) -> None:
+    """Call callback with every freshly fetched lease snapshot."""
+    _listeners.append(callback)
+
+
+def get_lease_table(force: bool = False) -> LeaseTable:
+    """
+    Return the lease snapshot, refreshing it at most once per LEASE_CACHE_TTL.
+
+    All leases are fetched with a single "show dhcp server leases" call and
+    every consumer (per-interface view, dashboard, search) reads the snapshot.
+    A failed fetch keeps the previous snapshot and does not notify listeners,
+    so an outage is never recorded as every lease expiring.
+    """
+    global _snapshot
+    with _lock:
+        snapshot = _snapshot
+        if not force and snapshot.fetched_at and time.monotonic() - snapshot.fetched_at < LEASE_CACHE_TTL:
+            return snapshot
+
+        try:
+            raw = show_output(["dhcp", "server", "leases"])
+        except Exception as exc:
+            current_app.logger.error(f"Failed to fetch DHCP leases: {exc}")
+            return snapshot
+
+        _snapshot = LeaseTable(parse_leases(raw), fetched_at=time.monotonic())
+        for callback in _listeners:
+            try:
+                callback(_snapshot)
+            except Exception as exc:
+                current_app.logger.error(f"DHCP lease snapshot listener failed: {exc}")
+        return _snapshot
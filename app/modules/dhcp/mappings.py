@@ -0,0 +1,231 @@
+"""
+Bulk import of DHCP static mappings across scopes.
+
+Rows are streamed from a CSV upload (JSON uploads are size-capped and parsed
+whole), resolved to a shared network and subnet, and checked for duplicate
+MACs and IPs against hash indexes of both the file and the existing
+configuration before anything is sent to the router.
+Only new mappings and changed leaves are turned into operations.
+"""
+import csv
+import ipaddress
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.core import load_json_upload
+
+from .utils import ensure_dict, strip_or_none
+
+STATIC_MAPPING_CHUNK_SIZE = 500
+MAX_REPORTED_ERRORS = 50
+
+# Import columns and the static-mapping leaf each one sets
+MAPPING_LEAVES = (
+    ("mac", "mac"),
+    ("ipAddress", "ip-address"),
+    ("hostname", "hostname"),
+)
+
+# Accepted spellings of each import column
+_COLUMN_ALIASES = {
+    "sharednetwork": "sharedNetwork",
+    "shared-network": "sharedNetwork",
+    "shared_network": "sharedNetwork",
+    "pool": "sharedNetwork",
+    "subnet": "subnet",
+    "name": "name",
+    "mac": "mac",
+    "mac-address": "mac",
+    "mac_address": "mac",
+    "macaddress": "mac",
+    "ip": "ipAddress",
+    "ip-address": "ipAddress",
+    "ip_address": "ipAddress",
+    "ipaddress": "ipAddress",
+    "hostname": "hostname",
+}
+
+_MAC_HEX = re.compile(r"^[0-9a-f]{12}$")
+_MAPPING_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+
+
+def normalize_mac(value: Any) -> Optional[str]:
+    """Return a MAC address as lowercase colon-separated hex, or None if invalid."""
+    hex_digits = re.sub(r"[:\-.]", "", str(value or "").strip().lower())
+    if not _MAC_HEX.match(hex_digits):
+        return None
+    return ":".join(hex_digits[i:i + 2] for i in range(0, 12, 2))
+
+
+def _normalize_row(row: Dict[str, Any]) -> Dict[str, str]:
+    normalized = {}
+    for key, value in row.items():
+        column = _COLUMN_ALIASES.get(str(key or "").strip().lower())
+        if column and value not in (None, ""):
+            normalized[column] = str(value).strip()
+    return normalized
+
+
+def iter_mapping_rows(stream, filename: str = "") -> Iterator[Tuple[int, Dict[str, str]]]:
+    """
+    Yield (row_number, mapping) from a CSV or JSON upload.
+
+    CSV files need a header row and are read line by line. JSON uploads are a
+    list of objects (or {"staticMappings": [...]}); they are parsed in one go,
+    so they are capped at JSON_IMPORT_MAX_BYTES and large imports should use CSV.
+    """
+    if filename.lower().endswith(".json"):
+        data = load_json_upload(stream)
+        if isinstance(data, dict):
+            data = data.get("staticMappings") or data.get("mappings") or []
+        for index, row in enumerate(data if isinstance(data, list) else [], start=1):
+            if isinstance(row, dict):
+                yield index, _normalize_row(row)
+        return
+
+    reader = csv.DictReader(line for line in stream if line.strip() and not line.lstrip().startswith("#"))
+    for index, row in enumerate(reader, start=2):
+        yield index, _normalize_row(row)
+
+
+class MappingIndex:
+    """Hash indexes over existing static mappings: by MAC, by IP and by (scope, name)."""
+
+    def __init__(self, dhcp_config: Dict[str, Any]):
+        self.subnets: List[Tuple[str, str, Any]] = []
+        self.by_name: Dict[Tuple[str, str, str], Dict[str, str]] = {}
+        self.by_mac: Dict[str, Tuple[str, str, str]] = {}
+        self.by_ip: Dict[str, Tuple[str, str, str]] = {}
+
+        for shared_name, shared_config in ensure_dict(dhcp_config.get("shared-network-name")).items():
+            for subnet, subnet_config in ensure_dict(ensure_dict(shared_config).get("subnet")).items():
+                try:
+                    self.subnets.append((shared_name, subnet, ipaddress.ip_network(subnet, strict=False)))
+                except ValueError:
+                    continue
+                mappings = ensure_dict(ensure_dict(subnet_config).get("static-mapping"))
+                for name, mapping_config in mappings.items():
+                    mapping_map = ensure_dict(mapping_config)
+                    key = (shared_name, subnet, name)
+                    entry = {
+                        "mac": normalize_mac(mapping_map.get("mac")) or strip_or_none(mapping_map.get("mac")) or "",
+                        "ipAddress": strip_or_none(mapping_map.get("ip-address")) or "",
+                        "hostname": strip_or_none(mapping_map.get("hostname")) or "",
+                    }
+                    self.by_name[key] = entry
+                    if entry["mac"]:
+                        self.by_mac[entry["mac"]] = key
+                    if entry["ipAddress"]:
+                        self.by_ip[entry["ipAddress"]] = key
+
+    def resolve_scope(self, address: Any, shared_network: Optional[str] = None,
+                      subnet: Optional[str] = None) -> Optional[Tuple[str, str]]:
+        """Return the (shared network, subnet) that should hold a mapping for an address."""
+        for shared_name, subnet_value, network in self.subnets:
+            if shared_network and shared_name != shared_network:
+                continue
+            if subnet and subnet_value != subnet:
+                continue
+            if address in network:
+                return shared_name, subnet_value
+        return None
+
+
+def static_mapping_of(operation: Dict[str, Any]) -> Tuple[str, ...]:
+    """Return the static-mapping path an import operation belongs to."""
+    path = operation["path"]
+    return tuple(path[:path.index("static-mapping") + 2])
+
+
+def plan_static_mapping_import(rows: Iterable[Tuple[int, Dict[str, str]]],
+                               dhcp_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate import rows and plan the minimal operations to apply them.
+
+    Each mapping's operations are contiguous, so they can be batched whole
+    with static_mapping_of as the group key.
+
+    Returns:
+        Dict with 'operations', 'created', 'updated', 'unchanged', 'rejected'
+        and up to MAX_REPORTED_ERRORS 'errors'
+    """
+    index = MappingIndex(dhcp_config)
+    seen_macs: Dict[str, int] = {}
+    seen_ips: Dict[str, int] = {}
+    seen_names: Dict[Tuple[str, str, str], int] = {}
+    operations: List[Dict[str, Any]] = []
+    errors: List[Dict[str, Any]] = []
+    counts = {"created": 0, "updated": 0, "unchanged": 0, "rejected": 0}
+
+    def reject(row_number: int, message: str) -> None:
+        counts["rejected"] += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append({"row": row_number, "message": message})
+
+    for row_number, row in rows:
+        name = row.get("name", "")
+        mac = normalize_mac(row.get("mac"))
+        ip_value = row.get("ipAddress", "")
+
+        if not name or not _MAPPING_NAME.match(name):
+            reject(row_number, f"Invalid mapping name: {name!r}")
+            continue
+        if not mac:
+            reject(row_number, f"Invalid MAC address: {row.get('mac')!r}")
+            continue
+        try:
+            address = ipaddress.ip_address(ip_value)
+        except ValueError:
+            reject(row_number, f"Invalid IP address: {ip_value!r}")
+            continue
+
+        scope = index.resolve_scope(address, row.get("sharedNetwork"), row.get("subnet"))
+        if not scope:
+            reject(row_number, f"No DHCP subnet contains {ip_value}")
+            continue
+        key = scope + (name,)
+
+        # Duplicates inside the import file
+        if mac in seen_macs:
+            reject(row_number, f"Duplicate MAC {mac} (also on row {seen_macs[mac]})")
+            continue
+        if ip_value in seen_ips:
+            reject(row_number, f"Duplicate IP {ip_value} (also on row {seen_ips[ip_value]})")
+            continue
+        if key in seen_names:
+            reject(row_number, f"Duplicate mapping {name} (also on row {seen_names[key]})")
+            continue
+
+        # Clashes with mappings already on the router under another name
+        mac_owner = index.by_mac.get(mac)
+        ip_owner = index.by_ip.get(ip_value)
+        if mac_owner and mac_owner != key:
+            reject(row_number, f"MAC {mac} is already mapped by {mac_owner[2]} in {mac_owner[0]}")
+            continue
+        if ip_owner and ip_owner != key:
+            reject(row_number, f"IP {ip_value} is already mapped by {ip_owner[2]} in {ip_owner[0]}")
+            continue
+
+        seen_macs[mac] = seen_ips[ip_value] = seen_names[key] = row_number
+
+        desired = {"mac": mac, "ipAddress": ip_value, "hostname": row.get("hostname", "")}
+        existing = index.by_name.get(key)
+        mapping_path = [
+            "service", "dhcp-server", "shared-network-name", scope[0],
+            "subnet", scope[1], "static-mapping", name,
+        ]
+        changed = [
+            (field, leaf) for field, leaf in MAPPING_LEAVES
+            if desired[field] and (existing is None or existing.get(field) != desired[field])
+        ]
+        for field, leaf in changed:
+            operations.append({"op": "set", "path": mapping_path + [leaf, desired[field]]})
+
+        if existing is None:
+            counts["created"] += 1
+        elif changed:
+            counts["updated"] += 1
+        else:
+            counts["unchanged"] += 1
+
+    return {"operations": operations, "errors": errors, **counts}
@@ -0,0 +1,101 @@
+"""
+Structural diff of DHCP scope configuration.
+
+A scope is modelled as the set of full configuration leaf paths its set
+commands would create. Comparing the paths for the current and the requested
+scope gives the minimal leaf operations: new paths are set, missing paths are
+deleted, and deletes are collapsed to the highest node whose whole subtree
+is going away (a removed static mapping becomes one delete, not one per leaf).
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+
+Path = Tuple[str, ...]
+
+# Leaves that hold several values; every other leaf has a single value that a
+# new set simply overwrites, so its old value does not need deleting first
+MULTI_VALUE_LEAVES = {"name-server", "domain-search", "exclude", "listen-address"}
+
+# Leaves that are flags without a value
+VALUELESS_LEAVES = {"authoritative", "disable", "hostfile-update"}
+
+
+def config_leaves(node: Any, prefix: Sequence[str] = ()) -> Iterator[Path]:
+    """Yield every leaf path of a retrieve_show_config subtree."""
+    prefix = tuple(prefix)
+    if isinstance(node, dict):
+        if not node:
+            yield prefix
+        for key, child in node.items():
+            yield from config_leaves(child, prefix + (str(key),))
+    elif isinstance(node, list):
+        for value in node:
+            yield prefix + (str(value),)
+    elif node is None or node == "":
+        yield prefix
+    else:
+        yield prefix + (str(node),)
+
+
+def diff_scope_paths(current: Iterable[Sequence[str]], desired: Iterable[Sequence[str]],
+                     config_root: Dict[str, Any], root_path: Sequence[str],
+                     min_depth: int) -> List[Dict[str, Any]]:
+    """
+    Compute the minimal set/delete operations between two sets of leaf paths.
+
+    Args:
+        current: Leaf paths the scope has now (only those present in config_root count)
+        desired: Leaf paths the scope should have
+        config_root: Config subtree the paths live in, as returned for root_path
+        root_path: Configuration path of config_root, e.g. ["service", "dhcp-server"]
+        min_depth: Shortest path a collapsed delete may target
+
+    Returns:
+        Operations for configure_multiple_op, deletes first
+    """
+    # Count the real leaves under every node; current paths the router does not
+    # actually have (display defaults such as the fallback lease time) are ignored
+    root = tuple(root_path)
+    real_leaves: Set[Path] = set(config_leaves(config_root, root))
+    leaf_counts: Dict[Path, int] = {}
+    for leaf in real_leaves:
+        for depth in range(min_depth, len(leaf) + 1):
+            leaf_counts[leaf[:depth]] = leaf_counts.get(leaf[:depth], 0) + 1
+
+    current_set: Set[Path] = {tuple(path) for path in current} & real_leaves
+    desired_set: Set[Path] = {tuple(path) for path in desired}
+
+    to_set = sorted(desired_set - current_set)
+
+    def single_value(path: Path) -> bool:
+        return path[-1] not in VALUELESS_LEAVES and path[-2] not in MULTI_VALUE_LEAVES
+
+    overwritten = {path[:-1] for path in to_set if single_value(path)}
+    to_delete = sorted(
+        path for path in current_set - desired_set
+        if not single_value(path) or path[:-1] not in overwritten
+    )
+
+    delete_counts: Dict[Path, int] = {}
+    for leaf in to_delete:
+        for depth in range(min_depth, len(leaf) + 1):
+            delete_counts[leaf[:depth]] = delete_counts.get(leaf[:depth], 0) + 1
+
+    desired_prefixes = {path[:depth] for path in desired_set for depth in range(min_depth, len(path) + 1)}
+
+    collapsed: List[Path] = []
+    covered: Set[Path] = set()
+    for leaf in to_delete:
+        target = leaf
+        for depth in range(min_depth, len(leaf)):
+            node = leaf[:depth]
+            if node not in desired_prefixes and leaf_counts.get(node) and delete_counts.get(node) == leaf_counts[node]:
+                target = node
+                break
+        if any(target[:depth] in covered for depth in range(min_depth, len(target) + 1)):
+            continue
+        covered.add(target)
+        collapsed.append(target)
+
+    operations = [{"op": "delete", "path": list(path)} for path in collapsed]
+    operations.extend({"op": "set", "path": list(path)} for path in to_set)
+    return operations
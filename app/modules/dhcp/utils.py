@@ -1,8 +1,20 @@
 import ipaddress
-import json
 import re
 from typing import Any, Dict, Iterable, List, Optional, Sequence
 
+from app.modules.interfaces.types import interface_index
+
+# Interface types a DHCP scope can be served on
+DHCP_INTERFACE_TYPES = (
+    "ethernet",
+    "bonding",
+    "bridge",
+    "wireless",
+    "pseudo-ethernet",
+    "virtual-ethernet",
+    "vxlan",
+)
+
 
 def ensure_dict(node: Any) -> Dict[Any, Any]:
     if isinstance(node, dict):
@@ -227,55 +239,42 @@ def parse_lease_table(raw: Any) -> List[Dict[str, str]]:
     return leases
 
 
-def get_next_subnet_id(device) -> int:
-    data = device.show(path=["configuration", "json"])
-    config = json.loads(data.result)
-    dhcp_config = (
-        config.get("service", {})
-        .get("dhcp-server", {})
-        .get("shared-network-name", {})
-    )
+def get_interface_details(config: Dict[str, Any], iface: str) -> Dict[str, Any]:
+    # Config is the interfaces result; the name may be of any type, e.g. br0 or bond0.20
+    entry = interface_index(config, types=DHCP_INTERFACE_TYPES).get(iface)
+    iface_config = entry["config"] if entry else {}
+    addr_value = iface_config.get("address", [])
 
-    used_ids = set()
-    for shared_info in dhcp_config.values():
-        for details in shared_info.get("subnet", {}).values():
-            try:
-                used_ids.add(int(details.get("subnet-id", 0)))
-            except (TypeError, ValueError):
-                continue
+    return {
+        "description": iface_config.get("description", ""),
+        # Ensure addresses is always a list
+        "addresses": addr_value if isinstance(addr_value, list) else [addr_value] if addr_value else [],
+    }
 
-    candidate = 1
-    while candidate in used_ids:
-        candidate += 1
-    return candidate
 
+def find_shared_network(iface_config: Dict[str, Any], dhcp_config: Dict[str, Any], iface: str) -> Optional[str]:
+    """Return the shared-network-name serving an interface, matching get_dhcp's lookup order."""
+    details = get_interface_details(iface_config, iface)
+    description = str(details.get("description") or "")
+    iface_subnets = set()
+    for addr in details.get("addresses", []):
+        if "/" not in str(addr):
+            continue
+        try:
+            iface_subnets.add(str(ipaddress.ip_network(str(addr).strip(), strict=False)))
+        except ValueError:
+            continue
 
-def get_interface_details(config: Dict[str, Any], iface: str) -> Dict[str, Any]:
-    # Config is already the interfaces result, so get ethernet directly
-    ethernet = config.get("ethernet", {})
-    description = ""
-    addresses: List[str] = []
-
-    if iface in ethernet:
-        iface_config = ethernet.get(iface, {})
-        description = iface_config.get("description", "")
-        addr_value = iface_config.get("address", [])
-        # Ensure addresses is always a list
-        addresses = addr_value if isinstance(addr_value, list) else [addr_value] if addr_value else []
-    else:
-        if "." in iface:
-            parent, vlan_id = iface.split(".", 1)
-            parent_cfg = ethernet.get(parent, {})
-            vif = parent_cfg.get("vif", {}).get(vlan_id, {})
-            description = vif.get("description", "")
-            addr_value = vif.get("address", [])
-            # Ensure addresses is always a list
-            addresses = addr_value if isinstance(addr_value, list) else [addr_value] if addr_value else []
+    shared_networks = ensure_dict(dhcp_config.get("shared-network-name"))
+    for shared_name, shared_info in shared_networks.items():
+        subnets = ensure_dict(ensure_dict(shared_info).get("subnet"))
+        if iface_subnets.intersection(subnets.keys()):
+            return shared_name
 
-    return {
-        "description": description,
-        "addresses": addresses,
-    }
+    for shared_name in shared_networks.keys():
+        if shared_name.lower() in (iface.lower(), description.lower()):
+            return shared_name
+    return None
 
 
 def get_interface_ip(addresses: Iterable[str]) -> str:
@@ -1,14 +1,25 @@
+import csv
+import io
 import ipaddress
+from datetime import datetime
 from flask import Blueprint, render_template, current_app, request, jsonify
 from app.auth import login_required
-from app.core import mark_config_dirty
-from app.modules.interfaces.device import configure_multiple_op
-
+from app.core import load_config_subtree, mark_config_dirty
+from app.modules.interfaces.device import configure_multiple_op, configure_multiple_op_chunked
+from app.modules.interfaces.types import iter_interfaces
+
+from .allocator import allocate_subnet_id, claim_subnet_id, next_subnet_id, release_subnet_id
+from .capacity import DHCP_CAPACITY_THRESHOLD, pool_capacity_report
+from .history import EVENT_TYPES, pool_utilisation, query_events
+from .leases import get_lease_table
+from .mappings import STATIC_MAPPING_CHUNK_SIZE, iter_mapping_rows, plan_static_mapping_import, static_mapping_of
+from .scope import diff_scope_paths
 from .utils import (
+    DHCP_INTERFACE_TYPES,
     ensure_dict,
+    find_shared_network,
     get_interface_details,
     get_interface_ip,
-    get_next_subnet_id,
     parse_lease_table,
     strip_or_none,
 )
@@ -170,150 +181,32 @@ def _build_global_set_commands(global_data):
     return commands
 
 
-def _build_delete_commands(scope_data, previous_scope):
-    """
-    Build delete commands for items that were removed.
-    Returns a list of paths to delete.
-    """
-    delete_commands = []
-
-    if not previous_scope:
-        return delete_commands
-
-    shared_network = strip_or_none(scope_data.get("sharedNetwork"))
-    subnet = strip_or_none(scope_data.get("subnet"))
-    prev_shared = strip_or_none(previous_scope.get("sharedNetwork"))
-    prev_subnet = strip_or_none(previous_scope.get("subnet"))
-
-    # If shared network or subnet changed, delete the old one entirely
-    if prev_shared and prev_subnet:
-        if prev_shared != shared_network or prev_subnet != subnet:
-            delete_commands.append([
-                "service", "dhcp-server", "shared-network-name",
-                prev_shared, "subnet", prev_subnet
-            ])
-            return delete_commands
-
-    base_path = ["service", "dhcp-server", "shared-network-name", shared_network]
-    subnet_path = base_path + ["subnet", subnet]
-
-    # Check if authoritative was disabled
-    if previous_scope.get("authoritative") and not scope_data.get("authoritative"):
-        delete_commands.append(base_path + ["authoritative"])
-
-    # Check for removed static mappings
-    prev_mappings = {
-        strip_or_none(m.get("name")): m
-        for m in (previous_scope.get("staticMappings") or [])
-        if strip_or_none(m.get("name"))
-    }
-    new_mappings = {
-        strip_or_none(m.get("name")): m
-        for m in (scope_data.get("staticMappings") or [])
-        if strip_or_none(m.get("name"))
-    }
-
-    for name in prev_mappings:
-        if name not in new_mappings:
-            delete_commands.append(subnet_path + ["static-mapping", name])
-
-    # Check if excludes were removed (only if we have previous excludes)
-    prev_excludes = set(strip_or_none(e) for e in (previous_scope.get("excludes") or []) if strip_or_none(e))
-    new_excludes = set(strip_or_none(e) for e in (scope_data.get("excludes") or []) if strip_or_none(e))
-    removed_excludes = prev_excludes - new_excludes
-    for exclude in removed_excludes:
-        delete_commands.append(subnet_path + ["exclude", exclude])
-
-    # Check if DNS servers were removed
-    prev_dns = set(strip_or_none(d) for d in (previous_scope.get("dnsServers") or []) if strip_or_none(d))
-    new_dns = set(strip_or_none(d) for d in (scope_data.get("dnsServers") or []) if strip_or_none(d))
-    removed_dns = prev_dns - new_dns
-    for dns_server in removed_dns:
-        delete_commands.append(subnet_path + ["option", "name-server", dns_server])
-
-    # Check if search domains were removed
-    prev_domains = set(strip_or_none(d) for d in (previous_scope.get("searchDomains") or []) if strip_or_none(d))
-    new_domains = set(strip_or_none(d) for d in (scope_data.get("searchDomains") or []) if strip_or_none(d))
-    removed_domains = prev_domains - new_domains
-    for domain in removed_domains:
-        delete_commands.append(subnet_path + ["option", "domain-search", domain])
-
-    return delete_commands
-
-
-def _build_global_delete_commands(global_data, previous_global):
-    """
-    Build delete commands for removed global settings.
-    """
-    delete_commands = []
-
-    if not previous_global:
-        return delete_commands
-
-    base_path = ["service", "dhcp-server"]
-
-    # Check if hostfile-update was disabled
-    if previous_global.get("hostfileUpdate") and not global_data.get("hostfileUpdate"):
-        delete_commands.append(base_path + ["hostfile-update"])
-
-    # Check if HA was removed
-    prev_ha = previous_global.get("highAvailability")
-    new_ha = global_data.get("highAvailability")
-    if prev_ha and not new_ha:
-        delete_commands.append(base_path + ["high-availability"])
-
-    # Check for removed listen addresses
-    prev_listen = set(strip_or_none(a) for a in (previous_global.get("listenAddresses") or []) if strip_or_none(a))
-    new_listen = set(strip_or_none(a) for a in (global_data.get("listenAddresses") or []) if strip_or_none(a))
-    removed_listen = prev_listen - new_listen
-    for address in removed_listen:
-        delete_commands.append(base_path + ["listen-address", address])
-
-    return delete_commands
-
-
 @dhcp_bp.route('/dhcp')
 @login_required
 def dhcp():
     """Main DHCP page - shows interface list"""
-    device = current_app.device
-    config_data = device.retrieve_show_config(path=["interfaces"])
-    # retrieve_show_config returns dict directly, not JSON string
-    config = config_data.result if config_data and config_data.result else {}
+    config = load_config_subtree(["interfaces"])
 
     interfaces = {}
-    ethernet = config.get("ethernet", {})
-    for iface, info in ethernet.items():
-        interfaces[iface] = {
-            "description": info.get("description", ""),
-            "address": info.get("address", []),
+    for entry in iter_interfaces(config, types=DHCP_INTERFACE_TYPES):
+        info = {
+            "description": entry["config"].get("description", ""),
+            "address": entry["config"].get("address", []),
         }
-        # Include VLANs
-        for vlan_id, vlan_info in info.get("vif", {}).items():
-            vlan_name = f"{iface}.{vlan_id}"
-            interfaces[vlan_name] = {
-                "description": vlan_info.get("description", ""),
-                "address": vlan_info.get("address", []),
-                "parent": iface,
-            }
+        if entry["parent"]:
+            info["parent"] = entry["parent"]
+        interfaces[entry["name"]] = info
 
-    next_subnet_id = get_next_subnet_id(device)
-    return render_template('dhcp/dhcp.html', interfaces=interfaces, next_subnet_id=next_subnet_id)
+    return render_template('dhcp/dhcp.html', interfaces=interfaces, next_subnet_id=next_subnet_id())
 
 
 @dhcp_bp.route('/services/dhcp/<iface>', methods=['GET'])
 @login_required
 def get_dhcp(iface):
     """Get DHCP configuration for a specific interface"""
-    device = current_app.device
-
-    # Get interface configuration
-    iface_data = device.retrieve_show_config(path=["interfaces"])
-    iface_config = iface_data.result if iface_data and iface_data.result else {}
-
-    # Get DHCP server configuration
-    dhcp_data = device.retrieve_show_config(path=["service", "dhcp-server"])
-    dhcp_config = dhcp_data.result if dhcp_data and dhcp_data.result else {}
+    # Get interface and DHCP server configuration (cached per config revision)
+    iface_config = load_config_subtree(["interfaces"])
+    dhcp_config = load_config_subtree(["service", "dhcp-server"])
 
     # Get interface details
     interface_details = get_interface_details(iface_config, iface)
@@ -604,7 +497,7 @@ def get_dhcp(iface):
 
     matched["interfaceDescription"] = description
     matched["interfaceIp"] = interface_ip
-    matched["nextAvailableSubnetId"] = str(get_next_subnet_id(device))
+    matched["nextAvailableSubnetId"] = str(next_subnet_id(dhcp_config))
     matched["globalSettings"] = global_settings
 
     return matched
@@ -615,75 +508,243 @@ def get_dhcp(iface):
 def list_leases(iface):
     """Get active DHCP leases for an interface"""
     try:
-        scope = get_dhcp(iface)
+        shared_network = find_shared_network(
+            load_config_subtree(["interfaces"]),
+            load_config_subtree(["service", "dhcp-server"]),
+            iface,
+        )
     except Exception as exc:
-        import traceback
-        traceback.print_exc()
+        current_app.logger.error(f"Failed to resolve DHCP pool for {iface}: {exc}")
         return jsonify({"status": "error", "message": str(exc)}), 500
 
-    # Get the shared network name (this is the pool name)
-    shared_network = strip_or_none(scope.get("sharedNetwork"))
-
     if not shared_network:
         # No shared network configured, return empty leases
         return jsonify({"status": "ok", "data": []})
 
-    leases = []
+    # The shared network name is the lease pool name
+    leases = get_lease_table().for_pool(shared_network)
+    current_app.logger.debug(f"Found {len(leases)} leases for pool '{shared_network}'")
+    return jsonify({"status": "ok", "data": leases})
+
+
+@dhcp_bp.route('/services/dhcp/leases/search', methods=['GET'])
+@login_required
+def search_leases():
+    """Search active DHCP leases across all pools by IP, MAC or hostname"""
+    query = (request.args.get("q") or "").strip()
+    pool = strip_or_none(request.args.get("pool")) or None
     try:
-        # Query leases for the specific pool (shared-network-name)
-        import json
-        response = current_app.device.show(path=["dhcp", "server", "leases", "pool", shared_network])
-        raw_result = getattr(response, "result", "") or ""
-
-        if not raw_result or not raw_result.strip():
-            # No leases for this pool
-            return jsonify({"status": "ok", "data": []})
-
-        # Parse the table output into JSON
-        lines = [line.rstrip() for line in raw_result.strip().splitlines() if line.strip()]
-
-        if len(lines) < 3:
-            # Not enough lines for a valid table (header, separator, data)
-            return jsonify({"status": "ok", "data": []})
-
-        # Extract headers from first line
-        headers = [h.strip() for h in lines[0].split("  ") if h.strip()]
-
-        # Data rows start after the dashed separator (line 2)
-        rows = lines[2:]
-
-        # Parse each row
-        for row in rows:
-            # Split on multiple spaces, filter empty
-            values = [v.strip() for v in row.split("  ") if v.strip()]
-            if len(values) >= len(headers):
-                record = dict(zip(headers, values))
-
-                # Normalize keys for frontend compatibility
-                # Convert "IP Address" -> "ip", "MAC address" -> "mac", etc.
-                normalized = {
-                    "ip": record.get("IP Address", record.get("IP address", "")),
-                    "mac": record.get("MAC address", record.get("MAC Address", "")),
-                    "state": record.get("State", ""),
-                    "lease_start": record.get("Lease start", ""),
-                    "lease_expiration": record.get("Lease expiration", ""),
-                    "remaining": record.get("Remaining", ""),
-                    "pool": record.get("Pool", ""),
-                    "hostname": record.get("Hostname", ""),
-                    "origin": record.get("Origin", ""),
-                }
-
-                leases.append(normalized)
-
-        current_app.logger.debug(f"Parsed {len(leases)} leases for pool '{shared_network}'")
+        limit = max(1, min(int(request.args.get("limit", 100)), 1000))
+    except ValueError:
+        return jsonify({"status": "error", "message": "limit must be an integer"}), 400
+
+    if not query:
+        return jsonify({"status": "error", "message": "Query parameter q is required"}), 400
+
+    return jsonify({"status": "ok", "data": get_lease_table().search(query, pool=pool, limit=limit)})
 
+
+@dhcp_bp.route('/services/dhcp/capacity', methods=['GET'])
+@login_required
+def pool_capacity():
+    """Dynamic capacity and utilisation of every DHCP subnet, busiest first"""
+    try:
+        threshold = float(request.args.get("threshold", DHCP_CAPACITY_THRESHOLD))
+    except ValueError:
+        return jsonify({"status": "error", "message": "threshold must be a number"}), 400
+
+    table = get_lease_table()
+    leases_by_pool = {
+        pool: [table.columns["ip"][row] for row in rows if table.columns["state"][row] == "active"]
+        for pool, rows in table.by_pool.items()
+    }
+
+    try:
+        report = pool_capacity_report(load_config_subtree(["service", "dhcp-server"]), leases_by_pool, threshold)
     except Exception as exc:
-        current_app.logger.error(f"Failed to fetch leases for pool '{shared_network}': {exc}")
-        import traceback
-        traceback.print_exc()
-        leases = []
+        current_app.logger.error(f"Failed to compute DHCP capacity: {exc}")
+        return jsonify({"status": "error", "message": str(exc)}), 500
 
-    return jsonify({"status": "ok", "data": leases})
+    return jsonify({
+        "status": "ok",
+        "threshold": threshold,
+        "flagged": sum(1 for entry in report if entry["overThreshold"]),
+        "data": report,
+    })
+
+
+@dhcp_bp.route('/services/dhcp/static-mappings/import', methods=['POST'])
+@login_required
+def import_static_mappings():
+    """Bulk import static mappings (name, MAC, IP, hostname) from a CSV or JSON file"""
+    upload = request.files.get("file")
+    if not upload:
+        return jsonify({"status": "error", "message": "A CSV or JSON file is required"}), 400
+
+    dry_run = (request.form.get("dryRun") or "").strip().lower() in ("1", "true", "yes", "on")
+    allow_partial = (request.form.get("allowPartial") or "").strip().lower() in ("1", "true", "yes", "on")
+
+    try:
+        stream = io.TextIOWrapper(upload.stream, encoding="utf-8-sig", errors="replace")
+        plan = plan_static_mapping_import(
+            iter_mapping_rows(stream, upload.filename or ""),
+            load_config_subtree(["service", "dhcp-server"]),
+        )
+    except (ValueError, csv.Error) as exc:
+        return jsonify({"status": "error", "message": f"Could not read import file: {exc}"}), 400
+
+    operations = plan.pop("operations")
+    summary = {**plan, "operations": len(operations)}
+
+    if plan["rejected"] and not allow_partial:
+        return jsonify({
+            "status": "error",
+            "message": f"{plan['rejected']} row(s) rejected, nothing was applied",
+            **summary,
+        }), 400
+
+    if dry_run or not operations:
+        return jsonify({
+            "status": "ok",
+            "message": "Dry run, no changes applied" if dry_run else "No changes to apply",
+            **summary,
+            "config_dirty": False,
+        })
+
+    success, error_message, applied = configure_multiple_op_chunked(
+        operations,
+        STATIC_MAPPING_CHUNK_SIZE,
+        error_context="import DHCP static mappings",
+        group_key=static_mapping_of,
+    )
+    if applied:
+        mark_config_dirty()
+
+    if not success:
+        return jsonify({
+            "status": "error",
+            "message": error_message or "Failed to import static mappings",
+            "applied": applied,
+            **summary,
+        }), 500
+
+    return jsonify({
+        "status": "ok",
+        "message": f"{plan['created']} created, {plan['updated']} updated",
+        **summary,
+        "config_dirty": True,
+    })
+
+
+def _parse_time_arg(name):
+    """Parse a time query argument given as unix seconds or ISO 8601."""
+    value = strip_or_none(request.args.get(name))
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise ValueError(f"Invalid {name} time: {value}")
+
+
+@dhcp_bp.route('/services/dhcp/leases/history', methods=['GET'])
+@login_required
+def lease_history():
+    """Query the lease event log (new, renewed, moved, expired) for a time range"""
+    event = strip_or_none(request.args.get("event")) or None
+    if event and event not in EVENT_TYPES:
+        return jsonify({"status": "error", "message": f"Invalid event type: {event}"}), 400
+
+    try:
+        start = _parse_time_arg("start")
+        end = _parse_time_arg("end")
+        limit = max(1, min(int(request.args.get("limit", 500)), 5000))
+        events = query_events(
+            start=start,
+            end=end,
+            pool=strip_or_none(request.args.get("pool")) or None,
+            mac=strip_or_none(request.args.get("mac")) or None,
+            ip=strip_or_none(request.args.get("ip")) or None,
+            event=event,
+            limit=limit,
+        )
+    except ValueError as exc:
+        return jsonify({"status": "error", "message": str(exc)}), 400
+    except Exception as exc:
+        current_app.logger.error(f"Failed to query lease history: {exc}")
+        return jsonify({"status": "error", "message": str(exc)}), 500
+
+    return jsonify({"status": "ok", "data": events})
+
+
+@dhcp_bp.route('/services/dhcp/leases/utilisation', methods=['GET'])
+@login_required
+def lease_utilisation():
+    """Active leases per pool over time, bucketed by the given number of seconds"""
+    try:
+        start = _parse_time_arg("start")
+        end = _parse_time_arg("end")
+        bucket = max(60, int(request.args.get("bucket", 3600)))
+        series = pool_utilisation(
+            start=start,
+            end=end,
+            pool=strip_or_none(request.args.get("pool")) or None,
+            bucket=bucket,
+        )
+    except ValueError as exc:
+        return jsonify({"status": "error", "message": str(exc)}), 400
+    except Exception as exc:
+        current_app.logger.error(f"Failed to query pool utilisation: {exc}")
+        return jsonify({"status": "error", "message": str(exc)}), 500
+
+    return jsonify({"status": "ok", "data": series})
+
+
+def _scope_paths(scope_data, global_data=None):
+    """Full leaf paths a scope (and optionally the global settings) consists of."""
+    paths = _build_dhcp_set_commands(scope_data)
+    if not scope_data.get("enabled", True):
+        shared_network = strip_or_none(scope_data.get("sharedNetwork"))
+        paths.append(["service", "dhcp-server", "shared-network-name", shared_network, "disable"])
+    if global_data is not None:
+        paths.extend(_build_global_set_commands(global_data))
+    return paths
+
+
+def _build_scope_update_operations(data, existing, global_settings=None):
+    """
+    Minimal operations turning the existing scope into the requested one.
+
+    Global settings are only compared when the request includes them.
+    """
+    base = ["service", "dhcp-server", "shared-network-name"]
+    shared_network = strip_or_none(data.get("sharedNetwork"))
+    subnet = strip_or_none(data.get("subnet"))
+    prev_shared = strip_or_none(existing.get("sharedNetwork"))
+    prev_subnet = strip_or_none(existing.get("subnet"))
+    existing_global = (existing.get("globalSettings") or {}) if global_settings is not None else None
+
+    current_paths = _scope_paths(existing, existing_global)
+    desired_paths = _scope_paths(data, global_settings)
+    operations = []
+
+    # A moved scope is recreated: drop the old subnet, then diff against nothing
+    if (prev_shared, prev_subnet) != (shared_network, subnet):
+        operations.append({"op": "delete", "path": base + [prev_shared, "subnet", prev_subnet]})
+        current_paths = [path for path in current_paths if path[:len(base)] != base]
+
+    operations.extend(diff_scope_paths(
+        current_paths,
+        desired_paths,
+        load_config_subtree(["service", "dhcp-server"]),
+        ["service", "dhcp-server"],
+        min_depth=len(base) + 1,
+    ))
+    return operations
 
 
 def _validate_payload(data):
@@ -723,6 +784,7 @@ def create_dhcp(iface):
     payload = request.get_json() or {}
     data = payload.get("data", payload)
     global_settings = payload.get("global") or {}
+    reserved_subnet_id = None
 
     try:
         _validate_payload(data)
@@ -734,14 +796,12 @@ def create_dhcp(iface):
                 "message": "DHCP configuration already exists for this interface."
             }), 400
 
-        # Set subnet ID if not provided
-        subnet_id = (
-            data.get("subnetId")
-            or data.get("subnet_id")
-            or existing.get("nextAvailableSubnetId")
-            or str(get_next_subnet_id(current_app.device))
-        )
-        data["subnetId"] = subnet_id
+        # Reserve the subnet ID the form was given; if another scope took it
+        # in the meantime, allocate the next free one instead
+        subnet_id = data.get("subnetId") or data.get("subnet_id")
+        if not subnet_id or not claim_subnet_id(subnet_id):
+            subnet_id = str(allocate_subnet_id())
+        data["subnetId"] = reserved_subnet_id = subnet_id
 
         # Build set commands
         set_commands = _build_dhcp_set_commands(data)
@@ -768,6 +828,7 @@ def create_dhcp(iface):
 
             if not success:
                 raise RuntimeError(error_message or "Failed to create DHCP configuration")
+        reserved_subnet_id = None
 
         # Mark configuration as dirty (unsaved changes)
         mark_config_dirty()
@@ -781,6 +842,10 @@ def create_dhcp(iface):
         import traceback
         traceback.print_exc()
         return jsonify({"status": "error", "message": str(exc)}), 500
+    finally:
+        # A subnet ID reserved for a scope that was never committed goes back to the pool
+        if reserved_subnet_id is not None:
+            release_subnet_id(reserved_subnet_id)
 
 
 @dhcp_bp.route('/services/dhcp/<iface>/update', methods=['POST'])
@@ -796,6 +861,7 @@ def update_dhcp(iface):
     except ValueError as exc:
         return jsonify({"status": "error", "message": str(exc)}), 400
 
+    reserved_subnet_id = None
     try:
         existing = get_dhcp(iface)
 
@@ -806,64 +872,51 @@ def update_dhcp(iface):
             }), 400
 
         # Preserve subnet ID if not provided
-        subnet_id = (
-            data.get("subnetId")
-            or data.get("subnet_id")
-            or existing.get("subnetId")
-            or existing.get("nextAvailableSubnetId")
-            or str(get_next_subnet_id(current_app.device))
-        )
+        subnet_id = data.get("subnetId") or data.get("subnet_id") or existing.get("subnetId")
+        if not subnet_id:
+            subnet_id = reserved_subnet_id = str(allocate_subnet_id())
         data["subnetId"] = subnet_id
 
-        # Build commands
-        delete_commands = _build_delete_commands(data, existing)
-        set_commands = _build_dhcp_set_commands(data, existing)
-
-        global_delete_commands = _build_global_delete_commands(global_settings, existing.get("globalSettings"))
-        global_set_commands = _build_global_set_commands(global_settings)
-
-        all_delete = delete_commands + global_delete_commands
-        all_set = set_commands + global_set_commands
-
-        current_app.logger.debug("DHCP update delete: %s", all_delete)
-        current_app.logger.debug("DHCP update set: %s", all_set)
-
-        # Handle enable/disable state
-        shared_network = strip_or_none(data.get("sharedNetwork"))
-        base_path = ["service", "dhcp-server", "shared-network-name", shared_network]
-
-        if data.get("enabled", True):
-            # Remove disable flag if exists
-            all_delete.append(base_path + ["disable"])
-        else:
-            # Add disable flag
-            all_set.append(base_path + ["disable"])
+        operations = _build_scope_update_operations(
+            data,
+            existing,
+            global_settings if "global" in payload else None,
+        )
+        current_app.logger.debug("DHCP update operations: %s", operations)
 
-        # Build operations for configure_multiple_op (delete first, then set)
-        operations = []
-        operations.extend([{"op": "delete", "path": path} for path in all_delete])
-        operations.extend([{"op": "set", "path": path} for path in all_set])
+        if not operations:
+            return jsonify({"status": "ok", "created": False, "data": existing, "config_dirty": False})
 
-        # Execute all operations in a single batch
-        if operations:
-            success, error_message = configure_multiple_op(
-                operations,
-                error_context="update DHCP configuration"
-            )
+        success, error_message = configure_multiple_op(
+            operations,
+            error_context="update DHCP configuration"
+        )
 
-            if not success:
-                raise RuntimeError(error_message or "Failed to update DHCP configuration")
+        if not success:
+            raise RuntimeError(error_message or "Failed to update DHCP configuration")
+        reserved_subnet_id = None
 
         # Mark configuration as dirty (unsaved changes)
         mark_config_dirty()
 
-        refreshed = get_dhcp(iface)
-        return jsonify({"status": "ok", "created": False, "data": refreshed, "config_dirty": True})
+        # Respond with the state just applied instead of re-reading the router
+        applied = {
+            **existing,
+            **data,
+            "enabled": bool(data.get("enabled", True)),
+            "isConfigured": True,
+        }
+        if "global" in payload:
+            applied["globalSettings"] = global_settings
+        return jsonify({"status": "ok", "created": False, "data": applied, "config_dirty": True})
 
     except Exception as exc:
         import traceback
         traceback.print_exc()
         return jsonify({"status": "error", "message": str(exc)}), 500
+    finally:
+        if reserved_subnet_id is not None:
+            release_subnet_id(reserved_subnet_id)
 
 
 @dhcp_bp.route('/services/dhcp/<iface>/delete', methods=['POST'])
@@ -0,0 +1,337 @@
+"""
+Firewall activity from logged packets.
+
+VyOS logs matched packets through the kernel as
+"[<rule prefix>]IN=eth0 OUT= SRC=... DST=... PROTO=TCP SPT=... DPT=...",
+for nftables (ipv4-FWD-filter-10-D, ipv4-NAM-WAN_IN-default-D) and legacy
+iptables (WAN_IN-10-D) rule sets alike; the last letter of the prefix is the
+action. A background sampler reads the log lines appended since its cursor
+and folds them into a sliding window of time buckets.
+
+Each bucket keeps Space-Saving heavy-hitter counters for blocked sources,
+blocked destination ports and rule hits, so memory stays bounded by
+FIREWALL_TOP_CAPACITY entries per counter however many distinct addresses a
+scan throws at the router. Counts for tracked keys are upper bounds with a
+reported maximum overestimate ('error').
+"""
+import functools
+import math
+import os
+import re
+import threading
+import time
+from collections import deque
+from datetime import date, datetime
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from app.core import register_sampler
+from app.modules.logs.utils import fetch_log_lines, parse_log_time, read_new_lines
+
+FIREWALL_ACTIVITY_INTERVAL = float(os.getenv("FIREWALL_ACTIVITY_INTERVAL", "10"))
+FIREWALL_ACTIVITY_WINDOW = float(os.getenv("FIREWALL_ACTIVITY_WINDOW", "3600"))
+FIREWALL_TOP_CAPACITY = int(os.getenv("FIREWALL_TOP_CAPACITY", "200"))
+WINDOW_BUCKETS = 12
+RECENT_BLOCKS = 20
+
+ACTIONS = {"A": "accept", "D": "drop", "R": "reject"}
+BLOCKING_ACTIONS = ("drop", "reject")
+
+_PACKET_PREFIX = re.compile(r"\[(?P<prefix>[^\]\s]+)\]\s*(?=IN=)")
+_PACKET_FIELD = re.compile(r"\b(IN|OUT|SRC|DST|PROTO|SPT|DPT)=(\S*)")
+_LINE_TIME = re.compile(r"^([A-Z][a-z]{2} [ \d]\d \d{2}:\d{2}:\d{2}|\d{4}-\d{2}-\d{2}[T ][\d:.]+(?:Z|[+-]\d{2}:?\d{2})?)")
+_RULE_PREFIX = re.compile(
+    r"^(?:(?P<family>ipv4|ipv6|bri)-)?(?P<chain>.+?)-(?P<rule>default|\d+)(?:-(?P<action>[A-Z]))?$"
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_rule_prefix(prefix: str) -> Dict[str, Optional[str]]:
+    """Split a log prefix such as ipv4-NAM-WAN_IN-10-D into chain, rule and action (callers must not mutate it)."""
+    match = _RULE_PREFIX.match(prefix)
+    if not match:
+        return {"chain": prefix, "rule": None, "action": None}
+    action = match.group("action")
+    return {
+        "chain": match.group("chain"),
+        "rule": match.group("rule"),
+        "action": ACTIONS.get(action, action.lower()) if action else None,
+    }
+
+
+@functools.lru_cache(maxsize=4096)
+def _line_timestamp(value: str) -> Optional[float]:
+    # Bursts share the same second, and strptime dominates the parse otherwise
+    return parse_log_time(value)
+
+
+def parse_firewall_line(line: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse a logged packet line; returns None for any other log line.
+
+    Returns:
+        Dict with prefix, action, in/out interface, src, dst, proto, spt, dpt
+        and timestamp (None when the line has no parseable time)
+    """
+    if "SRC=" not in line:
+        return None
+    match = _PACKET_PREFIX.search(line)
+    if not match:
+        return None
+    fields = dict(_PACKET_FIELD.findall(line, match.end()))
+    if not fields.get("SRC"):
+        return None
+
+    prefix = match.group("prefix")
+    time_match = _LINE_TIME.match(line)
+    return {
+        "prefix": prefix,
+        "action": parse_rule_prefix(prefix)["action"],
+        "in": fields.get("IN") or None,
+        "out": fields.get("OUT") or None,
+        "src": fields["SRC"],
+        "dst": fields.get("DST") or None,
+        "proto": (fields.get("PROTO") or "").lower() or None,
+        "spt": int(fields["SPT"]) if fields.get("SPT", "").isdigit() else None,
+        "dpt": int(fields["DPT"]) if fields.get("DPT", "").isdigit() else None,
+        "timestamp": _line_timestamp(time_match.group(1)) if time_match else None,
+    }
+
+
+class SpaceSavingCounter:
+    """
+    Approximate top-k counter that tracks at most `capacity` keys.
+
+    When full, a new key replaces the smallest tracked one and inherits its
+    count, which becomes the new key's maximum overestimate. Any key seen
+    more than total/capacity times is guaranteed to be tracked. Keys are
+    grouped by count (the "stream summary"), so the smallest is found
+    without scanning every tracked key.
+    """
+
+    def __init__(self, capacity: int = FIREWALL_TOP_CAPACITY):
+        self.capacity = max(1, capacity)
+        self.total = 0
+        self._counts: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+        self._by_count: Dict[int, Dict[str, None]] = {}
+        self._min = 0
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def _place(self, key: str, count: int) -> None:
+        self._counts[key] = count
+        self._by_count.setdefault(count, {})[key] = None
+
+    def _discard(self, key: str) -> int:
+        count = self._counts.pop(key)
+        group = self._by_count[count]
+        del group[key]
+        if not group:
+            del self._by_count[count]
+        return count
+
+    def add(self, key: str, count: int = 1) -> None:
+        self.total += count
+        if key in self._counts:
+            self._place(key, self._discard(key) + count)
+        elif len(self._counts) < self.capacity:
+            self._place(key, count)
+            self._errors[key] = 0
+            self._min = min(self._min, count) if len(self._counts) > 1 else count
+            return
+        else:
+            evicted = next(iter(self._by_count[self._min]))
+            floor = self._discard(evicted)
+            del self._errors[evicted]
+            self._place(key, floor + count)
+            self._errors[key] = floor
+
+        if self._min not in self._by_count:
+            # Increments are usually 1, so the next smallest count is one up
+            self._min = self._min + 1 if self._min + 1 in self._by_count else min(self._by_count)
+
+    def items(self) -> Iterable[Tuple[str, int, int]]:
+        """Tracked (key, count, error) triples in no particular order."""
+        for key, count in self._counts.items():
+            yield key, count, self._errors[key]
+
+
+def merge_top(counters: Iterable[SpaceSavingCounter], limit: int) -> List[Tuple[str, int, int]]:
+    """Sum several counters (e.g. the buckets of a window) and return the `limit` largest keys."""
+    counts: Dict[str, int] = {}
+    errors: Dict[str, int] = {}
+    for counter in counters:
+        for key, count, error in counter.items():
+            counts[key] = counts.get(key, 0) + count
+            errors[key] = errors.get(key, 0) + error
+    ranked = sorted(counts, key=counts.__getitem__, reverse=True)[:limit]
+    return [(key, counts[key], errors[key]) for key in ranked]
+
+
+class _Bucket:
+    __slots__ = ("index", "sources", "ports", "rules", "blocked", "logged")
+
+    def __init__(self, index: int, capacity: int):
+        self.index = index
+        self.sources = SpaceSavingCounter(capacity)
+        self.ports = SpaceSavingCounter(capacity)
+        self.rules = SpaceSavingCounter(capacity)
+        self.blocked = 0
+        self.logged = 0
+
+
+class FirewallActivity:
+    """Sliding-window aggregates of logged firewall packets."""
+
+    def __init__(self, window: float = FIREWALL_ACTIVITY_WINDOW, buckets: int = WINDOW_BUCKETS,
+                 capacity: int = FIREWALL_TOP_CAPACITY):
+        self.window = window
+        self.bucket_count = max(1, buckets)
+        self.bucket_width = window / self.bucket_count
+        self.capacity = capacity
+        self.cursor: Optional[str] = None
+        self.last_sampled: Optional[float] = None
+        self._lock = threading.Lock()
+        self._buckets: Deque[_Bucket] = deque()
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=RECENT_BLOCKS)
+        self._blocked_by_day: Dict[date, int] = {}
+
+    def _bucket(self, index: int, current: int) -> Optional[_Bucket]:
+        if index <= current - self.bucket_count:
+            return None
+        for bucket in reversed(self._buckets):
+            if bucket.index == index:
+                return bucket
+            if bucket.index < index:
+                break
+        bucket = _Bucket(index, self.capacity)
+        self._buckets.append(bucket)
+        if len(self._buckets) > 1 and self._buckets[-2].index > index:
+            # Late line for an older bucket: keep the deque ordered
+            self._buckets = deque(sorted(self._buckets, key=lambda item: item.index))
+        return bucket
+
+    def _expire(self, current: int) -> None:
+        while self._buckets and self._buckets[0].index <= current - self.bucket_count:
+            self._buckets.popleft()
+
+    def record(self, lines: Iterable[str], now: Optional[float] = None) -> int:
+        """
+        Fold raw log lines into the window.
+
+        Lines older than the window only count towards the blocked-today total.
+
+        Returns:
+            Number of firewall packets counted
+        """
+        now = time.time() if now is None else now
+        current = int(now // self.bucket_width)
+        counted = 0
+        days: Dict[float, date] = {}
+        with self._lock:
+            self._expire(current)
+            for line in lines:
+                packet = parse_firewall_line(line)
+                if packet is None:
+                    continue
+                timestamp = packet["timestamp"] or now
+                blocked = packet["action"] in BLOCKING_ACTIONS
+                if blocked:
+                    day = days.get(timestamp)
+                    if day is None:
+                        day = days[timestamp] = datetime.fromtimestamp(timestamp).date()
+                    self._blocked_by_day[day] = self._blocked_by_day.get(day, 0) + 1
+
+                # Clamp lines stamped slightly ahead of our clock into the current bucket
+                bucket = self._bucket(min(int(timestamp // self.bucket_width), current), current)
+                if bucket is None:
+                    continue
+                counted += 1
+                bucket.logged += 1
+                bucket.rules.add(packet["prefix"])
+                if not blocked:
+                    continue
+                bucket.blocked += 1
+                bucket.sources.add(packet["src"])
+                if packet["dpt"] is not None:
+                    bucket.ports.add(f"{packet['proto']}/{packet['dpt']}")
+                self._recent.append(packet)
+
+            today = datetime.fromtimestamp(now).date()
+            for day in [day for day in self._blocked_by_day if (today - day).days > 1]:
+                del self._blocked_by_day[day]
+            self.last_sampled = now
+        return counted
+
+    def summary(self, minutes: Optional[float] = None, limit: int = 10,
+                now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Aggregates over the last `minutes` (rounded up to whole buckets, at most the full window).
+
+        Returns:
+            Dict with blocked/logged totals, blocked_today, top_sources,
+            top_ports, per-rule hit rates and the most recent blocks
+        """
+        now = time.time() if now is None else now
+        current = int(now // self.bucket_width)
+        span = self.window if minutes is None else min(max(minutes * 60, self.bucket_width), self.window)
+        count = math.ceil(span / self.bucket_width - 1e-9)
+        limit = max(1, min(limit, self.capacity))
+
+        with self._lock:
+            buckets = [bucket for bucket in self._buckets if current - count < bucket.index <= current]
+            rules = []
+            for prefix, hits, error in merge_top((bucket.rules for bucket in buckets), limit):
+                rule = parse_rule_prefix(prefix)
+                rules.append({
+                    "prefix": prefix,
+                    **rule,
+                    "hits": hits,
+                    "error": error,
+                    "per_minute": round(hits / (count * self.bucket_width / 60), 2),
+                    "blocking": rule["action"] in BLOCKING_ACTIONS,
+                })
+            return {
+                "window_seconds": count * self.bucket_width,
+                "logged": sum(bucket.logged for bucket in buckets),
+                "blocked": sum(bucket.blocked for bucket in buckets),
+                "blocked_today": self._blocked_by_day.get(datetime.fromtimestamp(now).date(), 0),
+                "top_sources": [
+                    {"address": key, "count": hits, "error": error}
+                    for key, hits, error in merge_top((bucket.sources for bucket in buckets), limit)
+                ],
+                "top_ports": [
+                    {"port": key, "count": hits, "error": error}
+                    for key, hits, error in merge_top((bucket.ports for bucket in buckets), limit)
+                ],
+                "rules": rules,
+                "recent_blocks": list(reversed(self._recent)),
+                "last_sampled": self.last_sampled,
+            }
+
+
+activity = FirewallActivity()
+_sample_lock = threading.Lock()
+
+
+def sample_firewall_log(fetch=fetch_log_lines) -> int:
+    """Read the log lines appended since the last sample and count the firewall packets among them."""
+    with _sample_lock:
+        try:
+            lines, newest, _ = read_new_lines(activity.cursor, fetch)
+        except ValueError:
+            lines, newest, _ = read_new_lines(None, fetch)
+        counted = activity.record(line for _, line in lines)
+        activity.cursor = newest
+    return counted
+
+
+def refresh_if_stale() -> None:
+    """Sample inline when the background sampler has not run recently (samplers disabled)."""
+    last = activity.last_sampled
+    if last is None or time.time() - last >= 2 * FIREWALL_ACTIVITY_INTERVAL:
+        sample_firewall_log()
+
+
+register_sampler("firewall-activity", FIREWALL_ACTIVITY_INTERVAL, sample_firewall_log)
@@ -12,6 +12,7 @@ from app.auth import login_required
 from app.core import mark_config_dirty
 from app.modules.firewall.common import load_firewall_root
 from app.modules.firewall.zone.utils import build_zone_map
+from app.modules.firewall_groups.utils import GROUP_TYPES
 from .utils import (
     build_rule_delete_commands,
     build_rule_disable_paths,
@@ -31,122 +32,23 @@ rules_bp = Blueprint("firewall_rules", __name__, url_prefix="/firewall/rules")
 
 def _load_firewall_groups() -> Dict[str, List[str]]:
     """Load firewall groups organized by type for use in firewall rules."""
-    try:
-        response = current_app.device.retrieve_show_config(path=["firewall", "group"])
-        config_data = getattr(response, "result", {}) or {}
-
-        groups = {
-            "address-group": [],
-            "network-group": [],
-            "port-group": [],
-            "mac-group": [],
-            "domain-group": [],
-            "dynamic-group": [],
-            "remote-group": [],
-            "ipv6-address-group": [],
-            "ipv6-network-group": []
-        }
+    # Imported here: the group index walks firewall rules, so importing it at
+    # module level would be circular
+    from app.modules.firewall_groups.index import get_group_index
 
-        for group_type in groups.keys():
-            type_config = config_data.get(group_type, {})
-            if isinstance(type_config, dict):
-                # Special handling for dynamic-group which has nested address-group structure
-                if group_type == "dynamic-group":
-                    # Structure: dynamic-group { address-group { NAME { } } }
-                    address_group_config = type_config.get("address-group", {})
-                    if isinstance(address_group_config, dict):
-                        groups[group_type] = sorted(address_group_config.keys())
-                    else:
-                        groups[group_type] = []
-                else:
-                    groups[group_type] = sorted(type_config.keys())
-
-        return groups
+    try:
+        return get_group_index().names_by_type()
     except Exception as e:
         current_app.logger.error(f"Error loading firewall groups: {e}")
-        return {
-            "address-group": [],
-            "network-group": [],
-            "port-group": [],
-            "mac-group": [],
-            "domain-group": [],
-            "dynamic-group": [],
-            "remote-group": [],
-            "ipv6-address-group": [],
-            "ipv6-network-group": []
-        }
+        return {group_type: [] for group_type in GROUP_TYPES}
 
 
 def _load_firewall_groups_details() -> Dict[str, List[str]]:
     """Load firewall groups with their members for tooltip display."""
-    try:
-        response = current_app.device.retrieve_show_config(path=["firewall", "group"])
-        config_data = getattr(response, "result", {}) or {}
-
-        group_details = {}
-
-        # Map group types to their member keys
-        group_type_mappings = {
-            "address-group": "address",
-            "network-group": "network",
-            "port-group": "port",
-            "mac-group": "mac-address",
-            "dynamic-group": "address",
-            "ipv6-address-group": "address",
-            "ipv6-network-group": "network",
-            "domain-group": "address",
-            "remote-group": "url",
-        }
+    from app.modules.firewall_groups.index import get_group_index
 
-        for group_type, member_key in group_type_mappings.items():
-            type_config = config_data.get(group_type, {})
-
-            if isinstance(type_config, dict):
-                # Special handling for dynamic-group which has nested address-group structure
-                if group_type == "dynamic-group":
-                    # Structure: dynamic-group { address-group { NAME { address {...} } } }
-                    address_group_config = type_config.get("address-group", {})
-                    if isinstance(address_group_config, dict):
-                        for group_name, group_config in address_group_config.items():
-                            if isinstance(group_config, dict):
-                                members_data = group_config.get(member_key, {})
-                                members = []
-
-                                if isinstance(members_data, dict):
-                                    # Multiple members stored as dict keys
-                                    members = sorted(members_data.keys())
-                                elif isinstance(members_data, list):
-                                    # Multiple members stored as list
-                                    members = sorted(members_data)
-                                elif members_data:
-                                    # Single member stored as plain value (string, etc.)
-                                    members = [str(members_data)]
-
-                                # Store with full key for easy lookup
-                                lookup_key = f"{group_type}:{group_name}"
-                                group_details[lookup_key] = members
-                else:
-                    for group_name, group_config in type_config.items():
-                        if isinstance(group_config, dict):
-                            members_data = group_config.get(member_key, {})
-                            members = []
-
-                            if isinstance(members_data, dict):
-                                # Multiple members stored as dict keys
-                                members = sorted(members_data.keys())
-                            elif isinstance(members_data, list):
-                                # Multiple members stored as list
-                                members = sorted(members_data)
-                            elif members_data:
-                                # Single member stored as plain value (string, etc.)
-                                members = [str(members_data)]
-
-                            # Store with full key for easy lookup
-                            lookup_key = f"{group_type}:{group_name}"
-                            group_details[lookup_key] = members
-
-        current_app.logger.debug(f"Final group_details: {group_details}")
-        return group_details
+    try:
+        return get_group_index().member_details()
     except Exception as e:
         current_app.logger.error(f"Error loading firewall group details: {e}")
         return {}
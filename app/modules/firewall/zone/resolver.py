@@ -0,0 +1,116 @@
+"""
+Address to firewall zone resolution.
+
+Zones are sets of interfaces, so an address belongs to the zone of the
+interface that reaches it: the router's own addresses to the local zone (or
+their interface's zone when there is none), addresses in a connected subnet
+to that interface's zone, and anything else to the zone of the interface its
+static route (default route included) leaves by. The interface -> zone and
+subnet -> zone maps are precomputed into a prefix trie once per
+configuration revision.
+"""
+import ipaddress
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from app.core import cached_by_revision, load_config_subtree
+from app.modules.interfaces.types import iter_interfaces
+from app.modules.interfaces.utils import normalise_iface_name
+from app.modules.interfaces.zone import load_zone_config, map_member_zones
+from app.modules.static_routes.table import PrefixTrie
+
+MAX_CACHED_ADDRESSES = 65536
+
+
+def _static_routes(static_config: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    for key in ("route", "route6"):
+        routes = static_config.get(key)
+        if isinstance(routes, dict):
+            for destination, route_data in routes.items():
+                yield destination, route_data if isinstance(route_data, dict) else {}
+
+
+class ZoneResolver:
+    """Longest-prefix lookup of the firewall zone behind an address."""
+
+    def __init__(self, zone_config: Dict[str, Any], interfaces_config: Dict[str, Any],
+                 static_config: Dict[str, Any]):
+        self.interface_zones = map_member_zones(zone_config)
+        self.local_zone = next(
+            (name for name, config in zone_config.items() if isinstance(config, dict) and "local-zone" in config),
+            None,
+        )
+        self.local_addresses: Dict[str, Optional[str]] = {}
+        self.tries = {4: PrefixTrie(32), 6: PrefixTrie(128)}
+        self._cache: Dict[str, Optional[str]] = {}
+
+        for entry in iter_interfaces(interfaces_config):
+            zone = self.zone_of_interface(entry["name"])
+            addresses = entry["config"].get("address")
+            for address in addresses if isinstance(addresses, list) else [addresses]:
+                try:
+                    interface_address = ipaddress.ip_interface(str(address))
+                except ValueError:
+                    continue
+                self.local_addresses[str(interface_address.ip)] = self.local_zone or zone
+                if zone:
+                    self.tries[interface_address.version].setdefault(interface_address.network, {"zone": zone})
+
+        # Routed networks take the zone of the interface their next hop is reached through.
+        # Next hops are resolved against connected subnets only, before any route is
+        # inserted, so the default route cannot capture another route's next hop.
+        routed = []
+        for destination, route_data in _static_routes(static_config):
+            try:
+                network = ipaddress.ip_network(str(destination), strict=False)
+            except ValueError:
+                continue
+            zone = None
+            interfaces = route_data.get("interface")
+            for name in interfaces if isinstance(interfaces, dict) else {}:
+                zone = zone or self.zone_of_interface(name)
+            next_hops = route_data.get("next-hop")
+            for next_hop in next_hops if isinstance(next_hops, dict) else {}:
+                zone = zone or self._lookup(str(next_hop))
+            if zone:
+                routed.append((network, zone))
+        for network, zone in routed:
+            self.tries[network.version].setdefault(network, {"zone": zone})
+
+    def zone_of_interface(self, name: str) -> Optional[str]:
+        return self.interface_zones.get(normalise_iface_name(name) or name)
+
+    def _lookup(self, address: str) -> Optional[str]:
+        try:
+            target = ipaddress.ip_address(address)
+        except ValueError:
+            return None
+        trie = self.tries[target.version]
+        zone = None
+        for entry in trie.covering(int(target), trie.bits):
+            zone = entry["zone"]
+        return zone
+
+    def resolve(self, address: str) -> Optional[str]:
+        """Zone of an address, or None when no zone reaches it."""
+        if address in self.local_addresses:
+            return self.local_addresses[address]
+        try:
+            return self._cache[address]
+        except KeyError:
+            pass
+        if len(self._cache) >= MAX_CACHED_ADDRESSES:
+            self._cache.clear()
+        zone = self._cache[address] = self._lookup(address)
+        return zone
+
+
+def get_zone_resolver() -> ZoneResolver:
+    """Zone resolver for the current configuration revision."""
+    return cached_by_revision(
+        "zone-resolver",
+        lambda: ZoneResolver(
+            load_zone_config() or {},
+            load_config_subtree(["interfaces"]),
+            load_config_subtree(["protocols", "static"]),
+        ),
+    )
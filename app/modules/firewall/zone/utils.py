@@ -1,11 +1,21 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable, List, Sequence, Set, Tuple
 
 from flask import current_app
 
+from app.modules.interfaces.types import iter_interfaces
 from app.modules.interfaces.utils import normalise_iface_name
-from app.modules.interfaces.zone import load_zone_config, map_zone_members, sanitise_zone_name
+from app.modules.interfaces.zone import (
+    build_zone_binding_commands,
+    build_zone_definition_commands,
+    build_zone_intra_firewall_commands,
+    build_zone_membership_commands,
+    load_zone_config,
+    map_zone_members,
+    sanitise_zone_name,
+    zone_pair_firewall_name,
+)
 
 from app.modules.firewall.rules.utils import ensure_mapping
 
@@ -86,24 +96,12 @@ def list_unassigned_interfaces() -> Iterable[str]:
     except Exception:
         iface_config = {}
 
-    ethernet_cfg = ensure_mapping(iface_config.get("ethernet"))
-
     available_set: set[str] = set()
-    for iface_name, iface_data in ethernet_cfg.items():
-        base_name = str(iface_name)
-        if not base_name:
-            continue
-        normalized = (normalise_iface_name(base_name) or base_name).lower()
-        if normalized not in assigned and base_name.lower() not in assigned:
-            available_set.add(base_name)
-
-        vif_container = ensure_mapping(iface_data).get("vif")
-        vif_map = ensure_mapping(vif_container)
-        for vlan_id in vif_map.keys():
-            vif_name = f"{base_name}.{vlan_id}"
-            vif_normalized = (normalise_iface_name(vif_name) or vif_name).lower()
-            if vif_normalized not in assigned and vif_name.lower() not in assigned:
-                available_set.add(vif_name)
+    for entry in iter_interfaces(iface_config):
+        name = entry["name"]
+        normalized = (normalise_iface_name(name) or name).lower()
+        if normalized not in assigned and name.lower() not in assigned:
+            available_set.add(name)
 
     return sorted(available_set)
 
@@ -117,3 +115,87 @@ def build_firewall_seed_commands(name: str, seed_accept: bool) -> List[List[str]
         commands.append(["firewall", "ipv4", "name", name, "rule", "10"])
         commands.append(["firewall", "ipv4", "name", name, "rule", "10", "action", "accept"])
     return commands
+
+
+ACCEPT_SEED_DESTINATIONS = {"LOCAL", "WAN"}
+
+ZoneSpec = Tuple[str, Sequence[str]]
+
+
+def should_seed_accept(source: str, destination: str, new_zones: Set[str]) -> bool:
+    """Return True when a freshly seeded pair firewall should start with an accept rule.
+
+    New zones accept traffic within themselves and may reach LOCAL and WAN, and
+    LOCAL may reach new zones; every other pair starts with an empty drop policy.
+    """
+    if source == destination and source in new_zones:
+        return True
+    if source in new_zones and destination in ACCEPT_SEED_DESTINATIONS:
+        return True
+    if source == "LOCAL" and destination in new_zones:
+        return True
+    return False
+
+
+def build_zone_provisioning_plan(
+    zone_specs: Sequence[ZoneSpec],
+    zone_config: Dict[str, Any],
+    existing_firewalls: Set[str],
+) -> List[List[str]]:
+    """
+    Build every set command needed to stand up one or more new zones.
+
+    Each new zone gets its definition, an intra-zone firewall, a seeded pair
+    firewall and binding in both directions towards every existing zone and
+    every other new zone, and its interface memberships. Each unordered zone
+    pair is visited once and duplicates are dropped as they are emitted, so
+    the plan is built in time linear in its length.
+
+    Args:
+        zone_specs: Sequence of (sanitised zone name, member interfaces)
+        zone_config: Current firewall zone configuration
+        existing_firewalls: Names of firewall ipv4 rule-sets that already exist
+
+    Returns:
+        List of command paths for configure_multiple_op
+    """
+    commands: List[List[str]] = []
+    seen: Set[Tuple[str, ...]] = set()
+    firewalls = set(existing_firewalls)
+    new_zones = {name for name, _ in zone_specs}
+
+    def emit(paths: List[List[str]]):
+        for path in paths:
+            key = tuple(path)
+            if key in seen:
+                continue
+            seen.add(key)
+            commands.append(path)
+
+    def seed(source: str, destination: str) -> str:
+        firewall_name = zone_pair_firewall_name(source, destination)
+        if firewall_name not in firewalls:
+            emit(build_firewall_seed_commands(firewall_name, should_seed_accept(source, destination, new_zones)))
+            firewalls.add(firewall_name)
+        return firewall_name
+
+    peers = [
+        name for name in (sanitise_zone_name(zone) for zone in zone_config.keys())
+        if name and name not in new_zones
+    ]
+    for zone_name, interfaces in zone_specs:
+        emit(build_zone_definition_commands(zone_name, zone_config))
+
+        self_firewall_name = seed(zone_name, zone_name)
+        emit(build_zone_intra_firewall_commands(zone_name, self_firewall_name))
+
+        for peer in peers:
+            emit(build_zone_binding_commands(zone_name, peer, seed(zone_name, peer)))
+            emit(build_zone_binding_commands(peer, zone_name, seed(peer, zone_name)))
+
+        for iface in interfaces:
+            emit(build_zone_membership_commands(zone_name, iface))
+
+        peers.append(zone_name)
+
+    return commands
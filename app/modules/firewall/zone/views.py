@@ -1,15 +1,13 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 from flask import Blueprint, current_app, jsonify, render_template, request, url_for
 
 from app.auth import login_required
 from app.core import mark_config_dirty
-from app.modules.interfaces.device import configure_delete, configure_set
+from app.modules.interfaces.device import configure_delete, configure_multiple_op, configure_set
 from app.modules.interfaces.zone import (
-    build_zone_binding_commands,
-    build_zone_definition_commands,
     build_zone_intra_firewall_commands,
     build_zone_membership_commands,
     build_zone_membership_delete,
@@ -23,8 +21,8 @@ from app.modules.interfaces.utils import normalise_iface_name
 from app.modules.firewall.common import load_firewall_root
 from app.modules.firewall.rules.utils import dedupe_commands, ensure_mapping
 from app.modules.firewall.zone.utils import (
-    build_firewall_seed_commands,
     build_zone_map,
+    build_zone_provisioning_plan,
     list_unassigned_interfaces,
 )
 
@@ -116,6 +114,12 @@ def api_overview():
     return jsonify({"status": "ok", "data": data})
 
 
+def _existing_firewall_names() -> Set[str]:
+    firewall_root = load_firewall_root()
+    name_map = ensure_mapping(firewall_root.get("name"))
+    return {str(key) for key in name_map.keys()}
+
+
 def _normalize_interface_candidate(candidate: str, available: List[str]) -> Optional[str]:
     if not candidate:
         return None
@@ -146,58 +150,98 @@ def api_create_zone():
     if not interface_candidate:
         return jsonify({"status": "error", "message": "Select an available interface to assign."}), 400
 
-    commands: List[List[str]] = []
-    commands.extend(build_zone_definition_commands(sanitized, zone_config))
-
-    firewall_root = load_firewall_root()
-    name_map = ensure_mapping(firewall_root.get("name"))
-    existing_firewalls = {str(key) for key in name_map.keys()}
+    commands = build_zone_provisioning_plan(
+        [(sanitized, [interface_candidate])],
+        zone_config,
+        _existing_firewall_names(),
+    )
 
-    existing_zones = [zone for zone in _sorted_zone_names(zone_config) if zone != sanitized]
+    if not commands:
+        return jsonify({"status": "error", "message": "Unable to build configuration for new zone."}), 400
 
-    def should_seed_accept(source: str, destination: str) -> bool:
-        if source == sanitized and destination in {"LOCAL", "WAN"}:
-            return True
-        if source == "LOCAL" and destination == sanitized:
-            return True
-        return False
+    success, error_message = configure_set(commands, error_context=f"create firewall zone {sanitized}")
+    if not success:
+        return jsonify({"status": "error", "message": error_message or "Failed to create zone."}), 500
 
-    self_firewall_name = zone_pair_firewall_name(sanitized, sanitized)
-    if self_firewall_name not in existing_firewalls:
-        commands.extend(build_firewall_seed_commands(self_firewall_name, True))
-        existing_firewalls.add(self_firewall_name)
-    commands.extend(build_zone_intra_firewall_commands(sanitized, self_firewall_name))
+    # Mark configuration as dirty (unsaved changes)
+    mark_config_dirty()
 
-    for zone in existing_zones:
-        forward_name = zone_pair_firewall_name(sanitized, zone)
-        reverse_name = zone_pair_firewall_name(zone, sanitized)
+    data = _load_dashboard_payload()
+    return jsonify({"status": "ok", "data": data})
 
-        if forward_name not in existing_firewalls:
-            commands.extend(build_firewall_seed_commands(forward_name, should_seed_accept(sanitized, zone)))
-            existing_firewalls.add(forward_name)
-        if reverse_name not in existing_firewalls:
-            commands.extend(build_firewall_seed_commands(reverse_name, should_seed_accept(zone, sanitized)))
-            existing_firewalls.add(reverse_name)
 
-        commands.extend(build_zone_binding_commands(sanitized, zone, forward_name))
-        commands.extend(build_zone_binding_commands(zone, sanitized, reverse_name))
+@zone_bp.route("/api/bulk", methods=["POST"])
+@login_required
+def api_bulk_create_zones():
+    payload = request.get_json() or {}
+    raw_zones = payload.get("zones")
+    dry_run = bool(payload.get("dryRun"))
+    if not isinstance(raw_zones, list) or not raw_zones:
+        return jsonify({"status": "error", "message": "Provide a non-empty list of zones."}), 400
 
-    commands.extend(build_zone_membership_commands(sanitized, interface_candidate))
+    zone_config = load_zone_config() or {}
+    existing_zone_names = {sanitise_zone_name(zone_name) for zone_name in zone_config.keys()}
+    available_interfaces = list_unassigned_interfaces()
 
-    deduped_commands = dedupe_commands(commands)
-    if not deduped_commands:
-        return jsonify({"status": "error", "message": "Unable to build configuration for new zone."}), 400
+    zone_specs = []
+    planned_names: Set[str] = set()
+    claimed_interfaces: Set[str] = set()
+    for entry in raw_zones:
+        entry = entry if isinstance(entry, dict) else {"name": entry}
+        raw_name = entry.get("zoneName") or entry.get("name") or entry.get("zone")
+        sanitized = sanitise_zone_name(str(raw_name or ""))
+        if not sanitized:
+            return jsonify({"status": "error", "message": "Every zone needs a name."}), 400
+        if sanitized in existing_zone_names:
+            return jsonify({"status": "error", "message": f"Zone '{sanitized}' already exists."}), 400
+        if sanitized in planned_names:
+            return jsonify({"status": "error", "message": f"Zone '{sanitized}' is listed more than once."}), 400
+
+        raw_interfaces = entry.get("interfaces")
+        if raw_interfaces is None:
+            raw_interfaces = [entry.get("interface")] if entry.get("interface") else []
+        if isinstance(raw_interfaces, str):
+            raw_interfaces = [raw_interfaces]
+
+        interfaces: List[str] = []
+        for raw_iface in raw_interfaces:
+            candidate = _normalize_interface_candidate(str(raw_iface or ""), available_interfaces)
+            if not candidate:
+                return jsonify({"status": "error", "message": f"Interface '{raw_iface}' is not available for assignment."}), 400
+            if candidate in claimed_interfaces:
+                return jsonify({"status": "error", "message": f"Interface '{candidate}' is assigned to more than one zone."}), 400
+            claimed_interfaces.add(candidate)
+            interfaces.append(candidate)
+
+        if not interfaces and sanitized != "LOCAL":
+            return jsonify({"status": "error", "message": f"Select at least one interface for zone '{sanitized}'."}), 400
+
+        planned_names.add(sanitized)
+        zone_specs.append((sanitized, interfaces))
+
+    commands = build_zone_provisioning_plan(zone_specs, zone_config, _existing_firewall_names())
+    if not commands:
+        return jsonify({"status": "error", "message": "Unable to build configuration for new zones."}), 400
+
+    if dry_run:
+        return jsonify({
+            "status": "ok",
+            "dryRun": True,
+            "zones": [name for name, _ in zone_specs],
+            "commandCount": len(commands),
+        })
 
-    response = configure_set(deduped_commands, error_context=f"create firewall zone {sanitized}")
-    success, error_message = response
+    operations = [{"op": "set", "path": path} for path in commands]
+    zone_list = ", ".join(name for name, _ in zone_specs)
+    success, error_message = configure_multiple_op(operations, error_context=f"create firewall zones {zone_list}")
     if not success:
-        return jsonify({"status": "error", "message": error_message or "Failed to create zone."}), 500
+        return jsonify({"status": "error", "message": error_message or "Failed to create zones."}), 500
 
     # Mark configuration as dirty (unsaved changes)
     mark_config_dirty()
 
     data = _load_dashboard_payload()
-    return jsonify({"status": "ok", "data": data})
+    return jsonify({"status": "ok", "commandCount": len(commands), "data": data})
 
 
 @zone_bp.route("/api/delete", methods=["POST"])
@@ -221,9 +265,7 @@ def api_delete_zone():
     for iface in members:
         commands.extend(build_zone_membership_delete(sanitized, iface))
 
-    firewall_root = load_firewall_root()
-    name_map = ensure_mapping(firewall_root.get("name"))
-    existing_firewalls = {str(key) for key in name_map.keys()}
+    existing_firewalls = _existing_firewall_names()
 
     self_firewall_name = zone_pair_firewall_name(sanitized, sanitized)
     if self_firewall_name in existing_firewalls:
@@ -0,0 +1,136 @@
+"""
+Streaming import of text/CSV blocklist feeds into address and network groups.
+"""
+import ipaddress
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.core import Interval, merge_intervals
+from app.modules.firewall_groups.utils import validate_address, validate_network
+
+# Group types a feed can be imported into, with the IP version they hold
+FEED_GROUP_TYPES = {
+    'address-group': 4,
+    'network-group': 4,
+    'ipv6-address-group': 6,
+    'ipv6-network-group': 6,
+}
+
+FEED_CHUNK_SIZE = 1000
+COLLAPSE_BATCH_SIZE = 10000
+MAX_REPORTED_ERRORS = 20
+
+COMMENT_PREFIXES = ('#', ';', '//')
+
+
+def iter_feed_entries(lines: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (line_number, entry) for every candidate entry in a feed.
+
+    Blank lines and comments are skipped. For CSV feeds only the first column
+    is used, and trailing comments after the entry are dropped.
+    """
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip().lstrip('\ufeff')
+        if not line or line.startswith(COMMENT_PREFIXES):
+            continue
+        for separator in ('#', ';'):
+            line = line.split(separator, 1)[0]
+        entry = line.replace('\t', ',').replace(' ', ',').split(',', 1)[0].strip().strip('"\'')
+        if entry:
+            yield line_number, entry
+
+
+def parse_feed_entry(entry: str, version: int) -> Tuple[Optional[Interval], Optional[str]]:
+    """
+    Parse a single feed entry into an integer address interval.
+
+    Accepts single addresses, address ranges (a-b) and CIDR networks.
+
+    Returns:
+        Tuple of ((first, last), error_message)
+    """
+    if '/' in entry:
+        is_valid, error_msg = validate_network(entry)
+    else:
+        is_valid, error_msg = validate_address(entry)
+    if not is_valid:
+        return None, error_msg
+
+    try:
+        if '-' in entry:
+            first, last = (ipaddress.ip_address(part.strip()) for part in entry.split('-'))
+            if first.version != last.version or first > last:
+                return None, "Invalid address range"
+        else:
+            network = ipaddress.ip_network(entry, strict=False)
+            first, last = network.network_address, network.broadcast_address
+    except ValueError as exc:
+        return None, str(exc)
+
+    if first.version != version:
+        return None, f"Expected an IPv{version} entry"
+    return (int(first), int(last)), None
+
+
+def collapse_feed(lines: Iterable[str], version: int) -> Dict[str, Any]:
+    """
+    Validate and aggregate a feed into the smallest set of address intervals.
+
+    Entries are merged in batches so memory stays bounded by the size of
+    the aggregated result rather than the raw feed.
+
+    Returns:
+        Dict with 'intervals' (sorted, merged), 'accepted', 'rejected' and 'errors'
+    """
+    merged: List[Interval] = []
+    pending: List[Interval] = []
+    accepted = 0
+    rejected = 0
+    errors: List[Dict[str, Any]] = []
+
+    for line_number, entry in iter_feed_entries(lines):
+        interval, error_msg = parse_feed_entry(entry, version)
+        if error_msg:
+            rejected += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({'line': line_number, 'entry': entry, 'message': error_msg})
+            continue
+
+        accepted += 1
+        pending.append(interval)
+        if len(pending) >= COLLAPSE_BATCH_SIZE:
+            merged = merge_intervals(merged + pending)
+            pending = []
+
+    if pending:
+        merged = merge_intervals(merged + pending)
+
+    return {
+        'intervals': merged,
+        'accepted': accepted,
+        'rejected': rejected,
+        'errors': errors,
+    }
+
+
+def render_group_members(group_type: str, intervals: List[Interval]) -> List[str]:
+    """
+    Render merged intervals as VyOS member values for a group type.
+
+    Network groups take the fewest CIDR prefixes covering each interval;
+    address groups take single addresses and first-last ranges, which can
+    describe a run of prefixes in one entry.
+    """
+    address_class = ipaddress.IPv6Address if FEED_GROUP_TYPES[group_type] == 6 else ipaddress.IPv4Address
+    members = []
+    for first, last in intervals:
+        first_address, last_address = address_class(first), address_class(last)
+        if group_type.endswith('network-group'):
+            members.extend(
+                str(network) for network in ipaddress.summarize_address_range(first_address, last_address)
+            )
+        elif first == last:
+            members.append(str(first_address))
+        else:
+            members.append(f"{first_address}-{last_address}")
+    return members
@@ -0,0 +1,148 @@
+"""
+In-memory index of firewall groups, their members and the rules that reference them.
+"""
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.core import cached_by_revision, load_config_subtree
+from app.modules.firewall.rules.utils import ensure_mapping
+from app.modules.firewall_groups.utils import (
+    GROUP_TYPES,
+    group_key,
+    parse_firewall_groups,
+)
+
+FIREWALL_FAMILIES = ('ipv4', 'ipv6')
+FIREWALL_BASE_CHAINS = ('forward', 'input', 'output', 'prerouting')
+RULE_SIDES = ('source', 'destination')
+INTERFACE_SIDES = ('inbound-interface', 'outbound-interface')
+
+# Inside ipv6 rule-sets, "group address-group X" names the ipv6 group X
+IPV6_GROUP_TYPES = {
+    'address-group': 'ipv6-address-group',
+    'network-group': 'ipv6-network-group',
+}
+
+
+def _names(value: Any) -> List[str]:
+    """Return group names from a rule's group value, dropping any negation prefix."""
+    if isinstance(value, dict):
+        values = list(value.keys())
+    elif isinstance(value, list):
+        values = value
+    elif value:
+        values = [value]
+    else:
+        values = []
+    return [str(item).lstrip('!') for item in values if str(item).lstrip('!')]
+
+
+def _iter_rulesets(firewall_root: Dict[str, Any], nat_root: Dict[str, Any]) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """Yield (ruleset label, family, rule map) for every firewall and NAT rule-set."""
+    for family in FIREWALL_FAMILIES:
+        family_cfg = ensure_mapping(firewall_root.get(family))
+        for name, cfg in ensure_mapping(family_cfg.get('name')).items():
+            yield f"firewall {family} name {name}", family, ensure_mapping(ensure_mapping(cfg).get('rule'))
+        for chain in FIREWALL_BASE_CHAINS:
+            for hook, cfg in ensure_mapping(family_cfg.get(chain)).items():
+                yield f"firewall {family} {chain} {hook}", family, ensure_mapping(ensure_mapping(cfg).get('rule'))
+
+    for direction in ('source', 'destination'):
+        direction_cfg = ensure_mapping(nat_root.get(direction))
+        yield f"nat {direction}", 'ipv4', ensure_mapping(direction_cfg.get('rule'))
+
+
+def _iter_rule_group_refs(rule_cfg: Dict[str, Any], family: str = 'ipv4') -> Iterator[Tuple[str, str, str]]:
+    """Yield (side, group_type, group_name) for every group a rule points at."""
+    for side in RULE_SIDES:
+        group_block = ensure_mapping(ensure_mapping(rule_cfg.get(side)).get('group'))
+        for group_type, value in group_block.items():
+            if family == 'ipv6':
+                group_type = IPV6_GROUP_TYPES.get(group_type, group_type)
+            if group_type in GROUP_TYPES:
+                for name in _names(value):
+                    yield side, group_type, name
+
+    add_to_group = ensure_mapping(rule_cfg.get('add-address-to-group'))
+    for side in RULE_SIDES:
+        address_block = ensure_mapping(add_to_group.get(f"{side}-address"))
+        for name in _names(address_block.get('address-group')):
+            yield side, 'dynamic-group', name
+
+    for side in INTERFACE_SIDES:
+        for name in _names(ensure_mapping(rule_cfg.get(side)).get('group')):
+            yield side, 'interface-group', name
+
+
+class GroupIndex:
+    """Groups, members and referencing rules for a single configuration revision."""
+
+    def __init__(self, group_config: Dict[str, Any], firewall_root: Dict[str, Any], nat_root: Dict[str, Any]):
+        self.groups: Dict[str, Dict[str, Any]] = {}
+        self.member_groups: Dict[str, List[str]] = {}
+        self.references: Dict[str, List[Dict[str, str]]] = {}
+
+        groups_by_type = parse_firewall_groups(group_config)
+        for groups in groups_by_type.values():
+            for group in groups:
+                key = group_key(group['type'], group['name'])
+                self.groups[key] = group
+                for member in group['members']:
+                    self.member_groups.setdefault(member, []).append(key)
+
+        for ruleset, family, rule_map in _iter_rulesets(firewall_root, nat_root):
+            for rule_number, rule_cfg in rule_map.items():
+                for side, group_type, group_name in _iter_rule_group_refs(ensure_mapping(rule_cfg), family):
+                    self.references.setdefault(group_key(group_type, group_name), []).append({
+                        'ruleset': ruleset,
+                        'rule': str(rule_number),
+                        'side': side,
+                    })
+
+        self._by_type: Dict[str, List[Dict[str, Any]]] = {
+            group_type: [
+                {**group, 'reference_count': len(self.references_for(group_type, group['name']))}
+                for group in groups
+            ]
+            for group_type, groups in groups_by_type.items()
+        }
+
+    def get(self, group_type: str, group_name: str) -> Optional[Dict[str, Any]]:
+        """Return a single group, or None if it does not exist."""
+        return self.groups.get(group_key(group_type, group_name))
+
+    def groups_by_type(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Return groups keyed by type, in the shape of parse_firewall_groups."""
+        return self._by_type
+
+    def names_by_type(self) -> Dict[str, List[str]]:
+        """Return sorted group names keyed by type, for rule editor dropdowns."""
+        return {
+            group_type: sorted(group['name'] for group in groups)
+            for group_type, groups in self._by_type.items()
+        }
+
+    def member_details(self) -> Dict[str, List[str]]:
+        """Return sorted members keyed by "type:name", for rule tooltips."""
+        return {key: sorted(group['members']) for key, group in self.groups.items()}
+
+    def references_for(self, group_type: str, group_name: str) -> List[Dict[str, str]]:
+        """Return every firewall or NAT rule that references a group."""
+        return self.references.get(group_key(group_type, group_name), [])
+
+    def groups_for_member(self, member: str) -> List[str]:
+        """Return the "type:name" keys of every group that lists a member."""
+        return self.member_groups.get(member, [])
+
+
+def _build_group_index() -> GroupIndex:
+    firewall_root = load_config_subtree(['firewall'])
+    return GroupIndex(
+        ensure_mapping(firewall_root.get('group')),
+        firewall_root,
+        load_config_subtree(['nat']),
+    )
+
+
+def get_group_index() -> GroupIndex:
+    """Return the group index for the current configuration revision."""
+    return cached_by_revision('firewall-group-index', _build_group_index)
@@ -0,0 +1,88 @@
+"""
+Aggregation optimizer for address and network groups.
+"""
+from typing import Any, Dict, List, Tuple
+
+from app.core import Interval, merge_intervals
+from app.modules.firewall_groups.feeds import (
+    FEED_GROUP_TYPES,
+    parse_feed_entry,
+    render_group_members,
+)
+
+
+def find_covered_members(parsed: List[Tuple[str, Interval]]) -> List[Dict[str, str]]:
+    """
+    Find members whose addresses are entirely covered by another member.
+
+    Args:
+        parsed: List of (member, (first, last)) pairs
+
+    Returns:
+        List of {'member', 'covered_by'} entries
+    """
+    covered = []
+    widest = None
+    # Widest interval first for equal starts, so containment is a single sweep
+    for member, (first, last) in sorted(parsed, key=lambda item: (item[1][0], -item[1][1])):
+        if widest and last <= widest[1][1]:
+            covered.append({'member': member, 'covered_by': widest[0]})
+        else:
+            widest = (member, (first, last))
+    return covered
+
+
+def analyze_group(group_type: str, members: List[str]) -> Dict[str, Any]:
+    """
+    Work out the smallest equivalent member list for an address or network group.
+
+    Members that cannot be parsed (e.g. unusual VyOS syntax) are left untouched.
+
+    Args:
+        group_type: One of the FEED_GROUP_TYPES
+        members: Current group members
+
+    Returns:
+        Dict with 'optimized' members, 'covered' and 'merged' findings and counts
+    """
+    version = FEED_GROUP_TYPES[group_type]
+    parsed: List[Tuple[str, Interval]] = []
+    untouched: List[str] = []
+    for member in members:
+        interval, error_msg = parse_feed_entry(member, version)
+        if error_msg:
+            untouched.append(member)
+        else:
+            parsed.append((member, interval))
+
+    covered = find_covered_members(parsed)
+    covered_members = {entry['member'] for entry in covered}
+
+    merged_intervals = merge_intervals(interval for _, interval in parsed)
+    remaining = sorted(
+        ((interval, member) for member, interval in parsed if member not in covered_members)
+    )
+
+    optimized: List[str] = []
+    merged = []
+    position = 0
+    for first, last in merged_intervals:
+        sources = []
+        while position < len(remaining) and remaining[position][0][0] <= last:
+            sources.append(remaining[position][1])
+            position += 1
+        rendered = render_group_members(group_type, [(first, last)])
+        optimized.extend(rendered)
+        if sorted(sources) != sorted(rendered):
+            merged.append({'members': sources, 'replacement': rendered})
+
+    optimized.extend(untouched)
+
+    return {
+        'optimized': optimized,
+        'covered': covered,
+        'merged': merged,
+        'original_count': len(members),
+        'optimized_count': len(optimized),
+        'reduction': len(members) - len(optimized),
+    }
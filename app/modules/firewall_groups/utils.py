@@ -2,7 +2,7 @@
 Utility functions for firewall group management.
 """
 import re
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 
 
 # Group type configuration
@@ -69,7 +69,9 @@ GROUP_TYPES = {
         'member_key': 'address',
         'member_label': 'Address',
         'placeholder': 'Dynamically populated from firewall rules',
-        'description': 'Group addresses dynamically added by firewall rules'
+        'description': 'Group addresses dynamically added by firewall rules',
+        # Configured one level deeper: firewall group dynamic-group address-group NAME
+        'config_path': ['dynamic-group', 'address-group']
     },
     'ipv6-address-group': {
         'display_name': 'IPv6 Address Group',
@@ -90,60 +92,94 @@ GROUP_TYPES = {
 }
 
 
-def parse_firewall_groups(config_data: Dict) -> Dict[str, List[Dict]]:
+def group_key(group_type: str, group_name: str) -> str:
+    """Return the "type:name" key used to look up a group across the UI."""
+    return f"{group_type}:{group_name}"
+
+
+def group_config_path(group_type: str, group_name: str) -> List[str]:
+    """Return the config path of a group, e.g. firewall group address-group NAME."""
+    return ['firewall', 'group', *GROUP_TYPES[group_type].get('config_path', [group_type]), group_name]
+
+
+def extract_group_members(group_type: str, group_data: Dict) -> List[str]:
     """
-    Parse firewall group configuration into structured format.
+    Extract the member values of a single group.
 
     Args:
-        config_data: Raw config data from VyOS
+        group_type: Type of group (e.g., 'address-group')
+        group_data: Raw config of the group
 
     Returns:
-        Dictionary keyed by group type with lists of group objects
+        List of member values
     """
-    groups_by_type = {}
+    member_data = group_data.get(GROUP_TYPES[group_type]['member_key'], {})
+
+    if isinstance(member_data, dict):
+        # Members are keys in a dict
+        return [str(member) for member in member_data.keys()]
+    if isinstance(member_data, list):
+        # Members are in a list
+        return [str(member) for member in member_data]
+    if member_data:
+        # Single member
+        return [str(member_data)]
+    return []
 
-    for group_type in GROUP_TYPES.keys():
-        groups_by_type[group_type] = []
 
-        # Get groups of this type
-        type_config = config_data.get(group_type, {})
+def iter_group_configs(config_data: Dict) -> Iterator[Tuple[str, str, Dict]]:
+    """
+    Iterate over every configured group.
+
+    Dynamic groups are nested one level deeper than the other types
+    (dynamic-group address-group NAME); GROUP_TYPES' config_path is followed
+    to unwrap them, the same path group_config_path builds.
 
+    Args:
+        config_data: Raw 'firewall group' config data from VyOS
+
+    Yields:
+        Tuples of (group_type, group_name, group_data)
+    """
+    for group_type, type_info in GROUP_TYPES.items():
+        type_config = config_data
+        for key in type_info.get('config_path', [group_type]):
+            type_config = type_config.get(key, {}) if isinstance(type_config, dict) else {}
         if not isinstance(type_config, dict):
             continue
 
         for group_name, group_data in type_config.items():
-            if not isinstance(group_data, dict):
-                continue
-
-            # Get the member key for this group type
-            member_key = GROUP_TYPES[group_type]['member_key']
-
-            # Extract members
-            members = []
-            member_data = group_data.get(member_key, {})
-
-            if isinstance(member_data, dict):
-                # Members are keys in a dict
-                members = list(member_data.keys())
-            elif isinstance(member_data, list):
-                # Members are in a list
-                members = member_data
-            elif isinstance(member_data, str):
-                # Single member
-                members = [member_data]
-
-            # Extract description
-            description = group_data.get('description', '')
-            if isinstance(description, dict):
-                description = ''
-
-            groups_by_type[group_type].append({
-                'name': group_name,
-                'description': description,
-                'members': members,
-                'member_count': len(members),
-                'type': group_type
-            })
+            if isinstance(group_data, dict):
+                yield group_type, group_name, group_data
+
+
+def parse_firewall_groups(config_data: Dict) -> Dict[str, List[Dict]]:
+    """
+    Parse firewall group configuration into structured format.
+
+    Args:
+        config_data: Raw config data from VyOS
+
+    Returns:
+        Dictionary keyed by group type with lists of group objects
+    """
+    groups_by_type = {group_type: [] for group_type in GROUP_TYPES.keys()}
+
+    for group_type, group_name, group_data in iter_group_configs(config_data):
+        members = extract_group_members(group_type, group_data)
+
+        # Extract description
+        description = group_data.get('description', '')
+        if isinstance(description, dict):
+            description = ''
+
+        groups_by_type[group_type].append({
+            'name': group_name,
+            'description': description,
+            'members': members,
+            'member_count': len(members),
+            'type': group_type
+        })
 
     return groups_by_type
 
@@ -158,8 +194,20 @@ def get_all_groups_summary(config_data: Dict) -> List[Dict]:
     Returns:
         List of all groups with summary information
     """
+    return summarize_groups(parse_firewall_groups(config_data))
+
+
+def summarize_groups(groups_by_type: Dict[str, List[Dict]]) -> List[Dict]:
+    """
+    Flatten groups keyed by type into a single sorted summary list.
+
+    Args:
+        groups_by_type: Groups keyed by type, as returned by parse_firewall_groups
+
+    Returns:
+        List of all groups with display name and icon added
+    """
     all_groups = []
-    groups_by_type = parse_firewall_groups(config_data)
 
     for group_type, groups in groups_by_type.items():
         for group in groups:
@@ -186,7 +234,7 @@ def build_group_set_commands(group_type: str, group_name: str, members: List[str
         List of command paths for configure_multiple_op
     """
     commands = []
-    base_path = ['firewall', 'group', group_type, group_name]
+    base_path = group_config_path(group_type, group_name)
     member_key = GROUP_TYPES[group_type]['member_key']
 
     # Add description if provided
@@ -201,6 +249,50 @@ def build_group_set_commands(group_type: str, group_name: str, members: List[str
     return commands
 
 
+def diff_group_members(current: List[str], desired: List[str]) -> Tuple[List[str], List[str]]:
+    """
+    Compute the member changes needed to turn one member list into another.
+
+    Args:
+        current: Members currently configured on the group
+        desired: Members the group should end up with
+
+    Returns:
+        Tuple of (members_to_add, members_to_remove), each in input order
+    """
+    current_set = set(current)
+    desired_set = set(desired)
+    to_add = list(dict.fromkeys(member for member in desired if member not in current_set))
+    to_remove = [member for member in current if member not in desired_set]
+    return to_add, to_remove
+
+
+def build_member_delta_operations(group_type: str, group_name: str, to_add: List[str], to_remove: List[str]) -> List[Dict[str, Any]]:
+    """
+    Build configure_multiple_op operations that only touch changed member leaves.
+
+    Sets come before deletes, so when the operations are committed in chunks
+    new entries (e.g. the aggregated replacements of a blocklist) are in
+    place before the entries they replace are withdrawn, and a failed later
+    chunk never leaves holes in the group.
+
+    Args:
+        group_type: Type of group
+        group_name: Name of the group
+        to_add: Member values to set
+        to_remove: Member values to delete
+
+    Returns:
+        List of operations for configure_multiple_op
+    """
+    base_path = group_config_path(group_type, group_name)
+    member_key = GROUP_TYPES[group_type]['member_key']
+
+    operations = [{"op": "set", "path": base_path + [member_key, member]} for member in to_add]
+    operations.extend({"op": "delete", "path": base_path + [member_key, member]} for member in to_remove)
+    return operations
+
+
 def build_group_delete_commands(group_type: str, group_name: str) -> List[List[str]]:
     """
     Build VyOS delete commands for removing a firewall group.
@@ -212,7 +304,7 @@ def build_group_delete_commands(group_type: str, group_name: str) -> List[List[s
     Returns:
         List of command paths for configure_multiple_op
     """
-    return [['firewall', 'group', group_type, group_name]]
+    return [group_config_path(group_type, group_name)]
 
 
 def validate_group_name(name: str) -> Tuple[bool, Optional[str]]:
@@ -1,39 +1,40 @@
 """
 Views for firewall groups management.
 """
+import io
+
 from flask import render_template, request, jsonify, current_app
 from app.modules.firewall_groups import firewall_groups_bp
+from app.modules.firewall_groups.feeds import (
+    FEED_CHUNK_SIZE,
+    FEED_GROUP_TYPES,
+    collapse_feed,
+    render_group_members,
+)
+from app.modules.firewall_groups.index import get_group_index
+from app.modules.firewall_groups.optimizer import analyze_group
 from app.modules.firewall_groups.utils import (
     GROUP_TYPES,
-    parse_firewall_groups,
-    get_all_groups_summary,
+    summarize_groups,
     build_group_set_commands,
     build_group_delete_commands,
+    build_member_delta_operations,
+    diff_group_members,
+    group_config_path,
     validate_group_name,
     validate_member
 )
-from app.modules.interfaces.device import configure_multiple_op
+from app.modules.interfaces.device import configure_multiple_op, configure_multiple_op_chunked
 from app.auth import login_required
 from app.core.config_manager import mark_config_dirty
 
 
-def get_firewall_groups_config():
-    """Fetch firewall group configuration from device."""
-    try:
-        response = current_app.device.retrieve_show_config(path=["firewall", "group"])
-        return response.result if hasattr(response, 'result') else {}
-    except Exception as e:
-        current_app.logger.error(f"Error fetching firewall groups config: {e}")
-        return {}
-
-
 @firewall_groups_bp.route('/')
 @login_required
 def index():
     """Display firewall groups management page."""
     try:
-        config_data = get_firewall_groups_config()
-        groups_by_type = parse_firewall_groups(config_data)
+        groups_by_type = get_group_index().groups_by_type()
 
         # Calculate statistics
         total_groups = sum(len(groups) for groups in groups_by_type.values())
@@ -68,15 +69,14 @@ def get_groups():
     try:
         group_type = request.args.get('type')  # Optional filter by type
 
-        config_data = get_firewall_groups_config()
+        groups_by_type = get_group_index().groups_by_type()
 
         if group_type and group_type in GROUP_TYPES:
             # Return groups of specific type
-            groups_by_type = parse_firewall_groups(config_data)
             groups = groups_by_type.get(group_type, [])
         else:
             # Return all groups
-            groups = get_all_groups_summary(config_data)
+            groups = summarize_groups(groups_by_type)
 
         return jsonify({
             'status': 'ok',
@@ -101,12 +101,8 @@ def get_group(group_type, group_name):
                 'message': f'Invalid group type: {group_type}'
             }), 400
 
-        config_data = get_firewall_groups_config()
-        groups_by_type = parse_firewall_groups(config_data)
-
-        # Find the specific group
-        groups = groups_by_type.get(group_type, [])
-        group = next((g for g in groups if g['name'] == group_name), None)
+        group_index = get_group_index()
+        group = group_index.get(group_type, group_name)
 
         if not group:
             return jsonify({
@@ -116,7 +112,8 @@ def get_group(group_type, group_name):
 
         return jsonify({
             'status': 'ok',
-            'group': group
+            'group': group,
+            'references': group_index.references_for(group_type, group_name)
         })
     except Exception as e:
         current_app.logger.error(f"Error retrieving group {group_type}/{group_name}: {e}")
@@ -169,11 +166,7 @@ def create_group():
                 }), 400
 
         # Check if group already exists
-        config_data = get_firewall_groups_config()
-        groups_by_type = parse_firewall_groups(config_data)
-        existing_groups = groups_by_type.get(group_type, [])
-
-        if any(g['name'] == group_name for g in existing_groups):
+        if get_group_index().get(group_type, group_name):
             return jsonify({
                 'status': 'error',
                 'message': f'Group "{group_name}" already exists'
@@ -198,8 +191,7 @@ def create_group():
         mark_config_dirty()
 
         # Get updated groups
-        config_data = get_firewall_groups_config()
-        groups_by_type = parse_firewall_groups(config_data)
+        groups_by_type = get_group_index().groups_by_type()
 
         return jsonify({
             'status': 'ok',
@@ -269,12 +261,32 @@ def update_group(group_type, group_name):
 
             error_context = f"rename {group_type} {group_name} to {new_name}"
         else:
-            # Just update the existing group (delete and recreate with same name)
-            delete_commands = build_group_delete_commands(group_type, group_name)
-            operations.extend([{"op": "delete", "path": path} for path in delete_commands])
+            # Update the existing group in place, touching only changed leaves
+            group = get_group_index().get(group_type, group_name)
+            if not group:
+                return jsonify({
+                    'status': 'error',
+                    'message': f'Group not found: {group_name}'
+                }), 404
 
-            set_commands = build_group_set_commands(group_type, group_name, members, description)
-            operations.extend([{"op": "set", "path": path} for path in set_commands])
+            desired = [member.strip() for member in members if member.strip()]
+            to_add, to_remove = diff_group_members(group['members'], desired)
+            operations.extend(build_member_delta_operations(group_type, group_name, to_add, to_remove))
+
+            if description != group['description']:
+                description_path = group_config_path(group_type, group_name) + ['description']
+                if description:
+                    operations.append({"op": "set", "path": description_path + [description]})
+                else:
+                    operations.append({"op": "delete", "path": description_path})
+
+            if not operations:
+                return jsonify({
+                    'status': 'ok',
+                    'message': 'No changes to apply',
+                    'groups': get_group_index().groups_by_type(),
+                    'config_dirty': False
+                })
 
             error_context = f"update {group_type} {group_name}"
 
@@ -291,8 +303,7 @@ def update_group(group_type, group_name):
         mark_config_dirty()
 
         # Get updated groups
-        config_data = get_firewall_groups_config()
-        groups_by_type = parse_firewall_groups(config_data)
+        groups_by_type = get_group_index().groups_by_type()
 
         return jsonify({
             'status': 'ok',
@@ -320,6 +331,15 @@ def delete_group(group_type, group_name):
                 'message': f'Invalid group type: {group_type}'
             }), 400
 
+        # Refuse to delete a group that rules still depend on
+        references = get_group_index().references_for(group_type, group_name)
+        if references:
+            return jsonify({
+                'status': 'error',
+                'message': f'Group "{group_name}" is referenced by {len(references)} rule(s)',
+                'references': references
+            }), 409
+
         # Build and execute delete operation
         delete_commands = build_group_delete_commands(group_type, group_name)
         operations = [{"op": "delete", "path": path} for path in delete_commands]
@@ -339,8 +359,7 @@ def delete_group(group_type, group_name):
         mark_config_dirty()
 
         # Get updated groups
-        config_data = get_firewall_groups_config()
-        groups_by_type = parse_firewall_groups(config_data)
+        groups_by_type = get_group_index().groups_by_type()
 
         return jsonify({
             'status': 'ok',
@@ -355,3 +374,314 @@ def delete_group(group_type, group_name):
             'status': 'error',
             'message': str(e)
         }), 500
+
+
+@firewall_groups_bp.route('/api/groups/<group_type>/<group_name>/references', methods=['GET'])
+@login_required
+def get_group_references(group_type, group_name):
+    """API endpoint to list the firewall and NAT rules that reference a group."""
+    try:
+        if group_type not in GROUP_TYPES:
+            return jsonify({
+                'status': 'error',
+                'message': f'Invalid group type: {group_type}'
+            }), 400
+
+        group_index = get_group_index()
+        if not group_index.get(group_type, group_name):
+            return jsonify({
+                'status': 'error',
+                'message': f'Group not found: {group_name}'
+            }), 404
+
+        return jsonify({
+            'status': 'ok',
+            'references': group_index.references_for(group_type, group_name)
+        })
+    except Exception as e:
+        current_app.logger.error(f"Error retrieving references for {group_type}/{group_name}: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+
+@firewall_groups_bp.route('/api/members/<path:member>', methods=['GET'])
+@login_required
+def get_member_groups(member):
+    """API endpoint to list the groups that contain a member."""
+    try:
+        return jsonify({
+            'status': 'ok',
+            'member': member,
+            'groups': get_group_index().groups_for_member(member)
+        })
+    except Exception as e:
+        current_app.logger.error(f"Error retrieving groups for member {member}: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+
+@firewall_groups_bp.route('/api/groups/<group_type>/<group_name>/members', methods=['POST', 'DELETE'])
+@login_required
+def update_group_members(group_type, group_name):
+    """API endpoint to add (POST) or remove (DELETE) members without rewriting the group."""
+    try:
+        if group_type not in GROUP_TYPES:
+            return jsonify({
+                'status': 'error',
+                'message': f'Invalid group type: {group_type}'
+            }), 400
+
+        data = request.get_json(silent=True) or {}
+        members = data.get('members', [])
+        if not members or not isinstance(members, list):
+            return jsonify({
+                'status': 'error',
+                'message': 'At least one member is required'
+            }), 400
+
+        requested = [str(member).strip() for member in members if str(member).strip()]
+        adding = request.method == 'POST'
+
+        if adding:
+            for member in requested:
+                is_valid, error_msg = validate_member(group_type, member)
+                if not is_valid:
+                    return jsonify({
+                        'status': 'error',
+                        'message': f'Invalid member "{member}": {error_msg}'
+                    }), 400
+
+        group = get_group_index().get(group_type, group_name)
+        if not group:
+            return jsonify({
+                'status': 'error',
+                'message': f'Group not found: {group_name}'
+            }), 404
+
+        current = group['members']
+        if adding:
+            to_add, to_remove = diff_group_members(current, current + requested)
+        else:
+            requested_set = set(requested)
+            to_add, to_remove = diff_group_members(
+                current, [member for member in current if member not in requested_set]
+            )
+
+        if not to_add and not to_remove:
+            return jsonify({
+                'status': 'ok',
+                'message': 'No changes to apply',
+                'added': [],
+                'removed': [],
+                'group': group,
+                'config_dirty': False
+            })
+
+        operations = build_member_delta_operations(group_type, group_name, to_add, to_remove)
+        action = 'add members to' if adding else 'remove members from'
+        success, error_message = configure_multiple_op(
+            operations,
+            error_context=f"{action} {group_type} {group_name}"
+        )
+
+        if not success:
+            return jsonify({
+                'status': 'error',
+                'message': error_message or 'Failed to update group members'
+            }), 500
+
+        mark_config_dirty()
+
+        return jsonify({
+            'status': 'ok',
+            'message': f'{len(to_add)} added, {len(to_remove)} removed',
+            'added': to_add,
+            'removed': to_remove,
+            'group': get_group_index().get(group_type, group_name),
+            'config_dirty': True
+        })
+
+    except Exception as e:
+        current_app.logger.error(f"Error updating members of {group_type}/{group_name}: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+
+@firewall_groups_bp.route('/api/groups/<group_type>/<group_name>/import', methods=['POST'])
+@login_required
+def import_group_feed(group_type, group_name):
+    """
+    API endpoint to load a text/CSV blocklist file into an address or network group.
+
+    The uploaded file is streamed, validated and collapsed into the fewest
+    prefixes, then diffed against the group. With mode=replace (default)
+    members missing from the feed are removed; mode=merge only adds.
+    """
+    try:
+        if group_type not in FEED_GROUP_TYPES:
+            return jsonify({
+                'status': 'error',
+                'message': f'Feeds can only be imported into: {", ".join(FEED_GROUP_TYPES)}'
+            }), 400
+
+        is_valid, error_msg = validate_group_name(group_name)
+        if not is_valid:
+            return jsonify({
+                'status': 'error',
+                'message': error_msg
+            }), 400
+
+        feed_file = request.files.get('file')
+        if not feed_file:
+            return jsonify({
+                'status': 'error',
+                'message': 'A feed file is required'
+            }), 400
+
+        mode = request.form.get('mode', 'replace').strip().lower()
+        if mode not in ('replace', 'merge'):
+            return jsonify({
+                'status': 'error',
+                'message': f'Invalid mode: {mode}'
+            }), 400
+        dry_run = request.form.get('dryRun', '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+        lines = io.TextIOWrapper(feed_file.stream, encoding='utf-8', errors='replace')
+        feed = collapse_feed(lines, FEED_GROUP_TYPES[group_type])
+        desired = render_group_members(group_type, feed['intervals'])
+        if not desired:
+            return jsonify({
+                'status': 'error',
+                'message': 'Feed contains no valid entries',
+                'rejected': feed['rejected'],
+                'errors': feed['errors']
+            }), 400
+
+        group = get_group_index().get(group_type, group_name)
+        current = group['members'] if group else []
+        to_add, to_remove = diff_group_members(current, desired)
+        if mode == 'merge':
+            to_remove = []
+
+        summary = {
+            'accepted': feed['accepted'],
+            'rejected': feed['rejected'],
+            'errors': feed['errors'],
+            'members': len(desired),
+            'added': len(to_add),
+            'removed': len(to_remove),
+            'created': group is None,
+        }
+
+        if dry_run or (not to_add and not to_remove):
+            return jsonify({
+                'status': 'ok',
+                'message': 'Dry run, no changes applied' if dry_run else 'Group already matches feed',
+                **summary,
+                'config_dirty': False
+            })
+
+        operations = build_member_delta_operations(group_type, group_name, to_add, to_remove)
+        success, error_message, applied = configure_multiple_op_chunked(
+            operations,
+            FEED_CHUNK_SIZE,
+            error_context=f"import feed into {group_type} {group_name}"
+        )
+        if applied:
+            mark_config_dirty()
+
+        if not success:
+            return jsonify({
+                'status': 'error',
+                'message': error_message or 'Failed to import feed',
+                'applied': applied,
+                **summary
+            }), 500
+
+        return jsonify({
+            'status': 'ok',
+            'message': f'Imported feed into "{group_name}": {len(to_add)} added, {len(to_remove)} removed',
+            **summary,
+            'config_dirty': True
+        })
+
+    except Exception as e:
+        current_app.logger.error(f"Error importing feed into {group_type}/{group_name}: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+
+@firewall_groups_bp.route('/api/groups/<group_type>/<group_name>/optimize', methods=['GET', 'POST'])
+@login_required
+def optimize_group(group_type, group_name):
+    """
+    API endpoint to report (GET) or apply (POST) prefix aggregation for a group.
+
+    Members covered by other members are dropped and contiguous members are
+    merged into the fewest CIDRs (network groups) or ranges (address groups).
+    """
+    try:
+        if group_type not in FEED_GROUP_TYPES:
+            return jsonify({
+                'status': 'error',
+                'message': f'Only these group types can be optimized: {", ".join(FEED_GROUP_TYPES)}'
+            }), 400
+
+        group = get_group_index().get(group_type, group_name)
+        if not group:
+            return jsonify({
+                'status': 'error',
+                'message': f'Group not found: {group_name}'
+            }), 404
+
+        report = analyze_group(group_type, group['members'])
+
+        if request.method == 'GET' or report['reduction'] <= 0:
+            return jsonify({
+                'status': 'ok',
+                'message': (
+                    f'{report["reduction"]} of {report["original_count"]} entries can be removed'
+                    if report['reduction'] > 0 else 'Group is already optimal'
+                ),
+                **report,
+                'config_dirty': False
+            })
+
+        to_add, to_remove = diff_group_members(group['members'], report['optimized'])
+        operations = build_member_delta_operations(group_type, group_name, to_add, to_remove)
+        success, error_message = configure_multiple_op(
+            operations,
+            error_context=f"optimize {group_type} {group_name}"
+        )
+
+        if not success:
+            return jsonify({
+                'status': 'error',
+                'message': error_message or 'Failed to optimize firewall group'
+            }), 500
+
+        mark_config_dirty()
+
+        return jsonify({
+            'status': 'ok',
+            'message': f'Group "{group_name}" reduced from {report["original_count"]} to {report["optimized_count"]} entries',
+            **report,
+            'added': len(to_add),
+            'removed': len(to_remove),
+            'config_dirty': True
+        })
+
+    except Exception as e:
+        current_app.logger.error(f"Error optimizing group {group_type}/{group_name}: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
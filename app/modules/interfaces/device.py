@@ -1,10 +1,32 @@
-from typing import Iterable, Sequence
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from flask import current_app
 
+from app.core.config_cache import bump_config_revision
+
 CommandPath = Sequence[str]
 
 
+class DeviceCommandError(RuntimeError):
+    """The router answered an op-mode command with an error."""
+
+
+def show_output(path: CommandPath) -> str:
+    """
+    Return the text output of an op-mode "show" command.
+
+    Raises:
+        DeviceCommandError: If the router reports an error or a non-200 status,
+            so callers never mistake a failed command for empty output
+    """
+    response = current_app.device.show(path=list(path))
+    error = getattr(response, "error", None)
+    status = getattr(response, "status", 200)
+    if error or status != 200:
+        raise DeviceCommandError(f"show {' '.join(path)} failed: {error or f'status {status}'}")
+    return str(getattr(response, "result", "") or "")
+
+
 def configure_set(commands: Iterable[CommandPath], error_context: str = "operation"):
     """Execute configure_set with error handling."""
     commands = list(commands)
@@ -12,6 +34,7 @@ def configure_set(commands: Iterable[CommandPath], error_context: str = "operati
         return True, None
 
     response = current_app.device.configure_set(path=commands)
+    bump_config_revision()
     if getattr(response, "error", None):
         return False, f"Failed to apply configuration for {error_context}: {response.error}"
     if getattr(response, "status", 200) != 200:
@@ -26,6 +49,7 @@ def configure_delete(paths: Iterable[CommandPath], error_context: str = "operati
         return True, None
 
     response = current_app.device.configure_delete(path=paths)
+    bump_config_revision()
     if getattr(response, "error", None):
         return False, f"Failed to delete configuration for {error_context}: {response.error}"
     if getattr(response, "status", 200) != 200:
@@ -49,8 +73,88 @@ def configure_multiple_op(operations: Iterable[dict], error_context: str = "oper
         return True, None
 
     response = current_app.device.configure_multiple_op(op_path=operations)
+    bump_config_revision()
     if getattr(response, "error", None):
         return False, f"Failed to apply configuration for {error_context}: {response.error}"
     if getattr(response, "status", 200) != 200:
         return False, f"Device returned status {response.status} for {error_context}"
     return True, None
+
+
+def _batches(operations: List[dict], chunk_size: int,
+             group_key: Optional[Callable[[dict], Any]] = None) -> Iterator[List[dict]]:
+    """Split operations into batches of at most chunk_size, keeping groups whole."""
+    size = max(1, chunk_size)
+    if group_key is None:
+        for start in range(0, len(operations), size):
+            yield operations[start:start + size]
+        return
+
+    groups: List[List[dict]] = []
+    last_key: Any = None
+    for operation in operations:
+        key = group_key(operation)
+        if groups and key == last_key:
+            groups[-1].append(operation)
+        else:
+            groups.append([operation])
+        last_key = key
+
+    batch: List[dict] = []
+    for group in groups:
+        if batch and len(batch) + len(group) > size:
+            yield batch
+            batch = []
+        batch.extend(group)
+    if batch:
+        yield batch
+
+
+def iter_configure_chunks(operations: Iterable[dict], chunk_size: int,
+                          error_context: str = "operation",
+                          group_key: Optional[Callable[[dict], Any]] = None) -> Iterator[Tuple[bool, Optional[str], int]]:
+    """
+    Execute operations in bounded batches, yielding after each batch.
+
+    Lets callers report progress between commits. Stops after the first
+    failed batch. With group_key, consecutive operations sharing a key are
+    committed in the same batch; a group larger than chunk_size gets a batch
+    of its own.
+
+    Yields:
+        Tuple of (success: bool, error_message: Optional[str], applied: int)
+        where applied counts the operations committed so far
+    """
+    applied = 0
+    for chunk in _batches(list(operations), chunk_size, group_key):
+        success, error_message = configure_multiple_op(chunk, error_context=error_context)
+        if not success:
+            yield False, error_message, applied
+            return
+        applied += len(chunk)
+        yield True, None, applied
+
+
+def configure_multiple_op_chunked(operations: Iterable[dict], chunk_size: int, error_context: str = "operation",
+                                  group_key: Optional[Callable[[dict], Any]] = None):
+    """
+    Execute configure operations in bounded batches of configure_multiple_op.
+
+    Each batch is committed on its own, so a failure part-way through leaves
+    the earlier batches applied.
+
+    Args:
+        operations: List of operation dicts with {"op": "set"|"delete", "path": [...]}
+        chunk_size: Maximum number of operations per API call
+        error_context: Context string for error messages
+        group_key: Optional key; consecutive operations sharing it are never
+            split across batches
+
+    Returns:
+        Tuple of (success: bool, error_message: Optional[str], applied: int)
+    """
+    applied = 0
+    for success, error_message, applied in iter_configure_chunks(operations, chunk_size, error_context, group_key):
+        if not success:
+            return False, error_message, applied
+    return True, None, applied
@@ -1,8 +1,11 @@
 import ipaddress
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from flask import current_app
 
+from app.core import load_config_subtree
+from app.modules.dhcp.allocator import allocate_subnet_id
+
 from .utils import load_cidr_network, normalise_shared_name
 
 Command = List[str]
@@ -48,65 +51,18 @@ def build_dhcp_paths(shared_name: str, interface_ip_cidr: str, subnet_id: int, l
 
 
 def load_dhcp_config() -> Dict:
-    try:
-        dhcp_config = current_app.device.retrieve_show_config(path=["service", "dhcp-server"])
-        config = getattr(dhcp_config, "result", {}) or {}
-    except Exception:
-        config = {}
-
-    return config if isinstance(config, dict) else {}
-
-
-def get_next_subnet_id(dhcp_config: Optional[Dict] = None) -> int:
-    """Return the lowest available DHCP subnet-id."""
-    config = dhcp_config if dhcp_config is not None else load_dhcp_config()
-
-    existing_ids = set()
-    shared_networks = config.get("shared-network-name", {})
-    if isinstance(shared_networks, dict):
-        network_iterable: Iterable = shared_networks.values()
-    elif isinstance(shared_networks, list):
-        network_iterable = shared_networks
-    else:
-        network_iterable = []
-
-    for network_cfg in network_iterable:
-        if not isinstance(network_cfg, dict):
-            continue
+    """Return the 'service dhcp-server' subtree (cached per config revision, read-only)."""
+    return load_config_subtree(["service", "dhcp-server"])
 
-        subnets = network_cfg.get("subnet", {})
-        if isinstance(subnets, dict):
-            subnet_iterable = subnets.values()
-        elif isinstance(subnets, list):
-            subnet_iterable = subnets
-        else:
-            subnet_iterable = []
 
-        for subnet_cfg in subnet_iterable:
-            if not isinstance(subnet_cfg, dict):
-                continue
+def reserve_subnet_id(dhcp_config: Optional[Dict] = None) -> int:
+    """
+    Reserve and return the lowest available DHCP subnet-id for a new scope.
 
-            subnet_id = subnet_cfg.get("subnet-id")
-            if subnet_id is None:
-                continue
-            if isinstance(subnet_id, dict):
-                keys = list(subnet_id.keys())
-                if keys:
-                    try:
-                        existing_ids.add(int(keys[0]))
-                    except ValueError:
-                        continue
-            else:
-                try:
-                    existing_ids.add(int(subnet_id))
-                except (TypeError, ValueError):
-                    continue
-
-    candidate = 1
-    while candidate in existing_ids:
-        candidate += 1
-
-    return candidate
+    Release it with release_subnet_id if the scope is never committed; use
+    next_subnet_id to show the next free ID without reserving it.
+    """
+    return allocate_subnet_id(dhcp_config)
 
 
 def has_active_dhcp_scope(dhcp_config: Optional[Dict] = None) -> bool:
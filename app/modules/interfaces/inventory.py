@@ -0,0 +1,203 @@
+"""
+Interfaces page assembly.
+
+The live part of the page (link state, addresses, counters) comes from one
+"show interfaces ethernet detail" call, parsed in a single pass. Everything
+derived from configuration (configured names, zone membership, NAT
+assignments) is built once per config revision as hash maps, so each
+interface is joined with O(1) lookups.
+"""
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.core import cached_by_revision, load_config_subtree, parse_fixed_width_table
+
+from .nat import map_nat_assignments
+from .utils import extract_configured_interfaces, flatten_interface_config, normalise_iface_name
+from .zone import list_zones, load_zone_config, map_member_zones, sanitise_zone_name
+
+_IFACE_HEADER = re.compile(r"^([a-zA-Z0-9\.\-@]+): <")
+
+
+def _new_record() -> Dict[str, Any]:
+    return {
+        "state": None,
+        "mtu": None,
+        "mac": None,
+        "inet": [],
+        "inet6": [],
+        "description": None,
+        "rx": {},
+        "tx": {},
+    }
+
+
+def parse_interface_detail(raw_output: str) -> Tuple[Dict[str, Dict[str, Any]], Set[str]]:
+    """
+    Parse "show interfaces ethernet detail" in one pass.
+
+    Each line is classified by its first token; only lines that can be an
+    interface header are matched against the header pattern. A counter value
+    row is consumed only directly after its "RX:"/"TX:" header line.
+
+    Returns:
+        Tuple of (interfaces keyed by name, base ethernet interface names)
+    """
+    parsed: Dict[str, Dict[str, Any]] = {}
+    base_ifaces: Set[str] = set()
+    current: Optional[Dict[str, Any]] = None
+    headers: list = []
+    pending_counters: Optional[str] = None
+
+    for raw_line in raw_output.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+
+        # Counter rows belong to the header line right before them
+        expecting, pending_counters = pending_counters, None
+        if line[0].isdigit():
+            if current is not None and expecting:
+                current[expecting] = dict(zip(headers, line.split()))
+            continue
+
+        match = _IFACE_HEADER.match(line) if ": <" in line else None
+        if match:
+            name = match.group(1)
+            current = parsed[name] = _new_record()
+            parts = line.split()
+            if "mtu" in parts:
+                current["mtu"] = parts[parts.index("mtu") + 1]
+            if "state" in parts:
+                current["state"] = parts[parts.index("state") + 1]
+            normalised = normalise_iface_name(name)
+            if normalised and "." not in normalised and normalised.startswith("eth"):
+                base_ifaces.add(normalised)
+            continue
+
+        if current is None:
+            continue
+
+        if line.startswith("Description:"):
+            current["description"] = line.split(":", 1)[1].strip()
+            continue
+
+        keyword, _, rest = line.partition(" ")
+        fields = rest.split()
+        if keyword == "link/ether" and fields:
+            current["mac"] = fields[0]
+        elif keyword in ("inet", "inet6") and fields:
+            current[keyword].append(fields[0])
+        elif keyword in ("RX:", "TX:"):
+            headers = fields
+            pending_counters = keyword[:2].lower()
+
+    return parsed, base_ifaces
+
+
+def _counter_key(title: str) -> str:
+    # "Rx Bytes" -> "rx_bytes"
+    return "_".join(title.lower().split())
+
+
+def parse_interface_counters(raw_output: str) -> List[Dict[str, str]]:
+    """
+    Parse per-interface counters for every interface type in one pass.
+
+    Accepts the "show interfaces counters" table (columns keyed from the
+    header, so releases with extra columns parse the same way) as well as
+    detail output with "RX:"/"TX:" blocks.
+
+    Returns:
+        One dict per interface with 'name' and '<rx|tx>_<counter>' keys
+    """
+    if ": <" in raw_output:
+        parsed, _ = parse_interface_detail(raw_output)
+        counters = []
+        for name, info in parsed.items():
+            entry = {"name": normalise_iface_name(name) or name}
+            for direction in ("rx", "tx"):
+                for title, value in info[direction].items():
+                    entry[f"{direction}_{_counter_key(title)}"] = value
+            counters.append(entry)
+        return counters
+
+    headers, rows = parse_fixed_width_table(raw_output, header_prefix="interface")
+    keys = ["name"] + [_counter_key(title) for title in headers[1:]]
+    return [dict(zip(keys, row)) for row in rows if row and row[0]]
+
+
+def load_interface_config_view() -> Dict[str, Any]:
+    """
+    Configuration-derived lookups for the interfaces page, cached per revision.
+
+    Returns:
+        Dict with 'configured' names, per-interface 'config', sorted 'zones',
+        'zone_by_iface' and 'nat' assignments keyed by interface
+    """
+    def _build() -> Dict[str, Any]:
+        config_result = load_config_subtree(["interfaces"])
+        zone_config = load_zone_config()
+        zone_names = {sanitise_zone_name(zone) for zone in list_zones(zone_config)}
+        zone_names.discard("")
+        return {
+            "configured": extract_configured_interfaces(config_result),
+            "config": flatten_interface_config(config_result),
+            "zones": sorted(zone_names),
+            "zone_by_iface": map_member_zones(zone_config),
+            "nat": map_nat_assignments(),
+        }
+
+    return cached_by_revision("interfaces-config-view", _build)
+
+
+def build_interface_inventory(raw_output: str) -> Dict[str, Any]:
+    """
+    Join the parsed interface detail with the cached configuration lookups.
+
+    Returns:
+        Template context: 'interfaces', 'available_interfaces',
+        'source_nat_interfaces' and 'zones'
+    """
+    parsed_interfaces, base_ifaces = parse_interface_detail(raw_output)
+    view = load_interface_config_view()
+    configured = view["configured"]
+    config_map = view["config"]
+    zone_by_iface = view["zone_by_iface"]
+    nat_assignments = view["nat"]
+
+    active_interfaces = {}
+    for name, info in parsed_interfaces.items():
+        normalised = normalise_iface_name(name)
+        if not normalised:
+            continue
+
+        config_details = config_map.get(normalised)
+        if config_details is not None:
+            config_address = config_details.get("address")
+            address_mode = None
+            if isinstance(config_address, str) and config_address.lower() == "dhcp":
+                address_mode = "dhcp"
+            elif config_address:
+                address_mode = "static"
+
+            info["config_address"] = config_address
+            info["address_mode"] = address_mode
+
+            if not info.get("description") and config_details.get("description"):
+                info["description"] = config_details["description"]
+
+        if normalised in configured:
+            zone_assignment = zone_by_iface.get(normalised)
+            info["zone"] = sanitise_zone_name(zone_assignment) if zone_assignment else None
+            assignment = nat_assignments.get(normalised, {})
+            info["source_nat_interface"] = assignment.get("outbound") or ""
+            info["nat_rule_number"] = assignment.get("rule")
+            active_interfaces[name] = info
+
+    return {
+        "interfaces": active_interfaces,
+        "available_interfaces": sorted(iface for iface in base_ifaces if iface not in configured),
+        "source_nat_interfaces": sorted(base_ifaces),
+        "zones": view["zones"],
+    }
@@ -0,0 +1,60 @@
+"""
+Administrative enable/disable of interfaces in one commit.
+
+Every requested interface (sub-interfaces included) is resolved through the
+interface registry and compared with its current 'disable' flag, so only real
+changes become operations. Interfaces already in the requested state are
+reported as unchanged rather than sent (deleting an absent 'disable' node
+would fail the whole commit).
+"""
+from typing import Any, Dict, Iterable, List
+
+from .types import interface_index
+from .utils import normalise_iface_name
+
+POWER_ACTIONS = {
+    "disable": ("set", "disabled"),
+    "enable": ("delete", "enabled"),
+}
+
+
+def plan_power_changes(names: Iterable[Any], action: str, interfaces_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the operations toggling interfaces and a per-interface outcome.
+
+    Args:
+        names: Interface names, e.g. eth1 or eth1.10@eth1
+        action: 'enable' or 'disable'
+        interfaces_config: 'interfaces' subtree
+
+    Returns:
+        Dict with 'operations' for configure_multiple_op and 'results', one
+        {'iface', 'status', 'message'?} per distinct requested name; status is
+        'pending' for interfaces with an operation
+    """
+    op, _ = POWER_ACTIONS[action]
+    index = interface_index(interfaces_config)
+    operations: List[Dict[str, Any]] = []
+    results: List[Dict[str, Any]] = []
+    seen = set()
+
+    for raw_name in names:
+        name = normalise_iface_name(str(raw_name or "").strip())
+        if not name or name in seen:
+            continue
+        seen.add(name)
+
+        entry = index.get(name)
+        if entry is None:
+            results.append({"iface": name, "status": "error", "message": "Interface is not configured."})
+            continue
+
+        disabled = "disable" in entry["config"]
+        if disabled == (action == "disable"):
+            results.append({"iface": name, "status": "unchanged"})
+            continue
+
+        operations.append({"op": op, "path": entry["path"] + ["disable"]})
+        results.append({"iface": name, "status": "pending"})
+
+    return {"operations": operations, "results": results}
@@ -0,0 +1,266 @@
+"""
+Bulk VLAN provisioning.
+
+A batch of VLAN specs is validated as a whole: VLAN IDs must be unique per
+parent (in the batch and on the router) and static subnets must not overlap
+each other or any configured interface network. Overlaps are found with a
+sorted interval index of networks rather than comparing every pair. Valid
+batches compile into one command list, including DHCP subnet-ids and NAT
+rule numbers handed out in sequence, which is applied as a single commit.
+"""
+import bisect
+import ipaddress
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .dhcp import build_dhcp_paths, build_dns_paths, dns_cache_commands, has_active_dhcp_scope
+from .nat import build_nat_rule_commands, next_nat_rule_number, NatRules
+from .types import VIF, iter_interfaces
+from .utils import extract_address_value, is_valid_cidr, is_valid_network_prefix, load_cidr_network
+from .zone import ZoneConfig, build_zone_definition_commands, build_zone_membership_commands, sanitise_zone_name
+
+MAX_BULK_VLANS = 500
+VLAN_PARENT_TYPES = ("ethernet", "bonding")
+
+
+class NetworkIntervalIndex:
+    """
+    Sorted, non-overlapping address intervals per IP version with their owners.
+
+    CIDR networks are either disjoint or nested, so an overlap with the set
+    always shows up in the neighbour just before or just after the insertion
+    point.
+    """
+
+    def __init__(self):
+        self._starts: Dict[int, List[int]] = {4: [], 6: []}
+        self._entries: Dict[int, List[Tuple[int, int, str]]] = {4: [], 6: []}
+
+    def find_overlap(self, network: ipaddress._BaseNetwork) -> Optional[str]:
+        """Return the owner of an indexed network overlapping this one, if any."""
+        start, end = int(network.network_address), int(network.broadcast_address)
+        starts, entries = self._starts[network.version], self._entries[network.version]
+        index = bisect.bisect_right(starts, start)
+        if index > 0 and entries[index - 1][1] >= start:
+            return entries[index - 1][2]
+        if index < len(entries) and entries[index][0] <= end:
+            return entries[index][2]
+        return None
+
+    def cover(self, network: ipaddress._BaseNetwork, owner: str) -> None:
+        """
+        Index a network unconditionally, for networks that already exist.
+
+        Configured networks may overlap each other (the same subnet on two
+        interfaces, or a /24 inside a /16). Since CIDR networks only nest, a
+        network inside an indexed one is already covered, and indexed
+        networks inside this one are replaced by it, keeping the intervals
+        disjoint.
+        """
+        start, end = int(network.network_address), int(network.broadcast_address)
+        starts, entries = self._starts[network.version], self._entries[network.version]
+        low = bisect.bisect_left(starts, start)
+        if low > 0 and entries[low - 1][1] >= start:
+            return
+        if low < len(entries) and entries[low][0] == start and entries[low][1] >= end:
+            return
+        high = low
+        while high < len(entries) and entries[high][0] <= end:
+            high += 1
+        starts[low:high] = [start]
+        entries[low:high] = [(start, end, owner)]
+
+    def add(self, network: ipaddress._BaseNetwork, owner: str) -> Optional[str]:
+        """Index a network unless it overlaps; returns the conflicting owner instead."""
+        conflict = self.find_overlap(network)
+        if conflict is not None:
+            return conflict
+        start = int(network.network_address)
+        index = bisect.bisect_right(self._starts[network.version], start)
+        self._starts[network.version].insert(index, start)
+        self._entries[network.version].insert(index, (start, int(network.broadcast_address), owner))
+        return None
+
+
+def _addresses(config: Dict[str, Any]) -> List[str]:
+    value = config.get("address")
+    if isinstance(value, list):
+        return [str(item) for item in value]
+    if isinstance(value, dict):
+        return [str(key) for key in value]
+    single = extract_address_value(value)
+    return [single] if single else []
+
+
+def _error(index: int, name: str, message: str) -> Dict[str, Any]:
+    return {"index": index, "vlan": name, "message": message}
+
+
+def plan_vlan_batch(specs: List[Dict[str, Any]], interfaces_config: Dict[str, Any], dhcp_config: Dict[str, Any],
+                    nat_rules: NatRules, zone_config: ZoneConfig,
+                    allocate_subnet_id: Callable[[Dict[str, Any]], int]) -> Dict[str, Any]:
+    """
+    Validate a batch of VLAN specs and compile them into one command list.
+
+    Each spec takes 'parent', 'vlan_id', 'mode' (static|dhcp), 'address',
+    'description', 'zone', 'dhcp' (serve DHCP on a static VLAN, default true)
+    and 'source_nat_interface'.
+
+    Args:
+        specs: VLAN specs from the request
+        interfaces_config: 'interfaces' subtree
+        dhcp_config: 'service dhcp-server' subtree
+        nat_rules: Source NAT rules keyed by rule number
+        zone_config: Firewall zone config
+        allocate_subnet_id: Reserves and returns the next DHCP subnet-id for
+            dhcp_config; the caller releases its reservations if the batch is
+            not committed, including when planning raises
+
+    Returns:
+        Dict with 'errors' (nothing is compiled if there are any), 'vlans',
+        'commands' and the allocated 'subnet_ids'
+    """
+    errors: List[Dict[str, Any]] = []
+    if not specs:
+        return {"errors": [_error(0, "", "No VLANs given.")], "vlans": [], "commands": [], "subnet_ids": []}
+    if len(specs) > MAX_BULK_VLANS:
+        return {"errors": [_error(0, "", f"At most {MAX_BULK_VLANS} VLANs per request.")], "vlans": [], "commands": [], "subnet_ids": []}
+
+    existing = {}
+    networks = NetworkIntervalIndex()
+    for entry in iter_interfaces(interfaces_config):
+        existing[entry["name"]] = entry
+        for address in _addresses(entry["config"]):
+            network = load_cidr_network(address)
+            if network:
+                networks.cover(ipaddress.ip_network(network), entry["name"])
+
+    seen: Dict[str, int] = {}
+    planned = []
+    for index, spec in enumerate(specs):
+        if not isinstance(spec, dict):
+            errors.append(_error(index, "", "VLAN spec must be an object."))
+            continue
+        parent = str(spec.get("parent") or "").strip()
+        vlan_value = str(spec.get("vlan_id") or "").strip()
+        name = f"{parent}.{vlan_value}"
+        mode = str(spec.get("mode") or "static").strip().lower()
+        address = str(spec.get("address") or "").strip()
+        source_nat_iface = str(spec.get("source_nat_interface") or "").strip()
+        zone_field = spec.get("zone")
+        zone_name = sanitise_zone_name(zone_field) if zone_field else ""
+
+        if not parent or not vlan_value:
+            errors.append(_error(index, name, "Missing parent or VLAN ID"))
+            continue
+        if not vlan_value.isdigit() or not 1 <= int(vlan_value) <= 4094:
+            errors.append(_error(index, name, "VLAN ID must be between 1 and 4094."))
+            continue
+        parent_entry = existing.get(parent)
+        if parent_entry is None or parent_entry["parent"] or parent_entry["type"] not in VLAN_PARENT_TYPES:
+            errors.append(_error(index, name, f"Parent interface {parent} is not configured."))
+            continue
+        if name in existing:
+            errors.append(_error(index, name, f"VLAN {name} already exists."))
+            continue
+        if name in seen:
+            errors.append(_error(index, name, f"Duplicate VLAN {name} (also at index {seen[name]})."))
+            continue
+        seen[name] = index
+
+        if mode not in {"dhcp", "static"}:
+            errors.append(_error(index, name, "Mode must be either DHCP or Static."))
+            continue
+        if mode == "static":
+            if not address or not is_valid_cidr(address):
+                errors.append(_error(index, name, "Static VLANs require a valid CIDR address."))
+                continue
+            is_valid_prefix, prefix_error = is_valid_network_prefix(address)
+            if not is_valid_prefix:
+                errors.append(_error(index, name, prefix_error))
+                continue
+            conflict = networks.add(ipaddress.ip_network(load_cidr_network(address)), name)
+            if conflict is not None:
+                errors.append(_error(index, name, f"{address} overlaps the network of {conflict}."))
+                continue
+        else:
+            address = "dhcp"
+        if source_nat_iface and mode != "static":
+            errors.append(_error(index, name, "Source NAT requires a static address."))
+            continue
+        if source_nat_iface and not source_nat_iface.startswith("eth"):
+            errors.append(_error(index, name, "Source NAT interface must be an ethernet interface (e.g. eth0)."))
+            continue
+        if zone_field and not zone_name:
+            errors.append(_error(index, name, "Zone assignment is required."))
+            continue
+
+        planned.append({
+            "name": name,
+            "path": parent_entry["path"] + [VIF, vlan_value],
+            "mode": mode,
+            "address": address,
+            "description": str(spec.get("description") or "").strip(),
+            "zone": zone_name,
+            "dhcp": mode == "static" and spec.get("dhcp", True) is not False,
+            "source_nat_interface": source_nat_iface,
+        })
+
+    if errors:
+        return {"errors": errors, "vlans": [], "commands": [], "subnet_ids": []}
+
+    commands: List[List[str]] = []
+    subnet_ids: List[int] = []
+    disable_new_scopes = has_active_dhcp_scope(dhcp_config)
+    nat_rule_number = next_nat_rule_number(nat_rules)
+    needs_dns_cache = False
+
+    for vlan in planned:
+        base_path = vlan["path"]
+        commands.append(base_path)
+        if vlan["description"]:
+            commands.append(base_path + ["description", vlan["description"]])
+        commands.append(base_path + ["address", vlan["address"]])
+
+        if vlan["mode"] == "static":
+            shared_name = vlan["description"] or vlan["name"]
+            if vlan["dhcp"]:
+                subnet_id = allocate_subnet_id(dhcp_config)
+                subnet_ids.append(subnet_id)
+                dhcp_paths = build_dhcp_paths(shared_name, vlan["address"], subnet_id=subnet_id)
+                commands.extend(dhcp_paths)
+                if disable_new_scopes and dhcp_paths:
+                    commands.append(dhcp_paths[0] + ["disable"])
+            dns_commands, _, _ = build_dns_paths(vlan["address"])
+            commands.extend(dns_commands)
+            needs_dns_cache = needs_dns_cache or bool(dns_commands)
+
+        if vlan["source_nat_interface"]:
+            commands.extend(build_nat_rule_commands(
+                nat_rule_number,
+                vlan["source_nat_interface"],
+                load_cidr_network(vlan["address"]),
+                vlan["name"],
+            ))
+            nat_rule_number += 1
+
+        if vlan["zone"]:
+            commands.extend(build_zone_definition_commands(vlan["zone"], zone_config))
+            commands.extend(build_zone_membership_commands(vlan["zone"], vlan["name"]))
+
+    if needs_dns_cache:
+        commands.extend(dns_cache_commands())
+
+    deduped: List[List[str]] = []
+    seen_commands = set()
+    for command in commands:
+        key = tuple(command)
+        if key not in seen_commands:
+            seen_commands.add(key)
+            deduped.append(command)
+
+    return {
+        "errors": [],
+        "vlans": [vlan["name"] for vlan in planned],
+        "commands": deduped,
+        "subnet_ids": subnet_ids,
+    }
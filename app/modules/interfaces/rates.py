@@ -0,0 +1,200 @@
+"""
+Per-interface throughput from periodic counter samples.
+
+A background sampler reads "show interfaces counters" every
+INTERFACE_RATE_INTERVAL seconds. The delta against the previous sample gives
+bytes, packets, errors and drops per second, which are kept in fixed-size
+numeric ring buffers (one per interface and rate) for sparkline history.
+Counter resets (reboot, interface re-created) are detected and skipped.
+"""
+import os
+import threading
+import time
+from array import array
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.core import register_sampler
+
+from .device import show_output
+from .inventory import parse_interface_counters
+
+RATE_SAMPLE_INTERVAL = float(os.getenv("INTERFACE_RATE_INTERVAL", "5"))
+RATE_HISTORY_POINTS = int(os.getenv("INTERFACE_RATE_HISTORY_POINTS", "120"))
+
+COUNTERS = (
+    "rx_bytes",
+    "tx_bytes",
+    "rx_packets",
+    "tx_packets",
+    "rx_errors",
+    "tx_errors",
+    "rx_dropped",
+    "tx_dropped",
+)
+
+# Rate series derived from the counters; bytes are reported as bits per second
+RATES = {
+    "rx_bps": ("rx_bytes", 8),
+    "tx_bps": ("tx_bytes", 8),
+    "rx_pps": ("rx_packets", 1),
+    "tx_pps": ("tx_packets", 1),
+    "rx_errors_ps": ("rx_errors", 1),
+    "tx_errors_ps": ("tx_errors", 1),
+    "rx_dropped_ps": ("rx_dropped", 1),
+    "tx_dropped_ps": ("tx_dropped", 1),
+}
+
+
+class RingBuffer:
+    """Fixed-capacity buffer of floats; the oldest value is overwritten when full."""
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self._values = array("d", [0.0]) * self.capacity
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, value: float) -> None:
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def last(self) -> Optional[float]:
+        return self._values[self._next - 1] if self._size else None
+
+    def values(self) -> List[float]:
+        """Return the buffered values, oldest first."""
+        if self._size < self.capacity:
+            return self._values[:self._size].tolist()
+        return (self._values[self._next:] + self._values[:self._next]).tolist()
+
+
+class InterfaceRateSeries:
+    """Last raw counters of one interface plus ring buffers of the derived rates."""
+
+    def __init__(self, capacity: int):
+        self.timestamps = RingBuffer(capacity)
+        self.series = {rate: RingBuffer(capacity) for rate in RATES}
+        self.last_counters: Optional[Dict[str, int]] = None
+        self.last_sampled: Optional[float] = None
+
+    def record(self, counters: Dict[str, int], now: float) -> bool:
+        """
+        Add a counter sample; returns True if a rate point was appended.
+
+        The first sample only sets the baseline. A counter going backwards
+        means it was reset, so the sample becomes the new baseline.
+        """
+        previous, previous_time = self.last_counters, self.last_sampled
+        self.last_counters, self.last_sampled = counters, now
+        if previous is None or previous_time is None or now <= previous_time:
+            return False
+
+        elapsed = now - previous_time
+        points = {}
+        for rate, (counter, scale) in RATES.items():
+            delta = counters.get(counter, 0) - previous.get(counter, 0)
+            if delta < 0:
+                return False
+            points[rate] = delta * scale / elapsed
+
+        self.timestamps.append(now)
+        for rate, value in points.items():
+            self.series[rate].append(value)
+        return True
+
+    def current(self) -> Dict[str, Any]:
+        rates = {rate: (round(buffer.last(), 1) if buffer.last() is not None else None) for rate, buffer in self.series.items()}
+        return {"sampled_at": self.timestamps.last(), **rates}
+
+    def history(self, rates: Iterable[str] = RATES) -> Dict[str, Any]:
+        return {
+            "timestamps": self.timestamps.values(),
+            **{rate: [round(value, 1) for value in self.series[rate].values()] for rate in rates},
+        }
+
+
+class RateTracker:
+    """Rate series for every interface seen in the counter samples."""
+
+    def __init__(self, capacity: int = RATE_HISTORY_POINTS):
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._interfaces: Dict[str, InterfaceRateSeries] = {}
+        self.last_recorded: Optional[float] = None
+
+    def record(self, samples: Iterable[Dict[str, str]], now: Optional[float] = None) -> int:
+        """
+        Record one round of parsed counters; interfaces missing from it are dropped.
+
+        An empty round is ignored rather than treated as every interface
+        disappearing, so a bad read never wipes the history.
+
+        Returns:
+            Number of interfaces that got a new rate point
+        """
+        now = time.time() if now is None else now
+        updated = 0
+        with self._lock:
+            seen = set()
+            for sample in samples:
+                name = sample.get("name")
+                if not name:
+                    continue
+                seen.add(name)
+                counters = {counter: _to_int(sample.get(counter)) for counter in COUNTERS}
+                series = self._interfaces.get(name)
+                if series is None:
+                    series = self._interfaces[name] = InterfaceRateSeries(self.capacity)
+                if series.record(counters, now):
+                    updated += 1
+            if not seen:
+                return 0
+            for name in set(self._interfaces) - seen:
+                del self._interfaces[name]
+            self.last_recorded = now
+        return updated
+
+    def current(self) -> Dict[str, Dict[str, Any]]:
+        """Latest rates of every interface."""
+        with self._lock:
+            return {name: series.current() for name, series in sorted(self._interfaces.items())}
+
+    def history(self, name: str, rates: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+        """Buffered rate history of one interface, oldest first, or None if unknown."""
+        with self._lock:
+            series = self._interfaces.get(name)
+            return series.history(rates or RATES) if series else None
+
+
+def _to_int(value: Any) -> int:
+    try:
+        return int(str(value).replace(",", ""))
+    except (TypeError, ValueError):
+        return 0
+
+
+tracker = RateTracker()
+
+
+def sample_interface_rates() -> int:
+    """Read the interface counters once and feed them to the rate tracker."""
+    return tracker.record(parse_interface_counters(show_output(["interfaces", "counters"])))
+
+
+def refresh_if_stale() -> None:
+    """
+    Sample inline when the background sampler has not run recently.
+
+    Keeps the API usable when samplers are disabled; rates appear from the
+    second request on.
+    """
+    last = tracker.last_recorded
+    if last is None or time.time() - last >= 2 * RATE_SAMPLE_INTERVAL:
+        sample_interface_rates()
+
+
+register_sampler("interface-rates", RATE_SAMPLE_INTERVAL, sample_interface_rates)
@@ -0,0 +1,118 @@
+"""
+Registry of VyOS interface types.
+
+Every type knows its config node under 'interfaces' and which sub-interface
+containers it supports. The whole 'interfaces' tree is walked once by
+iter_interfaces, yielding every interface and sub-interface regardless of
+type; callers filter on the entry instead of hard-coding 'ethernet' + 'vif'.
+"""
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+# Sub-interface containers: 802.1q VLANs, and QinQ service VLANs with nested customer VLANs
+VIF = "vif"
+VIF_S = "vif-s"
+VIF_C = "vif-c"
+
+
+class InterfaceType:
+    """One kind of interface under 'interfaces <key>'."""
+
+    def __init__(self, key: str, sub_interfaces: Sequence[str] = ()):
+        self.key = key
+        self.sub_interfaces = tuple(sub_interfaces)
+
+    def __repr__(self) -> str:
+        return f"InterfaceType({self.key!r})"
+
+
+INTERFACE_TYPES: Dict[str, InterfaceType] = {}
+
+
+def register_interface_type(key: str, sub_interfaces: Sequence[str] = ()) -> InterfaceType:
+    """Register (or replace) an interface type; returns the registered type."""
+    interface_type = InterfaceType(key, sub_interfaces)
+    INTERFACE_TYPES[key] = interface_type
+    return interface_type
+
+
+register_interface_type("ethernet", (VIF, VIF_S))
+register_interface_type("bonding", (VIF, VIF_S))
+register_interface_type("bridge", (VIF,))
+register_interface_type("wireguard")
+register_interface_type("pppoe")
+register_interface_type("openvpn")
+register_interface_type("tunnel")
+register_interface_type("vxlan", (VIF,))
+register_interface_type("wireless", (VIF, VIF_S))
+register_interface_type("pseudo-ethernet", (VIF, VIF_S))
+register_interface_type("virtual-ethernet", (VIF,))
+register_interface_type("dummy")
+register_interface_type("loopback")
+
+
+def _children(node: Any) -> Dict[str, Any]:
+    if isinstance(node, dict):
+        return node
+    if isinstance(node, list):
+        return {str(item): {} for item in node}
+    if isinstance(node, str):
+        return {node: {}}
+    return {}
+
+
+def _entry(name: str, interface_type: InterfaceType, config: Any, path: List[str],
+           parent: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "name": name,
+        "type": interface_type.key,
+        "parent": parent,
+        "path": path,
+        "config": config if isinstance(config, dict) else {},
+    }
+
+
+def iter_interfaces(config_result: Any, types: Optional[Sequence[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Walk the 'interfaces' config tree once and yield every interface.
+
+    Args:
+        config_result: retrieve_show_config(["interfaces"]).result
+        types: Only yield these type keys (default: all registered types)
+
+    Yields:
+        Dicts with 'name' (e.g. eth1.10), 'type', 'parent' (None for top-level
+        interfaces), config 'path' and the interface's 'config' node
+    """
+    if not isinstance(config_result, dict):
+        return
+
+    for key, type_node in config_result.items():
+        interface_type = INTERFACE_TYPES.get(key)
+        if interface_type is None or (types is not None and key not in types):
+            continue
+
+        for iface_name, iface_cfg in _children(type_node).items():
+            iface_name = str(iface_name)
+            base_path = ["interfaces", key, iface_name]
+            yield _entry(iface_name, interface_type, iface_cfg, base_path)
+            if not interface_type.sub_interfaces or not isinstance(iface_cfg, dict):
+                continue
+
+            if VIF in interface_type.sub_interfaces:
+                for vlan_id, vlan_cfg in _children(iface_cfg.get(VIF)).items():
+                    yield _entry(f"{iface_name}.{vlan_id}", interface_type, vlan_cfg,
+                                 base_path + [VIF, str(vlan_id)], parent=iface_name)
+
+            if VIF_S in interface_type.sub_interfaces:
+                for s_vlan, s_cfg in _children(iface_cfg.get(VIF_S)).items():
+                    s_name = f"{iface_name}.{s_vlan}"
+                    s_path = base_path + [VIF_S, str(s_vlan)]
+                    yield _entry(s_name, interface_type, s_cfg, s_path, parent=iface_name)
+                    for c_vlan, c_cfg in _children(_children(s_cfg).get(VIF_C)).items():
+                        yield _entry(f"{s_name}.{c_vlan}", interface_type, c_cfg,
+                                     s_path + [VIF_C, str(c_vlan)], parent=s_name)
+
+
+def interface_index(config_result: Any, types: Optional[Sequence[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """Return iter_interfaces entries keyed by interface name."""
+    return {entry["name"]: entry for entry in iter_interfaces(config_result, types)}
@@ -2,6 +2,8 @@ import ipaddress
 import re
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
+from .types import iter_interfaces
+
 CIDR_PATTERN = re.compile(
     r'^(?P<oct1>\d{1,3})\.(?P<oct2>\d{1,3})\.(?P<oct3>\d{1,3})\.(?P<oct4>\d{1,3})/(?P<prefix>\d{1,2})$'
 )
@@ -12,25 +14,8 @@ CommandList = List[List[str]]
 
 
 def extract_configured_interfaces(config_result: Any) -> set[str]:
-    """Return a set of configured interface names without parent suffix (e.g. eth1.10)."""
-    configured: set[str] = set()
-    if not isinstance(config_result, dict):
-        return configured
-
-    ethernet_cfg = config_result.get("ethernet", {})
-    if not isinstance(ethernet_cfg, dict):
-        return configured
-
-    for iface_name, iface_cfg in ethernet_cfg.items():
-        configured.add(iface_name)
-
-        if isinstance(iface_cfg, dict):
-            vif_cfg = iface_cfg.get("vif", {})
-            if isinstance(vif_cfg, dict):
-                for vlan_id in vif_cfg.keys():
-                    configured.add(f"{iface_name}.{vlan_id}")
-
-    return configured
+    """Return the names of every configured interface of any type, including sub-interfaces (e.g. eth1.10)."""
+    return {entry["name"] for entry in iter_interfaces(config_result)}
 
 
 def extract_address_value(address_entry: Any) -> Optional[str]:
@@ -61,36 +46,16 @@ def extract_address_value(address_entry: Any) -> Optional[str]:
 
 
 def flatten_interface_config(config_result: Any) -> Dict[str, Dict[str, Any]]:
-    """Flatten VyOS interface configuration for quick lookups."""
-    flat: Dict[str, Dict[str, Any]] = {}
-    if not isinstance(config_result, dict):
-        return flat
-
-    ethernet_cfg = config_result.get("ethernet", {})
-    if not isinstance(ethernet_cfg, dict):
-        return flat
-
-    for iface_name, iface_cfg in ethernet_cfg.items():
-        if not isinstance(iface_cfg, dict):
-            iface_cfg = {}
-
-        flat[iface_name] = {
-            "address": extract_address_value(iface_cfg.get("address")),
-            "description": iface_cfg.get("description"),
+    """Flatten VyOS interface configuration (all types) for quick lookups."""
+    return {
+        entry["name"]: {
+            "address": extract_address_value(entry["config"].get("address")),
+            "description": entry["config"].get("description"),
+            "type": entry["type"],
+            "parent": entry["parent"],
         }
-
-        vif_cfg = iface_cfg.get("vif", {})
-        if isinstance(vif_cfg, dict):
-            for vlan_id, vlan_data in vif_cfg.items():
-                if not isinstance(vlan_data, dict):
-                    vlan_data = {}
-
-                flat[f"{iface_name}.{vlan_id}"] = {
-                    "address": extract_address_value(vlan_data.get("address")),
-                    "description": vlan_data.get("description"),
-                }
-
-    return flat
+        for entry in iter_interfaces(config_result)
+    }
 
 
 def normalise_shared_name(name: Optional[str], fallback: str) -> str:
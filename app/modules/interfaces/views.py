@@ -1,28 +1,31 @@
-import re
-from typing import Iterable, List, Optional, Tuple, Dict, Set
+from typing import Iterable, List, Optional, Dict, Set
 
 from flask import Blueprint, current_app, render_template, request
 
 from app.auth import login_required
-from app.core import mark_config_dirty
-from .device import configure_set
+from app.core import load_config_subtree, mark_config_dirty
+from app.modules.dhcp.allocator import release_subnet_id
+from .device import configure_multiple_op, configure_set
 from .dhcp import (
     build_dhcp_paths,
     build_dns_paths,
     dns_cache_commands,
-    get_next_subnet_id,
     has_active_dhcp_scope,
     load_dhcp_config,
+    reserve_subnet_id,
 )
+from .inventory import build_interface_inventory
 from .nat import (
     build_nat_rule_commands,
     build_nat_rule_update_commands,
     find_nat_rule_for_iface,
     load_nat_source_rules,
-    map_nat_assignments,
     next_nat_rule_number,
     reorder_managed_nat_rules,
 )
+from .power import POWER_ACTIONS, plan_power_changes
+from .provision import plan_vlan_batch
+from .rates import RATE_SAMPLE_INTERVAL, RATES, refresh_if_stale, tracker as rate_tracker
 from .utils import (
     extract_configured_interfaces,
     flatten_interface_config,
@@ -36,7 +39,6 @@ from .zone import (
     build_zone_membership_commands,
     build_zone_membership_delete,
     find_zone_for_interface,
-    list_zones,
     load_zone_config,
     map_zone_members,
     sanitise_zone_name,
@@ -57,68 +59,6 @@ def _dedupe(commands: Iterable[List[str]]) -> List[List[str]]:
     return deduped
 
 
-def _parse_interface_detail(raw_output: str) -> Tuple[dict, set[str]]:
-    parsed_interfaces = {}
-    current_iface = None
-    rx_headers = tx_headers = []
-    prev_line = ""
-    all_base_ifaces = set()
-
-    for line in raw_output.splitlines():
-        line = line.strip()
-        if not line:
-            continue
-
-        if re.match(r"^[a-zA-Z0-9\.\-@]+: <", line):
-            current_iface = line.split(":")[0]
-            parsed_interfaces[current_iface] = {
-                "state": None,
-                "mtu": None,
-                "mac": None,
-                "inet": [],
-                "inet6": [],
-                "description": None,
-                "rx": {},
-                "tx": {},
-            }
-
-            if "mtu" in line:
-                parts = line.split()
-                if "mtu" in parts:
-                    parsed_interfaces[current_iface]["mtu"] = parts[parts.index("mtu") + 1]
-                if "state" in parts:
-                    parsed_interfaces[current_iface]["state"] = parts[parts.index("state") + 1]
-        elif not current_iface:
-            continue
-        elif line.startswith("link/ether"):
-            parsed_interfaces[current_iface]["mac"] = line.split()[1]
-        elif line.startswith("inet "):
-            parsed_interfaces[current_iface]["inet"].append(line.split()[1])
-        elif line.startswith("inet6"):
-            parsed_interfaces[current_iface]["inet6"].append(line.split()[1])
-        elif line.startswith("Description:"):
-            parsed_interfaces[current_iface]["description"] = line.split(":", 1)[1].strip()
-        elif line.startswith("RX:"):
-            rx_headers = line.replace("RX:", "").split()
-        elif line.startswith("TX:"):
-            tx_headers = line.replace("TX:", "").split()
-        elif re.match(r"^\d", line):
-            values = line.split()
-            if prev_line.startswith("RX:"):
-                parsed_interfaces[current_iface]["rx"] = dict(zip(rx_headers, values))
-            elif prev_line.startswith("TX:"):
-                parsed_interfaces[current_iface]["tx"] = dict(zip(tx_headers, values))
-
-        if current_iface:
-            normalised = normalise_iface_name(current_iface)
-            if normalised and "." not in normalised and normalised.startswith("eth"):
-                all_base_ifaces.add(normalised)
-
-        prev_line = line
-
-    return parsed_interfaces, all_base_ifaces
-
-
 def _load_existing_address(iface: str) -> Optional[str]:
     iface_lookup = normalise_iface_name(iface)
     if not iface_lookup:
@@ -138,97 +78,82 @@ def interfaces():
     detail_data = current_app.device.show(path=["interfaces", "ethernet", "detail"])
     raw_output = getattr(detail_data, "result", "") or ""
 
+    return render_template("interfaces/index.html", **build_interface_inventory(raw_output))
+
+
+def _apply_power_action(names: List[str], action: str) -> Dict:
+    """Toggle interfaces in one configure_multiple_op and fill in each outcome."""
+    # Read the live config, not the cache: the current flag decides set vs. no-op
     config_data = current_app.device.retrieve_show_config(path=["interfaces"])
-    config_result = getattr(config_data, "result", {}) or {}
-    configured_names = extract_configured_interfaces(config_result)
-    config_map = flatten_interface_config(config_result)
-
-    parsed_interfaces, all_base_ifaces = _parse_interface_detail(raw_output)
-    zone_config = load_zone_config()
-    zone_names = {sanitise_zone_name(zone) for zone in list_zones(zone_config)}
-    zone_names.discard("")
-    available_zones = sorted(zone_names)
-
-    active_interfaces = {}
-    for name, info in parsed_interfaces.items():
-        normalised = normalise_iface_name(name)
-        if not normalised:
-            continue
+    plan = plan_power_changes(names, action, getattr(config_data, "result", {}) or {})
+    _, done_status = POWER_ACTIONS[action]
+    pending = [result for result in plan["results"] if result["status"] == "pending"]
+    if not pending:
+        return plan
+
+    success, error_message = configure_multiple_op(plan["operations"], error_context=f"{action} interfaces")
+    for result in pending:
+        if success:
+            result["status"] = done_status
+        else:
+            result["status"] = "failed"
+            result["message"] = error_message
+    if success:
+        mark_config_dirty()
+    return plan
 
-        if normalised in config_map:
-            config_details = config_map[normalised]
-            config_address = config_details.get("address")
-            address_mode = None
-            if isinstance(config_address, str) and config_address.lower() == "dhcp":
-                address_mode = "dhcp"
-            elif config_address:
-                address_mode = "static"
 
-            info["config_address"] = config_address
-            info["address_mode"] = address_mode
+@interfaces_bp.route("/interfaces/power", methods=["POST"])
+@login_required
+def interfaces_power():
+    """Enable or disable several interfaces (VLANs included) in a single commit."""
+    data = request.get_json() or {}
+    action = str(data.get("action") or "").strip().lower()
+    names = data.get("interfaces")
+    if action not in POWER_ACTIONS:
+        return {"status": "error", "message": "Action must be 'enable' or 'disable'."}, 400
+    if not isinstance(names, list) or not names:
+        return {"status": "error", "message": "Expected a list of interfaces under 'interfaces'."}, 400
 
-            if not info.get("description") and config_details.get("description"):
-                info["description"] = config_details["description"]
+    try:
+        plan = _apply_power_action(names, action)
+    except Exception as exc:
+        return {"status": "error", "message": str(exc)}, 500
+
+    results = plan["results"]
+    failed = [result for result in results if result["status"] in ("error", "failed")]
+    return {
+        "status": "ok" if not failed else ("error" if len(failed) == len(results) else "partial"),
+        "action": action,
+        "results": results,
+    }
 
-        if normalised in configured_names:
-            active_interfaces[name] = info
-            zone_assignment = find_zone_for_interface(normalised, zone_config)
-            info["zone"] = sanitise_zone_name(zone_assignment) if zone_assignment else None
 
-    available_interfaces = sorted(
-        iface for iface in all_base_ifaces if iface not in configured_names
-    )
+def _single_power_action(iface: str, action: str):
+    try:
+        result = _apply_power_action([iface], action)["results"][0]
+    except IndexError:
+        return {"status": "error", "message": "Interface name is required."}, 400
+    except Exception as exc:
+        return {"status": "error", "message": str(exc)}, 500
 
-    nat_assignments = map_nat_assignments()
-    for name, info in active_interfaces.items():
-        normalised_name = normalise_iface_name(name)
-        assignment = nat_assignments.get(normalised_name or "", {})
-        info["source_nat_interface"] = assignment.get("outbound") or ""
-        info["nat_rule_number"] = assignment.get("rule")
-
-    return render_template(
-        "interfaces/index.html",
-        interfaces=active_interfaces,
-        available_interfaces=available_interfaces,
-        source_nat_interfaces=sorted(all_base_ifaces),
-        zones=available_zones,
-    )
+    if result["status"] == "error":
+        return {"status": "error", "message": result["message"], "iface": iface}, 404
+    if result["status"] == "failed":
+        return {"status": "error", "message": result["message"], "iface": iface}, 500
+    return {"status": "ok", "action": POWER_ACTIONS[action][1], "iface": iface}
 
 
 @interfaces_bp.route("/interfaces/disable/<iface>", methods=["POST"])
 @login_required
 def interfaces_disable(iface):
-    if "@" in iface:
-        vlan_id = iface.split("@")[0].split(".")[1]
-        parent_interface = iface.split("@")[1]
-        current_app.device.configure_set(
-            path=["interfaces", "ethernet", parent_interface, "vif", vlan_id, "disable"]
-        )
-    else:
-        current_app.device.configure_set(
-            path=["interfaces", "ethernet", iface, "disable"]
-        )
-
-    mark_config_dirty()
-    return {"status": "ok", "action": "disabled", "iface": iface}
+    return _single_power_action(iface, "disable")
 
 
 @interfaces_bp.route("/interfaces/enable/<iface>", methods=["POST"])
 @login_required
 def interfaces_enable(iface):
-    if "@" in iface:
-        vlan_id = iface.split("@")[0].split(".")[1]
-        parent_interface = iface.split("@")[1]
-        current_app.device.configure_delete(
-            path=["interfaces", "ethernet", parent_interface, "vif", vlan_id, "disable"]
-        )
-    else:
-        current_app.device.configure_delete(
-            path=["interfaces", "ethernet", iface, "disable"]
-        )
-
-    mark_config_dirty()
-    return {"status": "ok", "action": "enabled", "iface": iface}
+    return _single_power_action(iface, "enable")
 
 
 @interfaces_bp.route("/interfaces/edit/<iface>", methods=["POST"])
@@ -442,6 +367,7 @@ def interfaces_edit(iface):
     # Prepare DHCP and DNS commands if address changed
     address_changed = previous_address and previous_address != address and mode == "static"
     dhcp_dns_delete_operations = []
+    reserved_subnet_id = None
     if address_changed:
         config_data = current_app.device.retrieve_show_config(path=["interfaces"])
         config_map = flatten_interface_config(getattr(config_data, "result", {}))
@@ -481,8 +407,8 @@ def interfaces_edit(iface):
                     dhcp_dns_delete_operations.append(["service", "dhcp-server", "shared-network-name", found_shared_name])
 
                     # Build new DHCP configuration with the NEW address and add to set commands
-                    subnet_id = get_next_subnet_id(dhcp_config)
-                    dhcp_paths = build_dhcp_paths(shared_name_raw, address, subnet_id=subnet_id)
+                    reserved_subnet_id = reserve_subnet_id(dhcp_config)
+                    dhcp_paths = build_dhcp_paths(shared_name_raw, address, subnet_id=reserved_subnet_id)
                     set_commands.extend(dhcp_paths)
 
                     current_app.logger.info(f"[DHCP Update] Will delete: {found_shared_name}, create new config")
@@ -530,12 +456,17 @@ def interfaces_edit(iface):
         try:
             response = current_app.device.configure_multiple_op(op_path=operations)
             if getattr(response, "error", None):
-                return {"status": "error", "message": f"Failed to update config: {response.error}"}, 500
-            status_code = getattr(response, "status", 200)
-            if status_code != 200:
-                return {"status": "error", "message": f"Device returned status {status_code}"}, 500
+                failure = f"Failed to update config: {response.error}"
+            elif getattr(response, "status", 200) != 200:
+                failure = f"Device returned status {getattr(response, 'status', 200)}"
+            else:
+                failure = None
         except Exception as e:
-            return {"status": "error", "message": f"Failed to execute batch update: {str(e)}"}, 500
+            failure = f"Failed to execute batch update: {str(e)}"
+        if failure:
+            if reserved_subnet_id is not None:
+                release_subnet_id(reserved_subnet_id)
+            return {"status": "error", "message": failure}, 500
 
         # If we deleted a NAT rule, reorder remaining rules
         if delete_nat_rule:
@@ -562,13 +493,15 @@ def _build_base_interface_commands(base_path: List[str], description: Optional[s
     return commands
 
 
-def _augment_with_services(commands: List[List[str]], address: Optional[str], description: Optional[str], shared_default: str):
+def _augment_with_services(commands: List[List[str]], address: Optional[str], description: Optional[str],
+                           shared_default: str) -> Optional[int]:
+    """Add DHCP and DNS commands for a new address; returns the reserved subnet-id."""
     if not address:
-        return
+        return None
 
     dhcp_config = load_dhcp_config()
     shared_name = description or shared_default
-    subnet_id = get_next_subnet_id(dhcp_config)
+    subnet_id = reserve_subnet_id(dhcp_config)
     dhcp_paths = build_dhcp_paths(shared_name, address, subnet_id=subnet_id)
     commands.extend(dhcp_paths)
     if has_active_dhcp_scope(dhcp_config):
@@ -577,6 +510,7 @@ def _augment_with_services(commands: List[List[str]], address: Optional[str], de
     dns_commands, _, _ = build_dns_paths(address)
     commands.extend(dns_commands)
     commands.extend(dns_cache_commands())
+    return subnet_id
 
 
 def _append_nat_commands(commands: List[List[str]], address: Optional[str], source_nat_iface: Optional[str], identity: str):
@@ -639,12 +573,13 @@ def create_vlan():
     if zone_field is not None and zone_field != "" and not zone_name:
         return {"status": "error", "message": "Zone assignment is required."}, 400
 
+    reserved_subnet_id = None
     try:
         base_path = ["interfaces", "ethernet", parent, "vif", str(vlan_id)]
         commands = _build_base_interface_commands(base_path, description, address)
 
         if mode == "static" and address:
-            _augment_with_services(commands, address, description, f"{parent}.{vlan_id}")
+            reserved_subnet_id = _augment_with_services(commands, address, description, f"{parent}.{vlan_id}")
 
         if source_nat_iface:
             _append_nat_commands(commands, address, source_nat_iface, f"{parent}.{vlan_id}")
@@ -663,12 +598,66 @@ def create_vlan():
         success, error_message = configure_set(deduped_commands, error_context=f"VLAN {parent}.{vlan_id}")
         if not success:
             return {"status": "error", "message": error_message}, 500
+        reserved_subnet_id = None
         mark_config_dirty()
         return {"status": "ok", "vlan": f"{parent}.{vlan_id}"}
     except ValueError as exc:
         return {"status": "error", "message": str(exc)}, 400
     except Exception as exc:
         return {"status": "error", "message": str(exc)}, 500
+    finally:
+        # The subnet-id of an interface that was never created goes back to the pool
+        if reserved_subnet_id is not None:
+            release_subnet_id(reserved_subnet_id)
+
+
+@interfaces_bp.route("/interfaces/vlans/bulk", methods=["POST"])
+@login_required
+def bulk_create_vlans():
+    """Validate and create a batch of VLANs in one commit (?dry_run returns the plan only)."""
+    data = request.get_json() or {}
+    specs = data.get("vlans")
+    dry_run = bool(data.get("dry_run"))
+    if not isinstance(specs, list):
+        return {"status": "error", "message": "Expected a list of VLANs under 'vlans'."}, 400
+
+    subnet_ids: List[int] = []
+
+    def reserve(dhcp_config):
+        subnet_id = reserve_subnet_id(dhcp_config)
+        subnet_ids.append(subnet_id)
+        return subnet_id
+
+    try:
+        plan = plan_vlan_batch(
+            specs,
+            load_config_subtree(["interfaces"]),
+            load_dhcp_config(),
+            load_nat_source_rules(),
+            load_zone_config(),
+            reserve,
+        )
+        if plan["errors"]:
+            return {"status": "error", "message": "VLAN batch failed validation.", "errors": plan["errors"]}, 400
+
+        if dry_run:
+            return {"status": "ok", "dry_run": True, "vlans": plan["vlans"], "commands": plan["commands"]}
+
+        current_app.logger.info("Bulk VLAN create %s: %d commands", plan["vlans"], len(plan["commands"]))
+        success, error_message = configure_set(plan["commands"], error_context=f"{len(plan['vlans'])} VLANs")
+        if not success:
+            return {"status": "error", "message": error_message}, 500
+        subnet_ids.clear()
+        mark_config_dirty()
+        return {"status": "ok", "vlans": plan["vlans"], "commands": len(plan["commands"])}
+    except ValueError as exc:
+        return {"status": "error", "message": str(exc)}, 400
+    except Exception as exc:
+        return {"status": "error", "message": str(exc)}, 500
+    finally:
+        # Subnet-ids of a dry run, a failed plan or a failed commit go back to the pool
+        for subnet_id in subnet_ids:
+            release_subnet_id(subnet_id)
 
 
 @interfaces_bp.route("/interfaces/add", methods=["POST"])
@@ -725,11 +714,12 @@ def add_interface():
 
     base_path = ["interfaces", "ethernet", iface]
 
+    reserved_subnet_id = None
     try:
         commands = _build_base_interface_commands(base_path, description, address)
 
         if mode == "static" and address:
-            _augment_with_services(commands, address, description, iface)
+            reserved_subnet_id = _augment_with_services(commands, address, description, iface)
 
         if source_nat_iface:
             _append_nat_commands(commands, address, source_nat_iface, iface)
@@ -749,12 +739,17 @@ def add_interface():
         success, error_message = configure_set(deduped_commands, error_context=f"interface {iface}")
         if not success:
             return {"status": "error", "message": error_message}, 500
+        reserved_subnet_id = None
         mark_config_dirty()
         return {"status": "ok", "iface": iface}
     except ValueError as exc:
         return {"status": "error", "message": str(exc)}, 400
     except Exception as exc:
         return {"status": "error", "message": str(exc)}, 500
+    finally:
+        # The subnet-id of an interface that was never created goes back to the pool
+        if reserved_subnet_id is not None:
+            release_subnet_id(reserved_subnet_id)
 
 
 @interfaces_bp.route("/interfaces/delete/<iface>", methods=["POST"])
@@ -824,3 +819,33 @@ def interfaces_delete(iface):
         return {"status": "ok", "iface": iface}
     except Exception as exc:
         return {"status": "error", "message": str(exc)}, 500
+
+
+@interfaces_bp.route("/api/interfaces/rates")
+@login_required
+def interface_rates():
+    """Latest bps/pps/error/drop rates for every interface."""
+    try:
+        refresh_if_stale()
+    except Exception as exc:
+        current_app.logger.error(f"Failed to sample interface counters: {exc}")
+    return {
+        "status": "ok",
+        "interval": RATE_SAMPLE_INTERVAL,
+        "interfaces": rate_tracker.current(),
+    }
+
+
+@interfaces_bp.route("/api/interfaces/<iface>/rates/history")
+@login_required
+def interface_rate_history(iface):
+    """Buffered rate history of one interface for sparklines (?rates=rx_bps,tx_bps)."""
+    requested = [rate.strip() for rate in request.args.get("rates", "").split(",") if rate.strip()]
+    unknown = [rate for rate in requested if rate not in RATES]
+    if unknown:
+        return {"status": "error", "message": f"Unknown rates: {', '.join(unknown)}"}, 400
+
+    history = rate_tracker.history(normalise_iface_name(iface) or iface, requested or None)
+    if history is None:
+        return {"status": "error", "message": f"No rate samples for {iface}"}, 404
+    return {"status": "ok", "iface": iface, "interval": RATE_SAMPLE_INTERVAL, "history": history}
@@ -72,13 +72,18 @@ def map_zone_members(zone_config: Optional[ZoneConfig] = None) -> Dict[str, Set[
     return membership
 
 
+def map_member_zones(zone_config: Optional[ZoneConfig] = None) -> Dict[str, str]:
+    """Invert zone membership into interface -> zone (first zone wins, as before)."""
+    zone_by_member: Dict[str, str] = {}
+    for zone_name, members in map_zone_members(zone_config).items():
+        for member in members:
+            zone_by_member.setdefault(member, zone_name)
+    return zone_by_member
+
+
 def find_zone_for_interface(iface: str, zone_config: Optional[ZoneConfig] = None) -> Optional[str]:
     iface_normalised = normalise_iface_name(iface) or iface
-    membership = map_zone_members(zone_config)
-    for zone_name, members in membership.items():
-        if iface_normalised in members:
-            return zone_name
-    return None
+    return map_member_zones(zone_config).get(iface_normalised)
 
 
 def sanitise_zone_name(name: str) -> str:
@@ -0,0 +1,194 @@
+"""
+Local full-text index of the router's logs.
+
+A background sampler pulls only the lines appended since the stored cursor,
+parses timestamp, program, pid and severity, and appends them to SQLite with
+an FTS5 index over message and program. Searches across days of history
+then run against the local index instead of the router.
+"""
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from app.core import get_db, register_sampler
+
+from .utils import SEVERITIES, SEVERITY_RANK, parse_log_line, read_new_lines
+
+LOG_INDEX_INTERVAL = float(os.getenv("LOG_INDEX_INTERVAL", "30"))
+LOG_INDEX_RETENTION_DAYS = float(os.getenv("LOG_INDEX_RETENTION_DAYS", "14"))
+MAX_SEARCH_RESULTS = 1000
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS log_lines (
+        id INTEGER PRIMARY KEY,
+        ts REAL NOT NULL,
+        time TEXT,
+        program TEXT,
+        pid INTEGER,
+        severity TEXT,
+        message TEXT NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS log_lines_ts ON log_lines (ts)",
+    # Rows within a program stay in id order, so newest-first program searches read the index directly
+    "CREATE INDEX IF NOT EXISTS log_lines_program ON log_lines (program)",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS log_fts USING fts5(
+        message, program, content='log_lines', content_rowid='id'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS log_lines_ai AFTER INSERT ON log_lines BEGIN
+        INSERT INTO log_fts (rowid, message, program) VALUES (new.id, new.message, new.program);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS log_lines_ad AFTER DELETE ON log_lines BEGIN
+        INSERT INTO log_fts (log_fts, rowid, message, program) VALUES ('delete', old.id, old.message, old.program);
+    END""",
+    """CREATE TABLE IF NOT EXISTS ingest_state (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )""",
+)
+
+_ingest_lock = threading.Lock()
+_TERM = re.compile(r'[^\s"]+')
+
+
+def _db():
+    return get_db("log_index", _SCHEMA)
+
+
+def ingest_logs(now: Optional[float] = None) -> int:
+    """
+    Append log lines written since the last run to the index.
+
+    Lines without a parseable timestamp (continuations) inherit the previous
+    line's. Old lines are dropped after LOG_INDEX_RETENTION_DAYS.
+
+    Returns:
+        Number of lines indexed
+    """
+    now = time.time() if now is None else now
+    with _ingest_lock:
+        db = _db()
+        row = db.execute("SELECT value FROM ingest_state WHERE key = 'cursor'").fetchone()
+        try:
+            lines, newest, _ = read_new_lines(row["value"] if row else None)
+        except ValueError:
+            # Unreadable stored cursor: start again from the current window
+            lines, newest, _ = read_new_lines(None)
+
+        records = []
+        last_ts = now
+        for _, line in lines:
+            entry = parse_log_line(line)
+            last_ts = entry["timestamp"] or last_ts
+            records.append((last_ts, entry["time"], entry["process"], entry["pid"], entry["severity"], entry["message"]))
+
+        with db:
+            db.executemany(
+                "INSERT INTO log_lines (ts, time, program, pid, severity, message) VALUES (?, ?, ?, ?, ?, ?)",
+                records,
+            )
+            if newest:
+                db.execute("INSERT OR REPLACE INTO ingest_state (key, value) VALUES ('cursor', ?)", (newest,))
+            db.execute("DELETE FROM log_lines WHERE ts < ?", (now - LOG_INDEX_RETENTION_DAYS * 86400,))
+
+    return len(records)
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 query: every term must match, 'term*' is a prefix search.
+
+    Terms are quoted so punctuation in IPs, MACs and paths is never read as FTS syntax.
+    """
+    terms = []
+    for term in _TERM.findall(query or ""):
+        prefix = term.endswith("*")
+        term = term.rstrip("*")
+        if term:
+            terms.append(f'"{term}"' + ("*" if prefix else ""))
+    return " AND ".join(terms) or None
+
+
+def search_logs(query: Optional[str] = None, program: Optional[str] = None, severity: Optional[str] = None,
+                since: Optional[float] = None, until: Optional[float] = None, before: Optional[int] = None,
+                limit: int = 200) -> Dict[str, Any]:
+    """
+    Search indexed log lines, newest first.
+
+    Args:
+        query: Free-text terms matched against message and program
+        program: Exact program name, e.g. dhcpd
+        severity: Minimum severity (critical ... debug)
+        since/until: Unix time range
+        before: Only lines with a smaller id (the 'next_before' of the previous page)
+        limit: Page size, capped at MAX_SEARCH_RESULTS
+
+    Returns:
+        Dict with 'entries' and 'next_before' (None on the last page)
+
+    Raises:
+        ValueError: For an unknown severity
+    """
+    limit = max(1, min(limit, MAX_SEARCH_RESULTS))
+    clauses: List[str] = []
+    params: List[Any] = []
+
+    match = build_match_query(query) if query else None
+    if match:
+        source = "log_fts JOIN log_lines l ON l.id = log_fts.rowid"
+        clauses.append("log_fts MATCH ?")
+        params.append(match)
+        order_column = "log_fts.rowid"
+    else:
+        source = "log_lines l"
+        order_column = "l.id"
+
+    if severity:
+        if severity not in SEVERITY_RANK:
+            raise ValueError(f"Unknown severity: {severity}")
+        allowed = SEVERITIES[:SEVERITY_RANK[severity] + 1]
+        clauses.append(f"l.severity IN ({', '.join('?' for _ in allowed)})")
+        params.extend(allowed)
+    for column, operator, value in (
+        ("l.program", "=", program),
+        ("l.ts", ">=", since),
+        ("l.ts", "<=", until),
+        (order_column, "<", before),
+    ):
+        if value is not None:
+            clauses.append(f"{column} {operator} ?")
+            params.append(value)
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    rows = _db().execute(
+        f"SELECT l.id, l.ts, l.time, l.program, l.pid, l.severity, l.message FROM {source} {where} "
+        f"ORDER BY {order_column} DESC LIMIT ?",
+        params + [limit],
+    ).fetchall()
+
+    entries = [
+        {
+            "id": row["id"],
+            "timestamp": row["ts"],
+            "time": row["time"],
+            "process": row["program"],
+            "pid": row["pid"],
+            "severity": row["severity"],
+            "message": row["message"],
+        }
+        for row in rows
+    ]
+    return {
+        "entries": entries,
+        "next_before": entries[-1]["id"] if len(entries) == limit else None,
+    }
+
+
+def index_stats() -> Dict[str, Any]:
+    """Time span covered by the index."""
+    row = _db().execute("SELECT MIN(ts) AS oldest, MAX(ts) AS newest, MAX(id) AS last_id FROM log_lines").fetchone()
+    return {"oldest": row["oldest"], "newest": row["newest"], "last_id": row["last_id"]}
+
+
+register_sampler("log-index", LOG_INDEX_INTERVAL, ingest_logs)
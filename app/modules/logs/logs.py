@@ -1,17 +1,163 @@
 import json
-from flask import Blueprint, render_template, current_app
+import os
+import time
+from datetime import datetime
+
+from flask import Blueprint, Response, render_template, current_app, jsonify, request, stream_with_context
 from app.auth import login_required
 
+from .index import index_stats, search_logs
+from .utils import SEVERITIES, CursorExpired, LogFilter, iter_new_entries, read_log_page
+
 logs_bp = Blueprint('logs', __name__)
 
+LOG_FOLLOW_INTERVAL = float(os.getenv("LOG_FOLLOW_INTERVAL", "2"))
+LOG_FOLLOW_TIMEOUT = float(os.getenv("LOG_FOLLOW_TIMEOUT", "300"))
+
+
+def _parse_time_arg(name):
+    """Parse a time query argument given as unix seconds or ISO 8601."""
+    value = (request.args.get(name) or "").strip()
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise ValueError(f"Invalid {name} time: {value}")
+
+
+def _log_filter():
+    """Build the LogFilter from the pattern, severity, since and until query arguments."""
+    return LogFilter(
+        pattern=request.args.get("pattern") or None,
+        severity=(request.args.get("severity") or "").strip().lower() or None,
+        since=_parse_time_arg("since"),
+        until=_parse_time_arg("until"),
+    )
+
+
 @logs_bp.route('/logs')
 @login_required
 def logs():
-    data = current_app.device.show(path=["system", "logs", "last", "10"])
-    raw_output = data.result
+    try:
+        page = read_log_page(LogFilter(), limit=200)
+    except Exception as exc:
+        current_app.logger.error(f"Failed to read logs: {exc}")
+        page = {"entries": [], "older": None, "newest": None}
+
+    return render_template('logs.html', logs=page["entries"], older=page["older"],
+                           newest=page["newest"], severities=SEVERITIES)
+
+
+@logs_bp.route('/logs/api/entries', methods=['GET'])
+@login_required
+def log_entries():
+    """One page of filtered log entries, older ('before') or newer ('after') than a cursor"""
+    try:
+        log_filter = _log_filter()
+        page = read_log_page(
+            log_filter,
+            limit=int(request.args.get("limit", 200)),
+            before=request.args.get("before") or None,
+            after=request.args.get("after") or None,
+        )
+    except CursorExpired as exc:
+        return jsonify({"status": "error", "message": str(exc)}), 410
+    except ValueError as exc:
+        return jsonify({"status": "error", "message": str(exc)}), 400
+    except Exception as exc:
+        current_app.logger.error(f"Failed to read logs: {exc}")
+        return jsonify({"status": "error", "message": str(exc)}), 500
+
+    return jsonify({"status": "ok", **page})
+
+
+@logs_bp.route('/logs/api/search', methods=['GET'])
+@login_required
+def log_search():
+    """Full-text search of the local log index, newest first; page with 'before'"""
+    try:
+        before = request.args.get("before")
+        results = search_logs(
+            query=request.args.get("q") or None,
+            program=(request.args.get("program") or "").strip() or None,
+            severity=(request.args.get("severity") or "").strip().lower() or None,
+            since=_parse_time_arg("since"),
+            until=_parse_time_arg("until"),
+            before=int(before) if before else None,
+            limit=int(request.args.get("limit", 200)),
+        )
+    except ValueError as exc:
+        return jsonify({"status": "error", "message": str(exc)}), 400
+    except Exception as exc:
+        current_app.logger.error(f"Failed to search log index: {exc}")
+        return jsonify({"status": "error", "message": str(exc)}), 500
+
+    return jsonify({"status": "ok", **results, "index": index_stats()})
+
+
+def _sse(event, data, event_id=None):
+    lines = [f"event: {event}"]
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+
+@logs_bp.route('/logs/api/stream', methods=['GET'])
+@login_required
+def log_stream():
+    """
+    Server-sent events of filtered log entries.
+
+    Sends the newest page (or everything after Last-Event-ID when the browser
+    reconnects), then polls for new lines until LOG_FOLLOW_TIMEOUT; the
+    EventSource reconnects and resumes from the last entry it received.
+    """
+    try:
+        log_filter = _log_filter()
+        limit = int(request.args.get("limit", 200))
+    except ValueError as exc:
+        return jsonify({"status": "error", "message": str(exc)}), 400
+
+    resume = request.headers.get("Last-Event-ID") or request.args.get("after") or None
+
+    def generate():
+        cursor = resume
+        try:
+            if cursor is None:
+                page = read_log_page(log_filter, limit=limit)
+                for entry in page["entries"]:
+                    yield _sse("entry", entry, entry["cursor"])
+                cursor = page["newest"]
+                yield _sse("page", {"older": page["older"], "newest": cursor})
 
-    logs = []
-    for line in raw_output.splitlines():
-        logs.append(line.strip())
+            deadline = time.monotonic() + LOG_FOLLOW_TIMEOUT
+            while True:
+                entries, newest, gap = iter_new_entries(log_filter, cursor)
+                if gap:
+                    yield _sse("gap", {"message": "Some log lines were missed while reconnecting"})
+                for entry in entries:
+                    yield _sse("entry", entry, entry["cursor"])
+                if newest and newest != cursor:
+                    # Advance past non-matching lines too, so they are not rescanned
+                    cursor = newest
+                    yield _sse("cursor", {"newest": cursor}, cursor)
+                if time.monotonic() >= deadline:
+                    return
+                # Comment line so proxies and the browser keep the connection open
+                yield ": keep-alive\n\n"
+                time.sleep(LOG_FOLLOW_INTERVAL)
+        except Exception as exc:
+            current_app.logger.error(f"Log stream failed: {exc}")
+            yield _sse("error", {"message": str(exc)})
 
-    return render_template('logs.html', logs=logs)
\ No newline at end of file
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,421 @@
+"""
+Log retrieval with server-side filtering and cursor paging.
+
+Lines come from "show log tail <N>" (journal short format). Each returned
+entry carries an opaque cursor naming its line: a CRC of the raw line, a CRC
+of up to CURSOR_CONTEXT lines next to the run of identical copies it belongs
+to, its offset within that run, and how many lines followed it. New log
+lines are only ever appended, so that context and offset never change and a
+cursor keeps pointing at the same line as more copies of it are logged; the
+line can only move further from the end, which rules out newer look-alikes.
+Pages can be taken before a cursor (older) or after it (newer). The tail
+window grows until a page is filled or the cursor is found, up to
+LOG_MAX_WINDOW lines.
+"""
+import base64
+import binascii
+import os
+import re
+import zlib
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.modules.interfaces.device import show_output
+
+LOG_WINDOW = int(os.getenv("LOG_PAGE_WINDOW", "2000"))
+LOG_MAX_WINDOW = int(os.getenv("LOG_MAX_WINDOW", "50000"))
+MAX_PAGE_SIZE = 1000
+MAX_PATTERN_LENGTH = 200
+
+# Most to least severe; filtering on a level keeps that level and everything above it
+SEVERITIES = ("critical", "error", "warning", "notice", "info", "debug")
+SEVERITY_RANK = {name: rank for rank, name in enumerate(SEVERITIES)}
+
+_SEVERITY_KEYWORDS = (
+    ("critical", re.compile(r"\b(?:emerg\w*|panic|crit\w*|alert|fatal|oops)\b", re.IGNORECASE)),
+    ("error", re.compile(r"\b(?:err(?:or)?s?|fail\w*|denied|refused|unable)\b", re.IGNORECASE)),
+    ("warning", re.compile(r"\bwarn\w*\b", re.IGNORECASE)),
+    ("debug", re.compile(r"\bdebug\b", re.IGNORECASE)),
+    ("notice", re.compile(r"\bnotice\b", re.IGNORECASE)),
+)
+
+_LOG_LINE = re.compile(
+    r"^(?P<time>[A-Z][a-z]{2} [ \d]\d \d{2}:\d{2}:\d{2}|\d{4}-\d{2}-\d{2}[T ][\d:.]+(?:Z|[+-]\d{2}:?\d{2})?)"
+    r"\s+(?:(?P<host>\S+)\s+)?(?P<process>[^\s:\[]+)(?:\[(?P<pid>\d+)\])?:\s?(?P<message>.*)$"
+)
+
+
+def infer_severity(message: str) -> str:
+    """Guess a syslog severity from message keywords (journal short output has no priority)."""
+    for severity, pattern in _SEVERITY_KEYWORDS:
+        if pattern.search(message):
+            return severity
+    return "info"
+
+
+def parse_log_time(value: str, now: Optional[datetime] = None) -> Optional[float]:
+    """
+    Return a journal timestamp as unix seconds.
+
+    Short timestamps have no year; the current year is assumed unless that
+    puts the entry in the future, in which case it is from last year.
+    """
+    if not value:
+        return None
+    if value[0].isdigit():
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00").replace(" ", "T", 1)).timestamp()
+        except ValueError:
+            return None
+    now = now or datetime.now()
+    try:
+        parsed = datetime.strptime(f"{now.year} {value}", "%Y %b %d %H:%M:%S")
+    except ValueError:
+        return None
+    if (parsed - now).days >= 1:
+        parsed = parsed.replace(year=now.year - 1)
+    return parsed.timestamp()
+
+
+def parse_log_line(line: str) -> Dict[str, Any]:
+    """Split a journal line into time, process, pid, message and inferred severity."""
+    match = _LOG_LINE.match(line)
+    if not match:
+        return {"time": "", "timestamp": None, "process": "", "pid": None,
+                "message": line, "severity": infer_severity(line)}
+    message = match.group("message")
+    return {
+        "time": match.group("time"),
+        "timestamp": parse_log_time(match.group("time")),
+        "process": match.group("process"),
+        "pid": int(match.group("pid")) if match.group("pid") else None,
+        "message": message,
+        "severity": infer_severity(message),
+    }
+
+
+# Lines of surrounding context hashed into a cursor
+CURSOR_CONTEXT = 8
+
+# Which side of the line's run of identical copies a cursor's context is on
+CONTEXT_BEFORE = "p"
+CONTEXT_AFTER = "n"
+
+
+def make_cursor(line: str, context: int, side: str, context_lines: int, copies: int, distance: int) -> str:
+    """
+    Encode a line position as an opaque cursor.
+
+    Args:
+        line: The line itself
+        context: CRC of the context lines (see _context_crc)
+        side: CONTEXT_BEFORE or CONTEXT_AFTER the run of copies the line is in
+        context_lines: How many lines the context covers
+        copies: Identical copies of the line between it and its context
+        distance: Lines after it in the log when the cursor was made
+    """
+    crc = zlib.crc32(line.encode())
+    text = f"{crc:08x}:{context:08x}:{side}{context_lines}:{copies}:{distance}"
+    return base64.urlsafe_b64encode(text.encode()).decode().rstrip("=")
+
+
+def parse_cursor(cursor: str) -> Tuple[int, int, str, int, int, int]:
+    """
+    Decode a cursor into (crc, context crc, side, context lines, copies, distance).
+
+    Raises:
+        ValueError: For a malformed cursor
+    """
+    try:
+        text = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        crc, context, position, copies, distance = text.split(":")
+        side, context_lines = position[:1], int(position[1:])
+        if side not in (CONTEXT_BEFORE, CONTEXT_AFTER) or min(context_lines, int(copies), int(distance)) < 0:
+            raise ValueError
+        return int(crc, 16), int(context, 16), side, context_lines, int(copies), int(distance)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+class LogFilter:
+    """Compiled server-side filters: regex, minimum severity and time range."""
+
+    def __init__(self, pattern: Optional[str] = None, severity: Optional[str] = None,
+                 since: Optional[float] = None, until: Optional[float] = None):
+        """
+        Raises:
+            ValueError: For an invalid pattern or unknown severity
+        """
+        self.regex = None
+        if pattern:
+            if len(pattern) > MAX_PATTERN_LENGTH:
+                raise ValueError(f"Pattern is longer than {MAX_PATTERN_LENGTH} characters")
+            try:
+                self.regex = re.compile(pattern, re.IGNORECASE)
+            except re.error as exc:
+                raise ValueError(f"Invalid pattern: {exc}")
+        self.max_rank = None
+        if severity:
+            if severity not in SEVERITY_RANK:
+                raise ValueError(f"Unknown severity: {severity}")
+            self.max_rank = SEVERITY_RANK[severity]
+        self.since = since
+        self.until = until
+
+    def matches(self, line: str) -> Optional[Dict[str, Any]]:
+        """Return the parsed entry if the line passes every filter, else None."""
+        # The regex runs on the raw line first so most lines are never parsed
+        if self.regex and not self.regex.search(line):
+            return None
+        entry = parse_log_line(line)
+        if self.max_rank is not None and SEVERITY_RANK[entry["severity"]] > self.max_rank:
+            return None
+        if self.since is not None or self.until is not None:
+            timestamp = entry["timestamp"]
+            if timestamp is None:
+                return None
+            if self.since is not None and timestamp < self.since:
+                return None
+            if self.until is not None and timestamp > self.until:
+                return None
+        return entry
+
+
+def fetch_log_lines(window: int) -> List[str]:
+    """
+    Return the last `window` non-empty log lines, oldest first.
+
+    Raises:
+        DeviceCommandError: If the router fails the command; an empty result
+            would otherwise look like the log was rotated and reset cursors
+    """
+    raw = show_output(["log", "tail", str(window)])
+    return [line for line in raw.splitlines() if line.strip()]
+
+
+def _run_bounds(lines: List[str], index: int) -> Tuple[int, int]:
+    """First and last index of the run of identical lines containing index."""
+    line = lines[index]
+    start = end = index
+    while start > 0 and lines[start - 1] == line:
+        start -= 1
+    while end + 1 < len(lines) and lines[end + 1] == line:
+        end += 1
+    return start, end
+
+
+def _context_crc(lines: List[str], start: int, stop: int) -> int:
+    crc = 0
+    for index in range(start, stop):
+        crc = zlib.crc32(lines[index].encode() + b"\n", crc)
+    return crc
+
+
+def _run_cursor(lines: List[str], index: int, start: int, end: int) -> str:
+    """Cursor of lines[index], which lies in the identical run lines[start:end + 1]."""
+    before = min(CURSOR_CONTEXT, start)
+    after = min(CURSOR_CONTEXT, len(lines) - 1 - end)
+    distance = len(lines) - 1 - index
+    if before >= after:
+        return make_cursor(lines[index], _context_crc(lines, start - before, start),
+                           CONTEXT_BEFORE, before, index - start, distance)
+    return make_cursor(lines[index], _context_crc(lines, end + 1, end + 1 + after),
+                       CONTEXT_AFTER, after, end - index, distance)
+
+
+def _cursor_at(lines: List[str], index: int) -> Optional[str]:
+    if not 0 <= index < len(lines):
+        return None
+    start, end = _run_bounds(lines, index)
+    return _run_cursor(lines, index, start, end)
+
+
+def _cursors_from(lines: List[str], first: int) -> List[str]:
+    """Cursors of lines[first:], walking each run of identical lines once."""
+    cursors: List[str] = []
+    index = first
+    while index < len(lines):
+        start, end = _run_bounds(lines, index)
+        cursors.extend(_run_cursor(lines, position, start, end) for position in range(index, end + 1))
+        index = end + 1
+    return cursors
+
+
+def _find_cursor(lines: List[str], cursor: str) -> Optional[int]:
+    """
+    Index of the cursor's line, or None if it is not in lines.
+
+    Runs of the line's copies are checked newest first against the cursor's
+    context. Lines are only appended, so the line has at least as many lines
+    after it as when the cursor was made; newer positions are skipped.
+    """
+    crc, context, side, context_lines, copies, distance = parse_cursor(cursor)
+    newest_allowed = len(lines) - 1 - distance
+    index = newest_allowed
+    while index >= 0:
+        if zlib.crc32(lines[index].encode()) != crc:
+            index -= 1
+            continue
+        start, end = _run_bounds(lines, index)
+        if side == CONTEXT_BEFORE:
+            position = start + copies
+            matched = (context_lines <= start
+                       and _context_crc(lines, start - context_lines, start) == context)
+        else:
+            position = end - copies
+            matched = (end + 1 + context_lines <= len(lines)
+                       and _context_crc(lines, end + 1, end + 1 + context_lines) == context)
+        if matched and start <= position <= min(end, newest_allowed):
+            return position
+        index = start - 1
+    return None
+
+
+class CursorExpired(Exception):
+    """The cursor's line has rotated out of the largest log window."""
+
+
+def read_log_page(log_filter: LogFilter, limit: int = 200, before: Optional[str] = None,
+                  after: Optional[str] = None,
+                  fetch: Callable[[int], List[str]] = fetch_log_lines) -> Dict[str, Any]:
+    """
+    Return one page of matching entries, oldest first.
+
+    Without a cursor the page ends at the newest line. With 'before' it holds
+    the matches just older than that cursor; with 'after' the oldest matches
+    newer than it.
+
+    Returns:
+        Dict with 'entries' (each with its 'cursor'), 'older' (cursor to pass
+        as 'before' for the next older page, None at the start of the log),
+        'newest' (cursor of the newest line scanned) and 'window' (lines fetched)
+
+    Raises:
+        ValueError: For a malformed cursor
+        CursorExpired: If the cursor's line is no longer in the log window
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    cursor = before or after
+    if cursor:
+        parse_cursor(cursor)
+    window = LOG_WINDOW
+
+    while True:
+        lines = fetch(window)
+        complete = len(lines) < window or window >= LOG_MAX_WINDOW
+        position = _find_cursor(lines, cursor) if cursor else len(lines)
+        if position is None:
+            if complete:
+                raise CursorExpired("Cursor is no longer in the log window")
+            window = min(window * 4, LOG_MAX_WINDOW)
+            continue
+
+        def cursor_at(index: int) -> Optional[str]:
+            return _cursor_at(lines, index)
+
+        if after:
+            entries = []
+            newest_scanned = position
+            for index in range(position + 1, len(lines)):
+                newest_scanned = index
+                entry = log_filter.matches(lines[index])
+                if entry:
+                    entries.append({**entry, "cursor": cursor_at(index)})
+                    if len(entries) >= limit:
+                        break
+            return {
+                "entries": entries,
+                "older": entries[0]["cursor"] if entries else after,
+                "newest": cursor_at(newest_scanned) or after,
+                "window": len(lines),
+            }
+
+        entries = []
+        oldest_scanned = position
+        for index in range(position - 1, -1, -1):
+            oldest_scanned = index
+            entry = log_filter.matches(lines[index])
+            if entry:
+                entries.append({**entry, "cursor": cursor_at(index)})
+                if len(entries) >= limit:
+                    break
+
+        # Not enough matches and older lines exist beyond the window: look further back
+        if len(entries) < limit and oldest_scanned == 0 and not complete:
+            window = min(window * 4, LOG_MAX_WINDOW)
+            continue
+
+        exhausted = oldest_scanned == 0 and complete
+        entries.reverse()
+        return {
+            "entries": entries,
+            "older": None if exhausted else cursor_at(oldest_scanned),
+            "newest": cursor_at(len(lines) - 1) if before is None else cursor_at(position - 1),
+            "window": len(lines),
+        }
+
+
+def read_new_lines(cursor: Optional[str], fetch: Callable[[int], List[str]] = fetch_log_lines,
+                   max_window: int = LOG_MAX_WINDOW) -> Tuple[List[Tuple[str, str]], Optional[str], bool]:
+    """
+    Return the lines appended since a cursor, widening the window until it is found.
+
+    Args:
+        cursor: Cursor of the last line already seen; None returns the whole first window
+        fetch: Returns the last N log lines
+        max_window: Largest window fetched while looking for the cursor
+
+    Returns:
+        Tuple of (lines as (cursor, line) pairs, newest cursor, gap) where gap
+        is True if the cursor rotated out of the window and lines may be missing
+    """
+    if cursor:
+        parse_cursor(cursor)
+    window = min(LOG_WINDOW, max_window)
+    while True:
+        lines = fetch(window)
+        position = _find_cursor(lines, cursor) if cursor else -1
+        complete = len(lines) < window or window >= max_window
+        if position is None and not complete:
+            window = min(window * 4, max_window)
+            continue
+
+        start = 0 if position is None else position + 1
+        new_lines = list(zip(_cursors_from(lines, start), lines[start:]))
+        newest = new_lines[-1][0] if new_lines else cursor
+        return new_lines, newest, position is None
+
+
+def iter_new_entries(log_filter: LogFilter, cursor: Optional[str],
+                     fetch: Callable[[int], List[str]] = fetch_log_lines) -> Tuple[List[Dict[str, Any]], Optional[str], bool]:
+    """
+    Return matching entries appended since a cursor.
+
+    Returns:
+        Tuple of (entries, newest cursor, gap) where gap is True if the cursor
+        rotated out of the window and some lines may have been missed
+    """
+    if cursor is None:
+        lines, newest, _ = read_new_lines(None, fetch, max_window=LOG_WINDOW)
+        return [], newest, False
+
+    lines, newest, gap = read_new_lines(cursor, fetch)
+    entries = []
+    for line_cursor, line in lines:
+        entry = log_filter.matches(line)
+        if entry:
+            entries.append({**entry, "cursor": line_cursor})
+    return entries, newest, gap
+
+
+def summarise_recent(lines: Iterable[str]) -> List[Dict[str, str]]:
+    """Dashboard form of log lines: raw message plus error/warning/info severity."""
+    summary = []
+    for line in lines:
+        severity = infer_severity(line)
+        if severity == "critical":
+            severity = "error"
+        elif severity not in ("error", "warning"):
+            severity = "info"
+        summary.append({"message": line.strip(), "severity": severity})
+    return summary
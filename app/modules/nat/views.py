@@ -1,7 +1,7 @@
-import json
 from flask import Blueprint, render_template, request, jsonify, current_app
 from app.auth import login_required
-from app.core import mark_config_dirty
+from app.core import load_config_subtree, mark_config_dirty
+from app.modules.interfaces.types import iter_interfaces
 
 nat_bp = Blueprint('nat', __name__)
 
@@ -78,23 +78,9 @@ def parse_nat_rules(nat_config):
 
 
 def get_available_interfaces():
-    """Get list of available network interfaces"""
+    """Get list of available network interfaces (every configured type, including VLANs)"""
     try:
-        data = current_app.device.show(path=["configuration", "json"])
-        config = json.loads(data.result)
-
-        interfaces = []
-        ethernet_interfaces = config.get('interfaces', {}).get('ethernet', {})
-
-        for iface_name, iface_data in ethernet_interfaces.items():
-            interfaces.append(iface_name)
-
-            # Add VLANs
-            if "vif" in iface_data:
-                for vlan_id in iface_data["vif"].keys():
-                    interfaces.append(f"{iface_name}.{vlan_id}")
-
-        return sorted(interfaces)
+        return sorted(entry["name"] for entry in iter_interfaces(load_config_subtree(["interfaces"])))
     except Exception as e:
         return []
 
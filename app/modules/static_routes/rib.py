@@ -0,0 +1,336 @@
+"""
+Operational routing table (RIB) from "show ip route" / "show ipv6 route".
+
+Full BGP tables run to ~1M routes, so the output is parsed line by line into
+a column-oriented snapshot: packed network addresses, prefix lengths,
+protocol codes, flags, distance/metric and indexes into interned next-hop
+groups and uptimes. No per-route objects are kept; only the rows of the
+requested page are turned into dicts.
+
+FRR prints routes sorted by network address, so prefix filters bisect the
+address column instead of scanning it.
+"""
+import ipaddress
+import os
+import re
+import socket
+import threading
+import time
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from flask import current_app
+
+from app.core import iter_lines
+from app.modules.interfaces.device import show_output
+
+RIB_CACHE_TTL = float(os.getenv("ROUTING_TABLE_CACHE_TTL", "30"))
+MAX_PAGE_SIZE = 500
+
+FAMILIES = {
+    "ipv4": (["ip", "route"], 4, socket.AF_INET),
+    "ipv6": (["ipv6", "route"], 16, socket.AF_INET6),
+}
+
+# FRR route codes (IPv6 output reuses R/O for RIPng/OSPFv3)
+PROTOCOLS = {
+    "K": "kernel",
+    "C": "connected",
+    "L": "local",
+    "S": "static",
+    "R": "rip",
+    "O": "ospf",
+    "I": "isis",
+    "B": "bgp",
+    "E": "eigrp",
+    "N": "nhrp",
+    "T": "table",
+    "v": "vnc",
+    "V": "vnc-direct",
+    "A": "babel",
+    "D": "sharp",
+    "F": "pbr",
+    "f": "openfabric",
+    "t": "table-direct",
+}
+PROTOCOL_CODES = {name: code for code, name in PROTOCOLS.items()}
+
+SELECTED = 1
+FIB = 2
+
+_ROUTE_LINE = re.compile(
+    r"^(?P<code>[A-Za-z])(?P<flags>[>*=qrbto]*)\s+(?P<prefix>[0-9A-Fa-f:.]+/\d+)"
+    r"(?:\s+\[(?P<distance>\d+)/(?P<metric>\d+)\])?\s+(?P<rest>.*)$"
+)
+_PATH_LINE = re.compile(r"^\s+(?P<flags>[>*=qrbto]*)\s+(?P<rest>(?:via|is directly connected|unreachable).*)$")
+_UPTIME = re.compile(r"^(?:\d{2}:\d{2}:\d{2}|\d+[wdhm][\dwdhm]*)$")
+
+
+def _parse_path(rest: str, flags: str) -> Tuple[Tuple[str, str, bool], Optional[str]]:
+    """Split the tail of a route line into ((via, interface, active), uptime)."""
+    parts = [part.strip() for part in rest.split(",")]
+    via, interface, uptime = "", "", None
+    head = parts[0]
+    if head.startswith("via "):
+        # Drop trailing state words such as "inactive" or "(recursive)"
+        via = head[4:].split(None, 1)[0] if len(head) > 4 else ""
+        if len(parts) > 1 and not parts[1].startswith("weight") and not _UPTIME.match(parts[1]):
+            interface = parts[1]
+    elif head.startswith("is directly connected"):
+        interface = parts[1] if len(parts) > 1 else ""
+    else:
+        via = head
+    if _UPTIME.match(parts[-1]):
+        uptime = parts[-1]
+    return (via, interface, "*" in flags), uptime
+
+
+class RibTable:
+    """Column-oriented snapshot of one address family's routing table."""
+
+    def __init__(self, lines: Iterable[str] = (), family: str = "ipv4", fetched_at: float = 0.0):
+        self.family = family
+        self.width = FAMILIES[family][1]
+        self._address_family = FAMILIES[family][2]
+        self.addresses = bytearray()
+        self.prefixlens = array("B")
+        self.codes = bytearray()
+        self.flags = bytearray()
+        self.distances = array("B")
+        self.metrics = array("L")
+        self.groups = array("L")
+        self.uptimes = array("L")
+        self.group_values: List[Tuple[Tuple[str, str, bool], ...]] = []
+        self.uptime_values: List[str] = []
+        self.fetched_at = fetched_at
+        self.sorted = True
+
+        self._group_ids: Dict[Tuple[Tuple[str, str, bool], ...], int] = {}
+        self._uptime_ids: Dict[str, int] = {}
+        self._load(lines)
+        del self._group_ids, self._uptime_ids
+
+    def __len__(self) -> int:
+        return len(self.prefixlens)
+
+    @staticmethod
+    def _intern(value, values: list, ids: dict) -> int:
+        index = ids.get(value)
+        if index is None:
+            index = ids[value] = len(values)
+            values.append(value)
+        return index
+
+    def _load(self, lines: Iterable[str]) -> None:
+        paths: List[Tuple[str, str, bool]] = []
+        uptime = ""
+        previous = -1
+        bits = self.width * 8
+        address_family = self._address_family
+        # Route tails repeat heavily (same peer, same session uptime), so parse each once
+        parsed_tails: Dict[Tuple[str, str], Tuple[Tuple[str, str, bool], Optional[str]]] = {}
+        append_address, append_prefixlen = self.addresses.extend, self.prefixlens.append
+        append_code, append_flags = self.codes.append, self.flags.append
+        append_distance, append_metric = self.distances.append, self.metrics.append
+
+        def parse_tail(rest: str, flags: str) -> Tuple[Tuple[str, str, bool], Optional[str]]:
+            key = (rest, flags)
+            tail = parsed_tails.get(key)
+            if tail is None:
+                tail = parsed_tails[key] = _parse_path(rest, flags)
+            return tail
+
+        def flush() -> None:
+            if paths:
+                self.groups.append(self._intern(tuple(paths), self.group_values, self._group_ids))
+                self.uptimes.append(self._intern(uptime, self.uptime_values, self._uptime_ids))
+
+        for line in lines:
+            match = _ROUTE_LINE.match(line)
+            if match:
+                code, flags, prefix, distance, metric, rest = match.groups()
+                address, _, length = prefix.partition("/")
+                try:
+                    packed = socket.inet_pton(address_family, address)
+                except OSError:
+                    continue
+                prefixlen = int(length)
+                if prefixlen > bits:
+                    continue
+                flush()
+                host_bits = bits - prefixlen
+                value = int.from_bytes(packed, "big") >> host_bits << host_bits
+                if value < previous:
+                    self.sorted = False
+                previous = value
+
+                append_address(value.to_bytes(self.width, "big"))
+                append_prefixlen(prefixlen)
+                append_code(ord(code))
+                append_flags((SELECTED if ">" in flags else 0) | (FIB if "*" in flags else 0))
+                append_distance(min(int(distance or 0), 255))
+                append_metric(min(int(metric or 0), 0xFFFFFFFF))
+                path, route_uptime = parse_tail(rest, flags)
+                paths = [path]
+                uptime = route_uptime or ""
+                continue
+
+            match = _PATH_LINE.match(line)
+            if match and paths:
+                paths.append(parse_tail(match.group("rest"), match.group("flags"))[0])
+        flush()
+
+    def address(self, index: int) -> int:
+        start = index * self.width
+        return int.from_bytes(self.addresses[start:start + self.width], "big")
+
+    def row(self, index: int) -> Dict[str, Any]:
+        address = self.address(index)
+        ip = ipaddress.IPv4Address(address) if self.width == 4 else ipaddress.IPv6Address(address)
+        code = chr(self.codes[index])
+        flags = self.flags[index]
+        return {
+            "prefix": f"{ip}/{self.prefixlens[index]}",
+            "protocol": PROTOCOLS.get(code, code),
+            "selected": bool(flags & SELECTED),
+            "fib": bool(flags & FIB),
+            "distance": self.distances[index],
+            "metric": self.metrics[index],
+            "next_hops": [
+                {"via": via, "interface": interface, "active": active}
+                for via, interface, active in self.group_values[self.groups[index]]
+            ],
+            "uptime": self.uptime_values[self.uptimes[index]],
+        }
+
+    def _bisect(self, value: int) -> int:
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self.address(middle) < value:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def query(self, prefix: Optional[str] = None, protocol: Optional[str] = None,
+              next_hop: Optional[str] = None, selected_only: bool = False,
+              offset: int = 0, limit: int = 100) -> Dict[str, Any]:
+        """
+        Filter the table and return one page of routes.
+
+        Args:
+            prefix: Only routes inside this network (e.g. 10.0.0.0/8)
+            protocol: Protocol name (bgp, static, ...) or FRR code letter
+            next_hop: Substring of a next-hop address or interface
+            selected_only: Only selected (best) routes
+            offset: Matches to skip
+            limit: Page size, capped at MAX_PAGE_SIZE
+
+        Returns:
+            Dict with 'total' matches, 'offset', 'limit' and the page of 'routes'
+
+        Raises:
+            ValueError: For an invalid prefix or protocol
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        offset = max(0, offset)
+        rows: Iterable[int] = range(len(self))
+        low_bound = high_bound = None
+        min_length = 0
+
+        if prefix:
+            network = ipaddress.ip_network(prefix.strip(), strict=False)
+            if network.max_prefixlen != self.width * 8:
+                raise ValueError(f"{prefix} is not an {self.family} prefix")
+            low_bound, high_bound = int(network.network_address), int(network.broadcast_address)
+            min_length = network.prefixlen
+            if self.sorted:
+                rows = range(self._bisect(low_bound), self._bisect(high_bound + 1))
+
+        code = None
+        if protocol:
+            code = PROTOCOL_CODES.get(protocol.strip().lower()) or protocol.strip()
+            if code not in PROTOCOLS:
+                raise ValueError(f"Unknown protocol: {protocol}")
+            code = ord(code)
+
+        groups = None
+        if next_hop:
+            needle = next_hop.strip().lower()
+            groups = {
+                index for index, group in enumerate(self.group_values)
+                if any(needle in via.lower() or needle in interface.lower() for via, interface, _ in group)
+            }
+
+        if low_bound is None and code is None and groups is None and not selected_only:
+            total = len(self)
+            page = range(min(offset, total), min(offset + limit, total))
+        else:
+            total = 0
+            page = []
+            for index in rows:
+                if code is not None and self.codes[index] != code:
+                    continue
+                if selected_only and not self.flags[index] & SELECTED:
+                    continue
+                if groups is not None and self.groups[index] not in groups:
+                    continue
+                if low_bound is not None:
+                    if self.prefixlens[index] < min_length:
+                        continue
+                    if not self.sorted and not low_bound <= self.address(index) <= high_bound:
+                        continue
+                if offset <= total < offset + limit:
+                    page.append(index)
+                total += 1
+
+        return {
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "routes": [self.row(index) for index in page],
+        }
+
+    def protocol_counts(self) -> Dict[str, int]:
+        """Number of routes per protocol."""
+        counts: Dict[str, int] = {}
+        for code in set(self.codes):
+            name = PROTOCOLS.get(chr(code), chr(code))
+            counts[name] = self.codes.count(code)
+        return dict(sorted(counts.items()))
+
+
+_lock = threading.Lock()
+_snapshots: Dict[str, RibTable] = {}
+
+
+def get_rib_table(family: str = "ipv4", force: bool = False) -> RibTable:
+    """
+    Return the routing table snapshot of a family, refreshed at most once per RIB_CACHE_TTL.
+
+    A failed fetch keeps the previous snapshot, so a router error is never
+    shown as an empty routing table.
+
+    Raises:
+        ValueError: For an unknown family
+        DeviceCommandError: If the fetch fails and there is no previous snapshot
+    """
+    if family not in FAMILIES:
+        raise ValueError(f"Unknown address family: {family}")
+
+    with _lock:
+        snapshot = _snapshots.get(family)
+        if snapshot and not force and time.monotonic() - snapshot.fetched_at < RIB_CACHE_TTL:
+            return snapshot
+
+        try:
+            raw = show_output(FAMILIES[family][0])
+        except Exception as exc:
+            current_app.logger.error(f"Failed to fetch {family} routing table: {exc}")
+            if snapshot is None:
+                raise
+            return snapshot
+
+        snapshot = _snapshots[family] = RibTable(iter_lines(raw), family=family, fetched_at=time.monotonic())
+        return snapshot
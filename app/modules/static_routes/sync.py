@@ -0,0 +1,202 @@
+"""
+Bulk import and declarative sync of static routes.
+
+Desired routes are streamed from a CSV upload (JSON uploads are size-capped
+and parsed whole, as is a JSON body), validated, and joined against the
+current table on a destination hash index: every route ends up in exactly
+one of add, remove (sync only), modify (description changed) or unchanged.
+The resulting operations are applied in chunked commits by the caller.
+"""
+import csv
+import ipaddress
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple
+
+from app.core import load_json_upload
+
+from .utils import validate_route
+
+STATIC_ROUTE_CHUNK_SIZE = 500
+MAX_REPORTED_ERRORS = 50
+
+ROUTE_BASE_PATH = ["protocols", "static", "route"]
+
+# Accepted spellings of each import column
+_COLUMN_ALIASES = {
+    "destination": "destination",
+    "dest": "destination",
+    "prefix": "destination",
+    "network": "destination",
+    "next_hop": "next_hop",
+    "next-hop": "next_hop",
+    "nexthop": "next_hop",
+    "gateway": "next_hop",
+    "via": "next_hop",
+    "description": "description",
+}
+
+
+def _normalize_row(row: Dict[str, Any]) -> Dict[str, str]:
+    normalized = {}
+    for key, value in row.items():
+        column = _COLUMN_ALIASES.get(str(key or "").strip().lower())
+        if column and value not in (None, ""):
+            normalized[column] = str(value).strip()
+    return normalized
+
+
+def iter_route_list(items: Any) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """Yield (row_number, route) from a list of route objects."""
+    for index, row in enumerate(items if isinstance(items, list) else [], start=1):
+        yield index, _normalize_row(row) if isinstance(row, dict) else {}
+
+
+def iter_route_rows(stream, filename: str = "") -> Iterator[Tuple[int, Dict[str, str]]]:
+    """
+    Yield (row_number, route) from a CSV or JSON upload.
+
+    CSV files need a header row (destination, next_hop, description) and are
+    read line by line. JSON uploads are a list of objects (or {"routes": [...]});
+    they are parsed in one go, so they are capped at JSON_IMPORT_MAX_BYTES.
+    """
+    if filename.lower().endswith(".json"):
+        data = load_json_upload(stream)
+        if isinstance(data, dict):
+            data = data.get("routes") or []
+        yield from iter_route_list(data)
+        return
+
+    reader = csv.DictReader(line for line in stream if line.strip() and not line.lstrip().startswith("#"))
+    for index, row in enumerate(reader, start=2):
+        yield index, _normalize_row(row)
+
+
+def index_routes(routes: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Index parsed routes by destination: {'next_hops': set, 'description': str}."""
+    index: Dict[str, Dict[str, Any]] = {}
+    for route in routes:
+        entry = index.setdefault(route["destination"], {"next_hops": set(), "description": ""})
+        entry["next_hops"].add(route["next_hop"])
+        if isinstance(route.get("description"), str) and route["description"]:
+            entry["description"] = route["description"]
+    return index
+
+
+def _routes(destination: str, next_hops: Set[str], description: str) -> List[Dict[str, str]]:
+    return [
+        {"destination": destination, "next_hop": next_hop, "description": description}
+        for next_hop in sorted(next_hops)
+    ]
+
+
+def plan_route_sync(rows: Iterable[Tuple[int, Dict[str, str]]], current_routes: Iterable[Dict[str, Any]],
+                    prune: bool) -> Dict[str, Any]:
+    """
+    Validate desired routes and diff them against the current routes.
+
+    With prune (sync) the desired list is the complete route set and anything
+    else is removed; without it (import) routes are only added or updated.
+    Operations are ordered adds, modifies, removes so that a replaced
+    next-hop is installed before the old one is withdrawn, even when the
+    batch spans several commits.
+
+    Args:
+        rows: (row_number, route) pairs from iter_route_rows/iter_route_list
+        current_routes: Routes from parse_static_routes
+        prune: Remove configured routes missing from the desired list
+
+    Returns:
+        Dict with 'operations', the diff ('add', 'remove', 'modify' lists),
+        'unchanged' and 'rejected' counts and up to MAX_REPORTED_ERRORS 'errors'
+    """
+    desired: Dict[str, Dict[str, Any]] = {}
+    seen: Dict[Tuple[str, str], int] = {}
+    description_rows: Dict[str, int] = {}
+    errors: List[Dict[str, Any]] = []
+    rejected = 0
+
+    def reject(row_number: int, message: str) -> None:
+        nonlocal rejected
+        rejected += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append({"row": row_number, "message": message})
+
+    for row_number, row in rows:
+        destination = row.get("destination", "")
+        next_hop = row.get("next_hop", "")
+        description = row.get("description", "")
+
+        if not destination or not next_hop:
+            reject(row_number, "Destination and next-hop are required")
+            continue
+        is_valid, error_msg = validate_route(destination, next_hop)
+        if not is_valid:
+            reject(row_number, error_msg)
+            continue
+        destination = str(ipaddress.ip_network(destination, strict=False))
+
+        key = (destination, next_hop)
+        if key in seen:
+            reject(row_number, f"Duplicate route to {destination} via {next_hop} (also on row {seen[key]})")
+            continue
+        entry = desired.setdefault(destination, {"next_hops": set(), "description": ""})
+        if description:
+            if entry["description"] and entry["description"] != description:
+                reject(row_number, f"Conflicting description for {destination} "
+                                   f"(row {description_rows[destination]} sets {entry['description']!r})")
+                continue
+            entry["description"] = description
+            description_rows[destination] = row_number
+        seen[key] = row_number
+        entry["next_hops"].add(next_hop)
+
+    current = index_routes(current_routes)
+    diff: Dict[str, List[Dict[str, str]]] = {"add": [], "remove": [], "modify": []}
+    adds: List[Dict[str, Any]] = []
+    modifies: List[Dict[str, Any]] = []
+    removes: List[Dict[str, Any]] = []
+    unchanged = 0
+
+    for destination, wanted in desired.items():
+        base_path = ROUTE_BASE_PATH + [destination]
+        existing = current.get(destination)
+        existing_hops = existing["next_hops"] if existing else set()
+        new_hops = wanted["next_hops"] - existing_hops
+        description = wanted["description"]
+        old_description = existing["description"] if existing else ""
+
+        for next_hop in sorted(new_hops):
+            adds.append({"op": "set", "path": base_path + ["next-hop", next_hop]})
+        diff["add"].extend(_routes(destination, new_hops, description))
+        unchanged += len(wanted["next_hops"] & existing_hops)
+
+        if description != old_description and (description or prune):
+            if description:
+                modifies.append({"op": "set", "path": base_path + ["description", description]})
+            elif existing:
+                modifies.append({"op": "delete", "path": base_path + ["description"]})
+            if existing:
+                diff["modify"].append({
+                    "destination": destination,
+                    "description": description,
+                    "old_description": old_description,
+                })
+
+        if prune and existing:
+            stale_hops = existing_hops - wanted["next_hops"]
+            for next_hop in sorted(stale_hops):
+                removes.append({"op": "delete", "path": base_path + ["next-hop", next_hop]})
+            diff["remove"].extend(_routes(destination, stale_hops, old_description))
+
+    if prune:
+        for destination in current.keys() - desired.keys():
+            existing = current[destination]
+            removes.append({"op": "delete", "path": ROUTE_BASE_PATH + [destination]})
+            diff["remove"].extend(_routes(destination, existing["next_hops"], existing["description"]))
+
+    return {
+        "operations": adds + modifies + removes,
+        **diff,
+        "unchanged": unchanged,
+        "rejected": rejected,
+        "errors": errors,
+    }
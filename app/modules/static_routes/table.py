@@ -0,0 +1,243 @@
+"""
+Routing-table model for static routes, backed by a binary prefix trie.
+
+The table holds the configured static routes (IPv4 'route' and IPv6
+'route6', next-hop and blackhole) plus the connected networks of every
+configured interface address. Prefixes live in one trie per IP version, so:
+
+- lookup(address) walks at most 32/128 bits to find the longest matching prefix
+- covering/covered prefixes of a network are found by walking its path/subtree
+- duplicate checks are a dict lookup on (destination, next-hop)
+
+The table is built once per configuration revision and shared read-only.
+"""
+import ipaddress
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.core import cached_by_revision, load_config_subtree
+from app.modules.interfaces.types import iter_interfaces
+
+from .utils import parse_static_routes
+
+CONNECTED = "connected"
+STATIC = "static"
+
+
+class _Node:
+    __slots__ = ("children", "entries")
+
+    def __init__(self):
+        self.children: List[Optional["_Node"]] = [None, None]
+        self.entries: Optional[Dict[str, Any]] = None
+
+
+class PrefixTrie:
+    """Binary trie of IP prefixes; each prefix node carries a payload dict."""
+
+    def __init__(self, bits: int):
+        self.bits = bits
+        self.root = _Node()
+        self.size = 0
+
+    def _walk(self, value: int, length: int, create: bool = False) -> Optional[_Node]:
+        node = self.root
+        for position in range(length):
+            bit = (value >> (self.bits - 1 - position)) & 1
+            child = node.children[bit]
+            if child is None:
+                if not create:
+                    return None
+                child = node.children[bit] = _Node()
+            node = child
+        return node
+
+    def setdefault(self, network: ipaddress._BaseNetwork, default: Dict[str, Any]) -> Dict[str, Any]:
+        node = self._walk(int(network.network_address), network.prefixlen, create=True)
+        if node.entries is None:
+            node.entries = default
+            self.size += 1
+        return node.entries
+
+    def get(self, network: ipaddress._BaseNetwork) -> Optional[Dict[str, Any]]:
+        node = self._walk(int(network.network_address), network.prefixlen)
+        return node.entries if node else None
+
+    def covering(self, value: int, length: int) -> Iterator[Dict[str, Any]]:
+        """Yield payloads of every prefix containing value/length, shortest first."""
+        node = self.root
+        if node.entries is not None:
+            yield node.entries
+        for position in range(length):
+            node = node.children[(value >> (self.bits - 1 - position)) & 1]
+            if node is None:
+                return
+            if node.entries is not None:
+                yield node.entries
+
+    def covered(self, network: ipaddress._BaseNetwork) -> Iterator[Dict[str, Any]]:
+        """Yield payloads of every prefix strictly inside network."""
+        start = self._walk(int(network.network_address), network.prefixlen)
+        if start is None:
+            return
+        stack = [child for child in start.children if child is not None]
+        while stack:
+            node = stack.pop()
+            if node.entries is not None:
+                yield node.entries
+            stack.extend(child for child in node.children if child is not None)
+
+
+def _network(value: Any) -> Optional[ipaddress._BaseNetwork]:
+    try:
+        return ipaddress.ip_network(str(value).strip(), strict=False)
+    except ValueError:
+        return None
+
+
+def _route_nodes(static_config: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    for key in ("route", "route6"):
+        routes = static_config.get(key)
+        if isinstance(routes, dict):
+            for destination, route_data in routes.items():
+                yield destination, route_data if isinstance(route_data, dict) else {}
+
+
+class RouteTable:
+    """Static and connected routes indexed for longest-prefix match and overlap queries."""
+
+    def __init__(self, static_config: Dict[str, Any], interfaces_config: Dict[str, Any]):
+        self.routes = parse_static_routes(static_config)
+        self.tries = {4: PrefixTrie(32), 6: PrefixTrie(128)}
+        self.by_key: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.connected: List[Dict[str, Any]] = []
+
+        for entry in iter_interfaces(interfaces_config):
+            addresses = entry["config"].get("address")
+            for address in addresses if isinstance(addresses, list) else [addresses]:
+                if not address or str(address).startswith("dhcp"):
+                    continue
+                try:
+                    iface_address = ipaddress.ip_interface(str(address))
+                except ValueError:
+                    continue
+                self.connected.append({"network": str(iface_address.network), "interface": entry["name"]})
+                self._prefix(iface_address.network)["connected"].append(entry["name"])
+
+        for destination, route_data in _route_nodes(static_config):
+            network = _network(destination)
+            if network is None:
+                continue
+            prefix = self._prefix(network)
+            description = route_data.get("description", "")
+            if "blackhole" in route_data:
+                prefix["blackhole"] = True
+            next_hops = route_data.get("next-hop")
+            for next_hop in next_hops if isinstance(next_hops, dict) else {}:
+                route = {"destination": destination, "next_hop": next_hop, "description": description}
+                prefix["static"].append(route)
+                self.by_key[(str(network), str(next_hop))] = route
+
+    def _prefix(self, network: ipaddress._BaseNetwork) -> Dict[str, Any]:
+        return self.tries[network.version].setdefault(
+            network, {"prefix": str(network), "connected": [], "static": [], "blackhole": False}
+        )
+
+    def __len__(self) -> int:
+        return len(self.by_key)
+
+    def has_route(self, destination: str, next_hop: str) -> bool:
+        """Whether a static route to destination via next_hop is configured."""
+        network = _network(destination)
+        return network is not None and (str(network), str(next_hop).strip()) in self.by_key
+
+    def lookup(self, address: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the route that carries traffic to an address.
+
+        Connected networks win over static routes for the same prefix, as
+        their administrative distance is lower.
+
+        Returns:
+            Dict with 'prefix', 'source' (connected|static|blackhole), and the
+            'interfaces' or 'next_hops' used; None if nothing matches
+        """
+        target = ipaddress.ip_address(str(address).strip())
+        best = None
+        trie = self.tries[target.version]
+        for prefix in trie.covering(int(target), trie.bits):
+            if prefix["connected"] or prefix["static"] or prefix["blackhole"]:
+                best = prefix
+        if best is None:
+            return None
+        if best["connected"]:
+            return {"prefix": best["prefix"], "source": CONNECTED, "interfaces": list(best["connected"])}
+        if best["static"]:
+            return {"prefix": best["prefix"], "source": STATIC,
+                    "next_hops": [route["next_hop"] for route in best["static"]]}
+        return {"prefix": best["prefix"], "source": "blackhole"}
+
+    def overlaps(self, destination: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Prefixes covering and covered by a destination (excluding the prefix itself)."""
+        network = ipaddress.ip_network(str(destination).strip(), strict=False)
+        trie = self.tries[network.version]
+        covering = [
+            prefix for prefix in trie.covering(int(network.network_address), network.prefixlen)
+            if prefix["prefix"] != str(network)
+        ]
+        return {"covering": covering, "covered": list(trie.covered(network))}
+
+    def analyse_route(self, destination: str, next_hop: str) -> List[Dict[str, str]]:
+        """
+        Return warnings for a (possibly not yet configured) static route.
+
+        - shadowed: the same prefix is a connected network, which always wins
+        - overrides_connected: the route is more specific than a connected network
+        - unreachable_next_hop: the next-hop is not inside any connected network
+        - redundant: a shorter static prefix already uses the same next-hop
+        """
+        issues = []
+        network = _network(destination)
+        if network is None:
+            return issues
+        trie = self.tries[network.version]
+
+        exact = trie.get(network)
+        if exact and exact["connected"]:
+            issues.append({"type": "shadowed",
+                           "message": f"{network} is connected on {', '.join(exact['connected'])}"})
+
+        shorter = trie.covering(int(network.network_address), network.prefixlen - 1) if network.prefixlen else ()
+        for prefix in shorter:
+            if prefix["connected"]:
+                issues.append({"type": "overrides_connected",
+                               "message": f"Overrides part of connected network {prefix['prefix']}"})
+            if any(route["next_hop"] == next_hop for route in prefix["static"]):
+                issues.append({"type": "redundant",
+                               "message": f"{prefix['prefix']} already routes via {next_hop}"})
+
+        try:
+            hop = ipaddress.ip_address(str(next_hop).strip())
+        except ValueError:
+            return issues
+        hop_trie = self.tries[hop.version]
+        if not any(prefix["connected"] for prefix in hop_trie.covering(int(hop), hop_trie.bits)):
+            issues.append({"type": "unreachable_next_hop",
+                           "message": f"Next-hop {next_hop} is not on a connected network"})
+        return issues
+
+    def analysis(self) -> List[Dict[str, Any]]:
+        """Warnings for every configured static route that has any."""
+        report = []
+        for route in self.by_key.values():
+            issues = self.analyse_route(route["destination"], route["next_hop"])
+            if issues:
+                report.append({**route, "issues": issues})
+        return report
+
+
+def get_route_table() -> RouteTable:
+    """Return the route table for the current configuration revision."""
+    return cached_by_revision(
+        "static-route-table",
+        lambda: RouteTable(load_config_subtree(["protocols", "static"]), load_config_subtree(["interfaces"])),
+    )
@@ -1,32 +1,62 @@
 """
 Views for static routes management.
 """
-from flask import render_template, request, jsonify, current_app
+import csv
+import io
+import ipaddress
+import json
+
+from flask import Response, render_template, request, jsonify, current_app, stream_with_context
 from app.modules.static_routes import static_routes_bp
+from app.modules.static_routes.rib import get_rib_table
+from app.modules.static_routes.sync import STATIC_ROUTE_CHUNK_SIZE, iter_route_list, iter_route_rows, plan_route_sync
+from app.modules.static_routes.table import get_route_table
 from app.modules.static_routes.utils import (
-    parse_static_routes,
     build_route_set_commands,
     build_route_delete_commands,
     validate_route
 )
-from app.modules.interfaces.device import configure_multiple_op
+from app.modules.interfaces.device import configure_multiple_op, iter_configure_chunks
 from app.auth import login_required
 from app.core.config_manager import mark_config_dirty
 
 
+def _routes_after(routes, remove=None, add=None):
+    """
+    Apply a committed change to a route list instead of re-reading the config.
+
+    Args:
+        routes: Routes from the table the change was planned against
+        remove: (destination, next_hop) that was deleted
+        add: Route dict that was set; replaces an existing entry in place
+    """
+    updated = []
+    added = False
+    for route in routes:
+        key = (route['destination'], route['next_hop'])
+        if remove and key == remove:
+            continue
+        if add and key == (add['destination'], add['next_hop']):
+            updated.append(dict(add))
+            added = True
+            continue
+        updated.append(dict(route))
+    if add and not added:
+        updated.append(dict(add))
+    if add:
+        # The description lives on the destination, so it applies to every next-hop
+        for route in updated:
+            if route['destination'] == add['destination']:
+                route['description'] = add['description']
+    return updated
+
+
 @static_routes_bp.route('/')
 @login_required
 def index():
     """Display static routes page."""
     try:
-        # Retrieve static route configuration
-        config_response = current_app.device.retrieve_show_config(['protocols', 'static'])
-
-        # Extract data from response
-        config_data = config_response.result if hasattr(config_response, 'result') else {}
-
-        # Parse routes
-        routes = parse_static_routes(config_data)
+        routes = get_route_table().routes
 
         return render_template('static_routes/index.html', routes=routes)
     except Exception as e:
@@ -39,10 +69,7 @@ def index():
 def get_routes():
     """API endpoint to get all static routes."""
     try:
-        config_response = current_app.device.retrieve_show_config(['protocols', 'static'])
-        config_data = config_response.result if hasattr(config_response, 'result') else {}
-
-        routes = parse_static_routes(config_data)
+        routes = get_route_table().routes
 
         return jsonify({
             'status': 'ok',
@@ -82,16 +109,13 @@ def create_route():
             }), 400
 
         # Check if route already exists
-        config_response = current_app.device.retrieve_show_config(['protocols', 'static'])
-        config_data = config_response.result if hasattr(config_response, 'result') else {}
-        existing_routes = parse_static_routes(config_data)
-
-        for route in existing_routes:
-            if route['destination'] == destination and route['next_hop'] == next_hop:
-                return jsonify({
-                    'status': 'error',
-                    'message': f'Route to {destination} via {next_hop} already exists'
-                }), 409
+        table = get_route_table()
+        if table.has_route(destination, next_hop):
+            return jsonify({
+                'status': 'error',
+                'message': f'Route to {destination} via {next_hop} already exists'
+            }), 409
+        warnings = table.analyse_route(destination, next_hop)
 
         # Build and execute operations
         set_commands = build_route_set_commands(destination, next_hop, description)
@@ -111,15 +135,17 @@ def create_route():
         # Mark config as dirty
         mark_config_dirty()
 
-        # Get updated routes
-        config_response = current_app.device.retrieve_show_config(['protocols', 'static'])
-        config_data = config_response.result if hasattr(config_response, 'result') else {}
-        routes = parse_static_routes(config_data)
+        routes = _routes_after(table.routes, add={
+            'destination': destination,
+            'next_hop': next_hop,
+            'description': description
+        })
 
         return jsonify({
             'status': 'ok',
             'message': 'Static route created successfully',
             'routes': routes,
+            'warnings': warnings,
             'config_dirty': True
         })
 
@@ -158,6 +184,8 @@ def update_route():
                 'message': error_msg
             }), 400
 
+        table = get_route_table()
+
         # Check if route destination/next-hop changed
         route_changed = (old_destination != new_destination) or (old_next_hop != new_next_hop)
 
@@ -192,10 +220,11 @@ def update_route():
         # Mark config as dirty
         mark_config_dirty()
 
-        # Get updated routes
-        config_response = current_app.device.retrieve_show_config(['protocols', 'static'])
-        config_data = config_response.result if hasattr(config_response, 'result') else {}
-        routes = parse_static_routes(config_data)
+        routes = _routes_after(
+            table.routes,
+            remove=(old_destination, old_next_hop) if route_changed else None,
+            add={'destination': new_destination, 'next_hop': new_next_hop, 'description': description}
+        )
 
         return jsonify({
             'status': 'ok',
@@ -228,6 +257,8 @@ def delete_route():
                 'message': 'Destination and next-hop are required'
             }), 400
 
+        table = get_route_table()
+
         # Build and execute delete operation
         delete_commands = build_route_delete_commands(destination, next_hop)
         operations = [{"op": "delete", "path": path} for path in delete_commands]
@@ -246,10 +277,7 @@ def delete_route():
         # Mark config as dirty
         mark_config_dirty()
 
-        # Get updated routes
-        config_response = current_app.device.retrieve_show_config(['protocols', 'static'])
-        config_data = config_response.result if hasattr(config_response, 'result') else {}
-        routes = parse_static_routes(config_data)
+        routes = _routes_after(table.routes, remove=(destination, next_hop))
 
         return jsonify({
             'status': 'ok',
@@ -264,3 +292,191 @@ def delete_route():
             'status': 'error',
             'message': str(e)
         }), 500
+
+
+@static_routes_bp.route('/api/routes/lookup', methods=['GET'])
+@login_required
+def lookup_route():
+    """API endpoint returning the route that carries traffic to an address."""
+    address = request.args.get('address', '').strip()
+    try:
+        ipaddress.ip_address(address)
+    except ValueError:
+        return jsonify({
+            'status': 'error',
+            'message': 'A valid IP address is required'
+        }), 400
+
+    try:
+        route = get_route_table().lookup(address)
+        return jsonify({
+            'status': 'ok',
+            'address': address,
+            'route': route
+        })
+    except Exception as e:
+        current_app.logger.error(f"Error looking up route for {address}: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+
+@static_routes_bp.route('/api/routes/analysis', methods=['GET'])
+@login_required
+def analyse_routes():
+    """API endpoint listing static routes that are shadowed, redundant or unreachable."""
+    try:
+        table = get_route_table()
+        return jsonify({
+            'status': 'ok',
+            'connected': table.connected,
+            'routes': table.analysis()
+        })
+    except Exception as e:
+        current_app.logger.error(f"Error analysing static routes: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+
+def _read_sync_request():
+    """Return (rows, dry_run) from a CSV/JSON upload or a JSON body with 'routes'."""
+    upload = request.files.get('file')
+    if upload:
+        dry_run = (request.form.get('dry_run') or '').strip().lower() in ('1', 'true', 'yes', 'on')
+        stream = io.TextIOWrapper(upload.stream, encoding='utf-8-sig', errors='replace')
+        return iter_route_rows(stream, upload.filename or ''), dry_run
+
+    data = request.get_json(silent=True) or {}
+    return iter_route_list(data.get('routes')), bool(data.get('dry_run'))
+
+
+def _sync_routes(prune):
+    """Plan a route import/sync, then return the diff or stream the chunked apply."""
+    try:
+        rows, dry_run = _read_sync_request()
+        plan = plan_route_sync(rows, get_route_table().routes, prune=prune)
+    except (ValueError, csv.Error) as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'Could not read routes: {e}'
+        }), 400
+    except Exception as e:
+        current_app.logger.error(f"Error planning static route sync: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+    operations = plan.pop('operations')
+    summary = {
+        'added': len(plan['add']),
+        'removed': len(plan['remove']),
+        'modified': len(plan['modify']),
+        'unchanged': plan['unchanged'],
+        'rejected': plan['rejected'],
+        'operations': len(operations),
+    }
+
+    if plan['rejected']:
+        return jsonify({
+            'status': 'error',
+            'message': f"{plan['rejected']} route(s) rejected, nothing was applied",
+            'errors': plan['errors'],
+            **summary
+        }), 400
+
+    if dry_run or not operations:
+        return jsonify({
+            'status': 'ok',
+            'message': 'Dry run, no changes applied' if dry_run else 'No changes to apply',
+            'diff': {key: plan[key] for key in ('add', 'remove', 'modify')},
+            **summary,
+            'config_dirty': False
+        })
+
+    error_context = 'sync static routes' if prune else 'import static routes'
+
+    # The session is saved with the response headers, before the body streams,
+    # so the unsaved-changes flag has to be set now
+    mark_config_dirty()
+
+    def generate():
+        # One JSON document per line: a progress event after every committed chunk, then the result
+        applied = 0
+        success, error_message = True, None
+        for success, error_message, applied in iter_configure_chunks(operations, STATIC_ROUTE_CHUNK_SIZE, error_context):
+            if not success:
+                break
+            yield json.dumps({'status': 'progress', 'applied': applied, 'total': len(operations)}) + '\n'
+
+        if not success:
+            current_app.logger.error(f"Static route {'sync' if prune else 'import'} failed after {applied} operations: {error_message}")
+            result = {'status': 'error', 'message': error_message or 'Failed to apply static routes', 'applied': applied}
+        else:
+            result = {'status': 'ok', 'message': f"{summary['added']} added, {summary['modified']} modified, {summary['removed']} removed", 'applied': applied}
+        yield json.dumps({**result, **summary, 'config_dirty': bool(applied)}) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+@static_routes_bp.route('/api/routes/import', methods=['POST'])
+@login_required
+def import_routes():
+    """API endpoint adding or updating many static routes; existing routes are kept."""
+    return _sync_routes(prune=False)
+
+
+@static_routes_bp.route('/api/routes/sync', methods=['POST'])
+@login_required
+def sync_routes():
+    """API endpoint making the configured static routes match the given list exactly."""
+    return _sync_routes(prune=True)
+
+
+@static_routes_bp.route('/rib')
+@login_required
+def routing_table():
+    """Display the operational routing table; rows are paged in by the API."""
+    return render_template('static_routes/rib.html')
+
+
+@static_routes_bp.route('/api/rib', methods=['GET'])
+@login_required
+def get_rib():
+    """API endpoint returning one filtered page of the operational routing table."""
+    args = request.args
+    family = args.get('family', 'ipv4').strip().lower()
+    try:
+        offset = int(args.get('offset', 0))
+        limit = int(args.get('limit', 100))
+        table = get_rib_table(family, force=args.get('refresh', '').lower() in ('1', 'true', 'yes'))
+        page = table.query(
+            prefix=args.get('prefix', '').strip() or None,
+            protocol=args.get('protocol', '').strip() or None,
+            next_hop=args.get('next_hop', '').strip() or None,
+            selected_only=args.get('selected', '').lower() in ('1', 'true', 'yes'),
+            offset=offset,
+            limit=limit
+        )
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        current_app.logger.error(f"Error reading routing table: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+    return jsonify({
+        'status': 'ok',
+        'family': family,
+        'table_size': len(table),
+        'protocols': table.protocol_counts(),
+        **page
+    })
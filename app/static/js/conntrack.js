@@ -0,0 +1,190 @@
+/**
+ * Connection Tracking Table JavaScript
+ *
+ * The table is filtered and paged server-side; only the current page is ever rendered.
+ * Aggregates come from the periodically sampled summary.
+ */
+
+const CT_PAGE_SIZE = 100;
+
+// State
+let ctOffset = 0;
+let ctTotal = 0;
+
+// Initialize
+document.addEventListener('DOMContentLoaded', () => {
+  document.getElementById('ctFilterForm').addEventListener('submit', (e) => {
+    e.preventDefault();
+    ctOffset = 0;
+    loadConnections();
+  });
+  document.getElementById('ctFamily').addEventListener('change', () => {
+    ctOffset = 0;
+    document.getElementById('ctProtocol').value = '';
+    loadConnections();
+  });
+  document.getElementById('ctRefreshBtn').addEventListener('click', () => loadConnections(true));
+  document.getElementById('ctPrevBtn').addEventListener('click', () => {
+    ctOffset = Math.max(0, ctOffset - CT_PAGE_SIZE);
+    loadConnections();
+  });
+  document.getElementById('ctNextBtn').addEventListener('click', () => {
+    ctOffset += CT_PAGE_SIZE;
+    loadConnections();
+  });
+  loadConnections();
+  loadAggregates();
+});
+
+/**
+ * Escape text for insertion into HTML
+ */
+function escapeHtml(value) {
+  const div = document.createElement('div');
+  div.textContent = value == null ? '' : String(value);
+  return div.innerHTML;
+}
+
+function endpoint(address, port) {
+  if (port === null || port === undefined) return escapeHtml(address);
+  return address.includes(':') ? `[${escapeHtml(address)}]:${port}` : `${escapeHtml(address)}:${port}`;
+}
+
+/**
+ * Fetch and render the current page
+ */
+async function loadConnections(refresh = false) {
+  const params = new URLSearchParams({
+    family: document.getElementById('ctFamily').value,
+    offset: ctOffset,
+    limit: CT_PAGE_SIZE
+  });
+  const address = document.getElementById('ctAddress').value.trim();
+  const port = document.getElementById('ctPort').value.trim();
+  const protocol = document.getElementById('ctProtocol').value;
+  const state = document.getElementById('ctState').value.trim();
+  if (address) params.set('address', address);
+  if (port) params.set('port', port);
+  if (protocol) params.set('protocol', protocol);
+  if (state) params.set('state', state);
+  if (refresh) params.set('refresh', '1');
+
+  const summary = document.getElementById('ctSummary');
+  summary.textContent = 'Loading…';
+
+  try {
+    const response = await fetch(`/api/conntrack/table?${params}`);
+    const data = await response.json();
+
+    if (data.status !== 'ok') {
+      summary.textContent = data.message || 'Failed to load connections';
+      renderConnections([]);
+      return;
+    }
+
+    ctTotal = data.total;
+    summary.textContent = `${data.total.toLocaleString()} matching of ${data.table_size.toLocaleString()} connections`;
+    renderProtocols(data.protocols);
+    renderConnections(data.connections);
+    updatePager(data.offset, data.connections.length);
+  } catch (error) {
+    console.error('Error loading connections:', error);
+    summary.textContent = 'Failed to load connections';
+  }
+}
+
+/**
+ * Fill the protocol filter with the protocols present in the table
+ */
+function renderProtocols(protocols) {
+  const select = document.getElementById('ctProtocol');
+  const current = select.value;
+  select.innerHTML = '<option value="">All</option>';
+  Object.entries(protocols || {}).forEach(([name, count]) => {
+    const option = document.createElement('option');
+    option.value = name;
+    option.textContent = `${name} (${count.toLocaleString()})`;
+    select.appendChild(option);
+  });
+  select.value = current;
+}
+
+/**
+ * Render one page of connections
+ */
+function renderConnections(connections) {
+  const tbody = document.getElementById('ctTableBody');
+
+  if (connections.length === 0) {
+    tbody.innerHTML = `
+      <tr>
+        <td colspan="6" class="px-5 py-12 text-center text-gray-400">No connections match the current filter</td>
+      </tr>
+    `;
+    return;
+  }
+
+  tbody.innerHTML = connections.map(connection => `
+    <tr class="hover:bg-gradient-to-r hover:from-purple-900/10 hover:to-pink-900/10 transition-all">
+      <td class="px-5 py-3 text-gray-300">${escapeHtml(connection.protocol)}</td>
+      <td class="px-5 py-3 font-mono text-white">${endpoint(connection.src, connection.sport)}</td>
+      <td class="px-5 py-3 font-mono text-white">${endpoint(connection.dst, connection.dport)}</td>
+      <td class="px-5 py-3 font-mono text-gray-400 text-xs">${escapeHtml(connection.reply_src)} &rarr; ${escapeHtml(connection.reply_dst)}</td>
+      <td class="px-5 py-3 text-gray-300">${escapeHtml(connection.state)}</td>
+      <td class="px-5 py-3 text-gray-400">${connection.timeout ?? ''}</td>
+    </tr>
+  `).join('');
+}
+
+/**
+ * Update the pager controls
+ */
+function updatePager(offset, count) {
+  document.getElementById('ctPageInfo').textContent =
+    ctTotal ? `${(offset + 1).toLocaleString()}–${(offset + count).toLocaleString()}` : '-';
+  document.getElementById('ctPrevBtn').disabled = offset === 0;
+  document.getElementById('ctNextBtn').disabled = offset + count >= ctTotal;
+}
+
+/**
+ * Render label/count rows into a panel
+ */
+function renderCounts(elementId, rows) {
+  const container = document.getElementById(elementId);
+  if (rows.length === 0) {
+    container.innerHTML = '<div class="text-xs text-gray-500">No connections</div>';
+    return;
+  }
+  container.innerHTML = rows.map(([label, count]) => `
+    <div class="flex justify-between gap-2 text-gray-300">
+      <span class="truncate">${escapeHtml(label)}</span>
+      <span class="text-purple-300">${count.toLocaleString()}</span>
+    </div>
+  `).join('');
+}
+
+/**
+ * Fetch and render the sampled aggregates
+ */
+async function loadAggregates() {
+  try {
+    const response = await fetch('/api/conntrack/aggregates?limit=10');
+    const data = await response.json();
+    if (data.status !== 'ok') {
+      document.getElementById('ctAggregateInfo').textContent = data.message || 'Failed to load aggregates';
+      return;
+    }
+
+    renderCounts('ctZonePairs', data.zone_pairs.slice(0, 10).map(pair => [`${pair.source} → ${pair.destination}`, pair.count]));
+    renderCounts('ctProtocolStates', [
+      ...Object.entries(data.protocols),
+      ...Object.entries(data.states).map(([state, count]) => [`  ${state}`, count])
+    ]);
+    renderCounts('ctTopSources', data.top_sources.map(entry => [entry.address, entry.count]));
+    renderCounts('ctTopDestinations', data.top_destinations.map(entry => [entry.address, entry.count]));
+    document.getElementById('ctAggregateInfo').textContent =
+      `${data.total.toLocaleString()} connections, sampled ${new Date(data.sampled_at * 1000).toLocaleTimeString()}`;
+  } catch (error) {
+    console.error('Error loading conntrack aggregates:', error);
+  }
+}
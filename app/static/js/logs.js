@@ -0,0 +1,272 @@
+/**
+ * System Logs JavaScript
+ *
+ * Pages are filtered server-side; older pages are fetched by cursor and new
+ * entries arrive over server-sent events while following. History searches
+ * run against the local log index and page by entry id.
+ */
+
+const LOG_PAGE_SIZE = 200;
+const MAX_RENDERED_ENTRIES = 5000;
+
+const SEVERITY_CLASSES = {
+  critical: 'text-red-500',
+  error: 'text-red-400',
+  warning: 'text-yellow-400',
+  notice: 'text-blue-300',
+  info: 'text-blue-400',
+  debug: 'text-gray-500'
+};
+
+// State
+let logSource = null;
+let searchBefore = null;
+
+// Initialize
+document.addEventListener('DOMContentLoaded', () => {
+  colorSeverities(document);
+  scrollToBottom();
+
+  document.getElementById('logFilterForm').addEventListener('submit', (e) => {
+    e.preventDefault();
+    reloadLogs();
+  });
+  document.getElementById('logSearchForm').addEventListener('submit', (e) => {
+    e.preventDefault();
+    searchHistory();
+  });
+  document.getElementById('logOlderBtn').addEventListener('click', () => {
+    if (searchBefore !== null) {
+      searchHistory(searchBefore);
+    } else {
+      loadOlder();
+    }
+  });
+  document.getElementById('logFollowBtn').addEventListener('click', toggleFollow);
+});
+
+/**
+ * Escape text for insertion into HTML
+ */
+function escapeHtml(value) {
+  const div = document.createElement('div');
+  div.textContent = value == null ? '' : String(value);
+  return div.innerHTML;
+}
+
+function colorSeverities(root) {
+  root.querySelectorAll('.log-severity').forEach(el => {
+    const severity = el.textContent.trim();
+    el.classList.add(SEVERITY_CLASSES[severity] || 'text-gray-400');
+  });
+}
+
+function scrollToBottom() {
+  const scroller = document.getElementById('logScroller');
+  scroller.scrollTop = scroller.scrollHeight;
+}
+
+function setStatus(message) {
+  document.getElementById('logStatus').textContent = message || '';
+}
+
+/**
+ * Current filters as query parameters
+ */
+function filterParams() {
+  const params = new URLSearchParams({ limit: LOG_PAGE_SIZE });
+  const pattern = document.getElementById('logPattern').value.trim();
+  const severity = document.getElementById('logSeverity').value;
+  const since = document.getElementById('logSince').value;
+  const until = document.getElementById('logUntil').value;
+  if (pattern) params.set('pattern', pattern);
+  if (severity) params.set('severity', severity);
+  if (since) params.set('since', (new Date(since).getTime() / 1000).toString());
+  if (until) params.set('until', (new Date(until).getTime() / 1000).toString());
+  return params;
+}
+
+function renderEntry(entry) {
+  const row = document.createElement('div');
+  row.className = 'log-entry flex items-start gap-3 text-gray-300 py-1 border-b border-gray-800/50 last:border-0 hover:bg-gray-800/30 px-2 rounded';
+  row.dataset.cursor = entry.cursor;
+  row.innerHTML = `
+    <span class="text-gray-500 whitespace-nowrap">${escapeHtml(entry.time)}</span>
+    <span class="log-severity uppercase text-xs mt-0.5 w-16 shrink-0 ${SEVERITY_CLASSES[entry.severity] || 'text-gray-400'}">${escapeHtml(entry.severity)}</span>
+    <span class="text-cyan-300 whitespace-nowrap">${escapeHtml(entry.process)}</span>
+    <span class="flex-1 break-all">${escapeHtml(entry.message)}</span>
+  `;
+  return row;
+}
+
+function setOlder(cursor) {
+  const button = document.getElementById('logOlderBtn');
+  button.dataset.older = cursor || '';
+  button.disabled = !cursor;
+}
+
+function removeEmptyState(container) {
+  const empty = container.querySelector('.log-empty');
+  if (empty) empty.remove();
+}
+
+/**
+ * Replace the list with the newest page for the current filters
+ */
+async function reloadLogs() {
+  stopFollow();
+  searchBefore = null;
+  setStatus('Loading…');
+  try {
+    const response = await fetch(`/logs/api/entries?${filterParams()}`);
+    const data = await response.json();
+    if (data.status !== 'ok') {
+      setStatus(data.message || 'Failed to load logs');
+      return;
+    }
+
+    const container = document.getElementById('logEntries');
+    container.innerHTML = '';
+    if (data.entries.length === 0) {
+      container.innerHTML = '<div class="log-empty text-gray-500 text-center py-8">No matching log entries</div>';
+    }
+    data.entries.forEach(entry => container.appendChild(renderEntry(entry)));
+    container.dataset.newest = data.newest || '';
+    setOlder(data.older);
+    setStatus(`${data.entries.length} entries (searched ${data.window.toLocaleString()} lines)`);
+    scrollToBottom();
+  } catch (error) {
+    console.error('Error loading logs:', error);
+    setStatus('Failed to load logs');
+  }
+}
+
+/**
+ * Prepend the page just older than the oldest loaded entry
+ */
+async function loadOlder() {
+  const cursor = document.getElementById('logOlderBtn').dataset.older;
+  if (!cursor) return;
+
+  const params = filterParams();
+  params.set('before', cursor);
+  setStatus('Loading older entries…');
+  try {
+    const response = await fetch(`/logs/api/entries?${params}`);
+    const data = await response.json();
+    if (data.status !== 'ok') {
+      setStatus(data.message || 'Failed to load older entries');
+      if (response.status === 410) setOlder(null);
+      return;
+    }
+
+    const container = document.getElementById('logEntries');
+    const scroller = document.getElementById('logScroller');
+    const previousHeight = scroller.scrollHeight;
+    const fragment = document.createDocumentFragment();
+    data.entries.forEach(entry => fragment.appendChild(renderEntry(entry)));
+    removeEmptyState(container);
+    container.insertBefore(fragment, container.firstChild);
+    scroller.scrollTop += scroller.scrollHeight - previousHeight;
+    setOlder(data.older);
+    setStatus(data.older ? '' : 'Start of log reached');
+  } catch (error) {
+    console.error('Error loading older logs:', error);
+    setStatus('Failed to load older entries');
+  }
+}
+
+/**
+ * Follow new entries over server-sent events, resuming after the newest loaded line
+ */
+function toggleFollow() {
+  if (logSource) {
+    stopFollow();
+    return;
+  }
+
+  const container = document.getElementById('logEntries');
+  const params = filterParams();
+  if (container.dataset.newest) params.set('after', container.dataset.newest);
+
+  searchBefore = null;
+  logSource = new EventSource(`/logs/api/stream?${params}`);
+  document.querySelector('#logFollowBtn .material-icons').textContent = 'pause';
+  setStatus('Following…');
+
+  logSource.addEventListener('entry', (e) => {
+    const entry = JSON.parse(e.data);
+    removeEmptyState(container);
+    container.appendChild(renderEntry(entry));
+    while (container.children.length > MAX_RENDERED_ENTRIES) {
+      container.removeChild(container.firstChild);
+    }
+    scrollToBottom();
+  });
+  logSource.addEventListener('cursor', (e) => {
+    container.dataset.newest = JSON.parse(e.data).newest;
+  });
+  logSource.addEventListener('gap', () => setStatus('Following (some lines were missed)'));
+  logSource.addEventListener('error', (e) => {
+    if (e.data) setStatus(JSON.parse(e.data).message);
+  });
+}
+
+function stopFollow() {
+  if (logSource) {
+    logSource.close();
+    logSource = null;
+  }
+  document.querySelector('#logFollowBtn .material-icons').textContent = 'play_arrow';
+  setStatus('');
+}
+
+/**
+ * Search the local log index; with a 'before' id, prepend the next older page
+ */
+async function searchHistory(before = null) {
+  stopFollow();
+  const params = filterParams();
+  params.delete('pattern');
+  const query = document.getElementById('logQuery').value.trim();
+  const program = document.getElementById('logProgram').value.trim();
+  if (query) params.set('q', query);
+  if (program) params.set('program', program);
+  if (before !== null) params.set('before', before);
+
+  setStatus('Searching…');
+  try {
+    const started = performance.now();
+    const response = await fetch(`/logs/api/search?${params}`);
+    const data = await response.json();
+    if (data.status !== 'ok') {
+      setStatus(data.message || 'Search failed');
+      return;
+    }
+
+    const container = document.getElementById('logEntries');
+    const entries = data.entries.slice().reverse();
+    const fragment = document.createDocumentFragment();
+    entries.forEach(entry => fragment.appendChild(renderEntry(entry)));
+    if (before === null) {
+      container.innerHTML = '';
+      if (entries.length === 0) {
+        container.innerHTML = '<div class="log-empty text-gray-500 text-center py-8">No matching indexed entries</div>';
+      }
+      container.appendChild(fragment);
+      scrollToBottom();
+    } else {
+      removeEmptyState(container);
+      container.insertBefore(fragment, container.firstChild);
+    }
+
+    searchBefore = data.next_before;
+    const button = document.getElementById('logOlderBtn');
+    button.disabled = data.next_before === null;
+    const span = data.index.oldest ? ` since ${new Date(data.index.oldest * 1000).toLocaleString()}` : '';
+    setStatus(`${data.entries.length} indexed entries${span} (${Math.round(performance.now() - started)} ms)`);
+  } catch (error) {
+    console.error('Error searching logs:', error);
+    setStatus('Search failed');
+  }
+}
@@ -0,0 +1,149 @@
+/**
+ * Operational Routing Table JavaScript
+ *
+ * The table is paged server-side; only the current page is ever rendered.
+ */
+
+const RIB_PAGE_SIZE = 100;
+
+// State
+let ribOffset = 0;
+let ribTotal = 0;
+
+// Initialize
+document.addEventListener('DOMContentLoaded', () => {
+  document.getElementById('ribFilterForm').addEventListener('submit', (e) => {
+    e.preventDefault();
+    ribOffset = 0;
+    loadRib();
+  });
+  document.getElementById('ribFamily').addEventListener('change', () => {
+    ribOffset = 0;
+    document.getElementById('ribProtocol').value = '';
+    loadRib();
+  });
+  document.getElementById('ribRefreshBtn').addEventListener('click', () => loadRib(true));
+  document.getElementById('ribPrevBtn').addEventListener('click', () => {
+    ribOffset = Math.max(0, ribOffset - RIB_PAGE_SIZE);
+    loadRib();
+  });
+  document.getElementById('ribNextBtn').addEventListener('click', () => {
+    ribOffset += RIB_PAGE_SIZE;
+    loadRib();
+  });
+  loadRib();
+});
+
+/**
+ * Escape text for insertion into HTML
+ */
+function escapeHtml(value) {
+  const div = document.createElement('div');
+  div.textContent = value == null ? '' : String(value);
+  return div.innerHTML;
+}
+
+/**
+ * Fetch and render the current page
+ */
+async function loadRib(refresh = false) {
+  const params = new URLSearchParams({
+    family: document.getElementById('ribFamily').value,
+    offset: ribOffset,
+    limit: RIB_PAGE_SIZE
+  });
+  const prefix = document.getElementById('ribPrefix').value.trim();
+  const protocol = document.getElementById('ribProtocol').value;
+  const nextHop = document.getElementById('ribNextHop').value.trim();
+  if (prefix) params.set('prefix', prefix);
+  if (protocol) params.set('protocol', protocol);
+  if (nextHop) params.set('next_hop', nextHop);
+  if (document.getElementById('ribSelected').checked) params.set('selected', '1');
+  if (refresh) params.set('refresh', '1');
+
+  const summary = document.getElementById('ribSummary');
+  summary.textContent = 'Loading…';
+
+  try {
+    const response = await fetch(`/static-routes/api/rib?${params}`);
+    const data = await response.json();
+
+    if (data.status !== 'ok') {
+      summary.textContent = data.message || 'Failed to load routing table';
+      renderRoutes([]);
+      return;
+    }
+
+    ribTotal = data.total;
+    summary.textContent = `${data.total.toLocaleString()} matching of ${data.table_size.toLocaleString()} routes`;
+    renderProtocols(data.protocols);
+    renderRoutes(data.routes);
+    updatePager(data.offset, data.routes.length);
+  } catch (error) {
+    console.error('Error loading routing table:', error);
+    summary.textContent = 'Failed to load routing table';
+  }
+}
+
+/**
+ * Fill the protocol filter with the protocols present in the table
+ */
+function renderProtocols(protocols) {
+  const select = document.getElementById('ribProtocol');
+  const current = select.value;
+  select.innerHTML = '<option value="">All</option>';
+  Object.entries(protocols || {}).forEach(([name, count]) => {
+    const option = document.createElement('option');
+    option.value = name;
+    option.textContent = `${name} (${count.toLocaleString()})`;
+    select.appendChild(option);
+  });
+  select.value = current;
+}
+
+/**
+ * Render one page of routes
+ */
+function renderRoutes(routes) {
+  const tbody = document.getElementById('ribTableBody');
+
+  if (routes.length === 0) {
+    tbody.innerHTML = `
+      <tr>
+        <td colspan="5" class="px-5 py-12 text-center text-gray-400">No routes match the current filter</td>
+      </tr>
+    `;
+    return;
+  }
+
+  tbody.innerHTML = routes.map(route => {
+    const hops = route.next_hops.map(hop => `
+      <div class="${hop.active ? 'text-cyan-300' : 'text-gray-500'}">
+        ${hop.via ? escapeHtml(hop.via) : '<span class="italic">directly connected</span>'}${hop.interface ? ` <span class="text-gray-400">(${escapeHtml(hop.interface)})</span>` : ''}
+      </div>
+    `).join('');
+
+    return `
+      <tr class="hover:bg-gradient-to-r hover:from-emerald-900/10 hover:to-teal-900/10 transition-all">
+        <td class="px-5 py-3 font-mono text-white">
+          ${escapeHtml(route.prefix)}
+          ${route.selected ? '<span class="ml-2 text-xs text-emerald-400" title="Selected route">&#9679;</span>' : ''}
+        </td>
+        <td class="px-5 py-3 text-gray-300">${escapeHtml(route.protocol)}</td>
+        <td class="px-5 py-3 font-mono">${hops}</td>
+        <td class="px-5 py-3 text-gray-400">${route.distance}/${route.metric}</td>
+        <td class="px-5 py-3 text-gray-400">${escapeHtml(route.uptime)}</td>
+      </tr>
+    `;
+  }).join('');
+}
+
+/**
+ * Update the pager controls
+ */
+function updatePager(offset, count) {
+  document.getElementById('ribPageInfo').textContent =
+    ribTotal ? `${(offset + 1).toLocaleString()}–${(offset + count).toLocaleString()}` : '-';
+  document.getElementById('ribPrevBtn').disabled = offset === 0;
+  document.getElementById('ribNextBtn').disabled = offset + count >= ribTotal;
+}
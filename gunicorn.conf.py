@@ -0,0 +1,59 @@
+"""
+Gunicorn settings for serving VyerWall GUI in production.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Concurrency model: a small number of worker processes, each serving requests
+from a pool of threads (gthread). Nearly every request waits on the router's
+HTTP API, so threads are what keep a slow commit from blocking other
+operators: it ties up one thread while the rest keep serving. Caches, rate
+trackers and top-talker counters live in process memory, so extra workers
+each hold their own copy; keep WEB_WORKERS at 1 unless CPU-bound page
+rendering becomes the bottleneck.
+"""
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DEVICE_TIMEOUT = int(os.getenv("VYDEVICE_TIMEOUT", "30"))
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+worker_class = "gthread"
+workers = int(os.getenv("WEB_WORKERS", "1"))
+# Each open log stream (/logs/api/stream) holds a thread for up to LOG_FOLLOW_TIMEOUT
+threads = int(os.getenv("WEB_THREADS", "16"))
+
+# Build the app and the shared device client once in the master; workers
+# inherit it on fork
+preload_app = True
+
+# gthread workers heartbeat from their main loop, so this only reaps a wedged
+# worker and never cuts off a slow request thread
+timeout = int(os.getenv("WEB_TIMEOUT", "120"))
+# On reload or shutdown, let in-flight device calls (commits included) finish
+graceful_timeout = int(os.getenv("WEB_GRACEFUL_TIMEOUT", str(DEVICE_TIMEOUT + 10)))
+keepalive = 5
+
+# Heartbeat files on tmpfs avoid stalls when /tmp is a slow container overlay
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("WEB_LOG_LEVEL", "info")
+
+
+def post_worker_init(worker):
+    """Start the background samplers in whichever worker takes the lock first."""
+    from app.core import start_samplers
+
+    if start_samplers(worker.wsgi, exclusive=True):
+        worker.log.info("Background samplers running in worker %s", worker.pid)
+
+
+def worker_exit(server, worker):
+    from app.core import stop_samplers
+
+    stop_samplers()
@@ -0,0 +1,33 @@
+"""Shared test setup: keep history databases out of the tree and samplers off."""
+import os
+import tempfile
+
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="vyerwall-tests-"))
+os.environ.setdefault("SAMPLERS_ENABLED", "false")
+
+import pytest
+from flask import Flask
+
+from app.pyvyos.rest import ApiResponse
+
+
+class FakeDevice:
+    """Router stand-in answering "show" commands from a dict keyed by the joined path."""
+
+    def __init__(self):
+        self.shows = {}
+
+    def show(self, path):
+        output = self.shows.get(" ".join(path), "")
+        if isinstance(output, ApiResponse):
+            return output
+        return ApiResponse(status=200, request={}, result=output, error=False)
+
+
+@pytest.fixture
+def device():
+    """A FakeDevice attached to a bare Flask app whose context is pushed for the test."""
+    app = Flask(__name__)
+    app.device = FakeDevice()
+    with app.app_context():
+        yield app.device
@@ -0,0 +1,85 @@
+"""Conntrack output must parse in both formats, aggregate in one pass and survive router errors."""
+import pytest
+
+from app.modules.dashboard import conntrack
+from app.modules.dashboard.conntrack import aggregate_connections, iter_connections, parse_conntrack_statistics
+from app.modules.interfaces.device import DeviceCommandError
+from app.pyvyos.rest import ApiResponse
+
+TABLE = """\
+Conntrack table
+CONN ID      Source               Destination          Protocol    TIMEOUT
+-----------  -------------------  -------------------  ----------  ---------
+1001         10.0.0.5:51000       192.0.2.10:443       tcp [6] ES  431999
+1002         10.0.0.6:40000       198.51.100.1:53      udp         29
+1003         [2001:db8::1]:5000   [2001:db8::2]:22     tcp [6] SS  120
+1004         10.0.0.5             192.0.2.10           icmp        30
+"""
+
+STATISTICS_TABLE = """\
+CPU    Found    Invalid    Insert    Insert fail    Drop    Early drop    Errors    Search restart
+-----  -------  ---------  --------  -------------  ------  ------------  --------  ----------------
+0      0        12         0         1              0       2             0         3
+1      0        8          0         0              0       1             0         4
+"""
+
+STATISTICS_RAW = """\
+cpu=0 found=0 invalid=5 insert=0 insert_failed=0 drop=0 early_drop=0 error=0 search_restart=1 entries=42
+cpu=1 found=0 invalid=7 insert=0 insert_failed=0 drop=0 early_drop=0 error=0 search_restart=2 entries=42
+"""
+
+
+def test_connections_parse_both_families_and_legacy_states():
+    connections = list(iter_connections(TABLE))
+
+    assert [connection.id for connection in connections] == ["1001", "1002", "1003", "1004"]
+    first = connections[0]
+    assert (first.protocol, first.state) == ("tcp", "ESTABLISHED")
+    assert (first.src, first.sport, first.dst, first.dport, first.timeout) == ("10.0.0.5", 51000, "192.0.2.10", 443, 431999)
+    assert (connections[1].protocol, connections[1].state) == ("udp", "")
+    assert (connections[2].src, connections[2].dport) == ("2001:db8::1", 22)
+    assert (connections[3].sport, connections[3].dport) == (None, None)
+
+    assert list(iter_connections("")) == []
+
+
+def test_statistics_table_and_raw_forms():
+    table = parse_conntrack_statistics(STATISTICS_TABLE)
+    assert len(table["cpus"]) == 2
+    assert table["totals"]["invalid"] == 20
+    assert table["totals"]["insert_failed"] == 1
+    assert table["totals"]["early_drop"] == 3
+    assert table["totals"]["search_restart"] == 7
+    assert table["entries"] is None
+
+    raw = parse_conntrack_statistics(STATISTICS_RAW)
+    assert raw["totals"]["invalid"] == 12
+    assert "entries" not in raw["totals"] and "cpu" not in raw["totals"]
+    assert raw["entries"] == 42
+
+
+def test_aggregates_count_by_zone_and_endpoint():
+    zones = {"10.0.0.5": "LAN", "10.0.0.6": "LAN", "192.0.2.10": "WAN"}
+    value = aggregate_connections(iter_connections(TABLE), zones.get, top=2)
+
+    assert value["total"] == 4
+    assert value["protocols"] == {"tcp": 2, "udp": 1, "icmp": 1}
+    assert value["states"] == {"ESTABLISHED": 1, "SYN_SENT": 1}
+    assert value["zone_pairs"][0] == {"source": "LAN", "destination": "WAN", "count": 2}
+    assert value["source_zones"] == {"LAN": 3, conntrack.UNZONED: 1}
+    assert value["top_sources"] == [{"address": "10.0.0.5", "count": 2}, {"address": "10.0.0.6", "count": 1}]
+    assert len(value["top_services"]) == 2
+
+
+def test_failed_fetch_keeps_the_previous_table(device, monkeypatch):
+    monkeypatch.setattr(conntrack, "_tables", {})
+    device.shows["conntrack table ipv4"] = ApiResponse(status=200, request={}, result="", error="conntrack timed out")
+    with pytest.raises(DeviceCommandError):
+        conntrack.query_connections("ipv4", force=True)
+
+    device.shows["conntrack table ipv4"] = TABLE
+    assert conntrack.query_connections("ipv4", force=True)["table_size"] == 4
+
+    device.shows["conntrack table ipv4"] = ApiResponse(status=500, request={}, result="", error=False)
+    page = conntrack.query_connections("ipv4", protocol="tcp", force=True)
+    assert (page["table_size"], page["total"]) == (4, 2)
@@ -0,0 +1,47 @@
+"""Subnet-ids must be handed out once, lowest first, and come back when released."""
+from app.modules.dhcp.allocator import SubnetIdAllocator, lowest_free_id, used_subnet_ids
+
+DHCP_CONFIG = {"shared-network-name": {
+    "LAN": {"subnet": {"10.0.0.0/24": {"subnet-id": "1"}, "10.0.1.0/24": {"subnet-id": "3"}}},
+    "IOT": {"subnet": {"10.0.2.0/24": {"subnet-id": "2"}, "10.0.3.0/24": {}}},
+}}
+
+
+def test_lowest_free_id_finds_the_first_gap():
+    assert lowest_free_id([]) == 1
+    assert lowest_free_id([1, 2, 3]) == 4
+    assert lowest_free_id([1, 2, 4, 5]) == 3
+    assert lowest_free_id([2, 3]) == 1
+    assert used_subnet_ids(DHCP_CONFIG) == [1, 2, 3]
+
+
+def test_peek_does_not_reserve_but_allocate_does():
+    allocator = SubnetIdAllocator()
+
+    assert allocator.peek(DHCP_CONFIG) == 4
+    assert allocator.peek(DHCP_CONFIG) == 4
+    assert allocator.allocate(DHCP_CONFIG) == 4
+    assert allocator.allocate(DHCP_CONFIG) == 5
+    assert allocator.peek(DHCP_CONFIG) == 6
+
+
+def test_released_and_expired_ids_are_reused():
+    allocator = SubnetIdAllocator()
+    first = allocator.allocate(DHCP_CONFIG)
+    allocator.allocate(DHCP_CONFIG)
+
+    allocator.release(first)
+    assert allocator.allocate(DHCP_CONFIG) == first
+
+    expiring = SubnetIdAllocator(reservation_ttl=0)
+    assert expiring.allocate(DHCP_CONFIG) == expiring.allocate(DHCP_CONFIG) == 4
+
+
+def test_claim_refuses_configured_and_reserved_ids():
+    allocator = SubnetIdAllocator()
+
+    assert not allocator.claim("2", DHCP_CONFIG)
+    assert not allocator.claim("zero", DHCP_CONFIG)
+    assert allocator.claim("7", DHCP_CONFIG)
+    assert not allocator.claim(7, DHCP_CONFIG)
+    assert allocator.allocate(DHCP_CONFIG) == 4
@@ -0,0 +1,43 @@
+"""Pool capacity must be counted on merged ranges without double counting."""
+from app.core import merge_intervals
+from app.modules.dhcp.capacity import pool_capacity_report, subnet_capacity
+
+
+def test_merge_intervals_joins_overlapping_and_adjacent_ranges():
+    assert merge_intervals([(10, 20), (1, 5), (6, 8), (15, 30), (40, 40)]) == [(1, 8), (10, 30), (40, 40)]
+    assert merge_intervals([(1, 100), (5, 10)]) == [(1, 100)]
+
+
+def test_overlapping_ranges_are_counted_once():
+    capacity = subnet_capacity({
+        "range": {
+            "0": {"start": "10.0.0.10", "stop": "10.0.0.59"},
+            "1": {"start": "10.0.0.50", "stop": "10.0.0.99"},
+        },
+        "exclude": ["10.0.0.20", "10.0.0.200"],
+        "static-mapping": {
+            "a": {"ip-address": "10.0.0.30"},
+            "b": {"ip-address": "10.0.0.20"},
+            "c": {"ip-address": "10.0.0.5"},
+        },
+    })
+
+    assert capacity["rangeSize"] == 90
+    assert capacity["excluded"] == 1
+    assert capacity["static"] == 1
+    assert capacity["capacity"] == 88
+
+
+def test_report_ignores_leases_outside_the_ranges_and_on_reserved_addresses():
+    config = {"shared-network-name": {"LAN": {"subnet": {"10.0.0.0/24": {
+        "range": {"0": {"start": "10.0.0.10", "stop": "10.0.0.13"}},
+        "exclude": ["10.0.0.13"],
+    }}}}}
+    leases = {"LAN": ["10.0.0.10", "10.0.0.11", "10.0.0.13", "10.0.0.99", "bogus"]}
+
+    [entry] = pool_capacity_report(config, leases, threshold=50)
+
+    assert entry["capacity"] == 3
+    assert entry["active"] == 2
+    assert entry["available"] == 1
+    assert entry["overThreshold"]
@@ -0,0 +1,42 @@
+"""The lease snapshot must be indexed correctly and survive failed fetches."""
+from app.modules.dhcp import history, leases
+from app.pyvyos.rest import ApiResponse
+
+LEASES = """\
+IP Address     MAC address        State    Lease start          Lease expiration     Remaining    Pool      Hostname
+-------------  -----------------  -------  -------------------  -------------------  -----------  --------  ----------
+10.9.0.10      00:11:22:33:44:55  active   2026/10/19 10:00:00  2026/10/20 10:00:00  23:59:00     TESTPOOL  laptop
+10.9.0.11      00:11:22:33:44:66  active   2026/10/19 10:00:00  2026/10/20 10:00:00  23:59:00     TESTPOOL
+"""
+
+
+def test_parse_leases_keeps_empty_hostname_columns():
+    records = leases.parse_leases(LEASES)
+
+    assert [record["ip"] for record in records] == ["10.9.0.10", "10.9.0.11"]
+    assert records[1]["hostname"] == ""
+    assert records[1]["pool"] == "TESTPOOL"
+
+
+def test_search_puts_exact_hits_first_and_honours_pool():
+    table = leases.LeaseTable(leases.parse_leases(LEASES))
+
+    assert [lease["ip"] for lease in table.search("10.9.0.11")] == ["10.9.0.11"]
+    assert [lease["ip"] for lease in table.search("laptop")] == ["10.9.0.10"]
+    assert [lease["ip"] for lease in table.search("00:11:22", pool="TESTPOOL")] == ["10.9.0.10", "10.9.0.11"]
+    assert table.search("00:11:22", pool="OTHER") == []
+    assert table.lookup(mac="00:11:22:33:44:66")[0]["ip"] == "10.9.0.11"
+
+
+def test_failed_fetch_records_no_expiries(device):
+    device.shows["dhcp server leases"] = LEASES
+    assert len(leases.get_lease_table(force=True)) == 2
+    assert history.record_snapshot in leases._listeners
+
+    device.shows["dhcp server leases"] = ApiResponse(status=200, request={}, result="", error="timed out")
+    assert len(leases.get_lease_table(force=True)) == 2
+
+    device.shows["dhcp server leases"] = ApiResponse(status=500, request={}, result="", error=False)
+    assert len(leases.get_lease_table(force=True)) == 2
+
+    assert history.query_events(pool="TESTPOOL", event="expired") == []
@@ -0,0 +1,57 @@
+"""Static mapping imports must catch duplicates and only touch changed leaves."""
+import io
+
+import pytest
+
+from app.core import load_json_upload
+from app.modules.dhcp.mappings import (
+    iter_mapping_rows,
+    plan_static_mapping_import,
+    static_mapping_of,
+)
+
+DHCP_CONFIG = {"shared-network-name": {"LAN": {"subnet": {"10.0.0.0/24": {"static-mapping": {
+    "printer": {"mac": "00:11:22:33:44:55", "ip-address": "10.0.0.5"},
+}}}}}}
+
+
+def _plan(csv_text):
+    return plan_static_mapping_import(iter_mapping_rows(io.StringIO(csv_text), "mappings.csv"), DHCP_CONFIG)
+
+
+def test_rows_resolve_to_their_scope_and_duplicates_are_rejected():
+    plan = _plan(
+        "name,mac,ip\n"
+        "laptop,00-11-22-33-44-66,10.0.0.10\n"
+        "phone,00:11:22:33:44:66,10.0.0.11\n"
+        "tablet,00:11:22:33:44:77,10.0.0.5\n"
+        "outside,00:11:22:33:44:88,192.168.9.9\n"
+    )
+
+    assert plan["created"] == 1
+    assert plan["rejected"] == 3
+    assert [error["row"] for error in plan["errors"]] == [3, 4, 5]
+    assert plan["operations"] == [
+        {"op": "set", "path": ["service", "dhcp-server", "shared-network-name", "LAN", "subnet", "10.0.0.0/24",
+                               "static-mapping", "laptop", "mac", "00:11:22:33:44:66"]},
+        {"op": "set", "path": ["service", "dhcp-server", "shared-network-name", "LAN", "subnet", "10.0.0.0/24",
+                               "static-mapping", "laptop", "ip-address", "10.0.0.10"]},
+    ]
+    assert {static_mapping_of(op) for op in plan["operations"]} == {
+        ("service", "dhcp-server", "shared-network-name", "LAN", "subnet", "10.0.0.0/24", "static-mapping", "laptop"),
+    }
+
+
+def test_existing_mapping_only_sets_changed_leaves():
+    plan = _plan("name,mac,ip,hostname\nprinter,00:11:22:33:44:55,10.0.0.5,lobby\n")
+
+    assert plan["updated"] == 1
+    assert [op["path"][-2:] for op in plan["operations"]] == [["hostname", "lobby"]]
+
+
+def test_json_uploads_are_capped_and_unwrapped():
+    with pytest.raises(ValueError):
+        load_json_upload(io.StringIO('[{"name": "a", "mac": "x"}]'), limit=16)
+
+    rows = list(iter_mapping_rows(io.StringIO('{"staticMappings": [{"Name": "a", "IP": "10.0.0.1"}]}'), "m.json"))
+    assert rows == [(1, {"name": "a", "ipAddress": "10.0.0.1"})]
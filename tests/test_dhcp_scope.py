@@ -0,0 +1,65 @@
+"""Scope updates must reduce to the smallest set of set/delete operations."""
+from app.modules.dhcp.scope import config_leaves, diff_scope_paths
+
+ROOT = ("service", "dhcp-server")
+SUBNET = ROOT + ("shared-network-name", "LAN", "subnet", "10.0.0.0/24")
+
+CONFIG = {"shared-network-name": {"LAN": {"subnet": {"10.0.0.0/24": {
+    "lease": "86400",
+    "name-server": ["10.0.0.1", "10.0.0.2"],
+    "static-mapping": {
+        "printer": {"mac": "00:11:22:33:44:55", "ip-address": "10.0.0.5"},
+        "nas": {"mac": "00:11:22:33:44:66", "ip-address": "10.0.0.6"},
+    },
+}}}}}
+
+
+def _diff(desired, current=None):
+    current = list(config_leaves(CONFIG, ROOT)) if current is None else current
+    return diff_scope_paths(current, desired, CONFIG, ROOT, min_depth=len(SUBNET) + 1)
+
+
+def _desired(**overrides):
+    leaves = {
+        SUBNET + ("lease", "86400"),
+        SUBNET + ("name-server", "10.0.0.1"),
+        SUBNET + ("name-server", "10.0.0.2"),
+        SUBNET + ("static-mapping", "printer", "mac", "00:11:22:33:44:55"),
+        SUBNET + ("static-mapping", "printer", "ip-address", "10.0.0.5"),
+        SUBNET + ("static-mapping", "nas", "mac", "00:11:22:33:44:66"),
+        SUBNET + ("static-mapping", "nas", "ip-address", "10.0.0.6"),
+    }
+    for leaf in overrides.get("drop", ()):
+        leaves.discard(leaf)
+    return leaves | set(overrides.get("add", ()))
+
+
+def test_unchanged_scope_produces_no_operations():
+    assert _diff(_desired()) == []
+
+
+def test_removed_mapping_is_one_delete():
+    desired = _desired(drop=[
+        SUBNET + ("static-mapping", "nas", "mac", "00:11:22:33:44:66"),
+        SUBNET + ("static-mapping", "nas", "ip-address", "10.0.0.6"),
+    ])
+
+    assert _diff(desired) == [{"op": "delete", "path": list(SUBNET + ("static-mapping", "nas"))}]
+
+
+def test_single_value_change_is_a_set_and_multi_value_removal_a_delete():
+    desired = _desired(
+        drop=[SUBNET + ("lease", "86400"), SUBNET + ("name-server", "10.0.0.2")],
+        add=[SUBNET + ("lease", "3600")],
+    )
+
+    assert _diff(desired) == [
+        {"op": "delete", "path": list(SUBNET + ("name-server", "10.0.0.2"))},
+        {"op": "set", "path": list(SUBNET + ("lease", "3600"))},
+    ]
+
+
+def test_current_paths_missing_from_the_router_are_ignored():
+    current = list(config_leaves(CONFIG, ROOT)) + [SUBNET + ("default-router", "10.0.0.1")]
+
+    assert _diff(_desired(), current) == []
@@ -0,0 +1,57 @@
+"""Firewall log parsing and top-talker counters must stay exact for heavy hitters."""
+from app.modules.firewall.activity import (
+    FirewallActivity,
+    SpaceSavingCounter,
+    parse_firewall_line,
+    parse_rule_prefix,
+)
+
+DROP = "kernel: [ipv4-NAM-WAN_IN-default-D]IN=eth0 OUT= MAC=aa SRC={src} DST=192.0.2.10 LEN=60 PROTO=TCP SPT=40000 DPT={dpt}"
+ACCEPT = "kernel: [WAN_LOCAL-10-A] IN=eth0 OUT= SRC=203.0.113.9 DST=192.0.2.10 PROTO=UDP SPT=53 DPT=5353"
+
+
+def test_rule_prefixes_and_packet_fields_are_parsed():
+    assert parse_rule_prefix("ipv4-NAM-WAN_IN-10-D") == {"chain": "NAM-WAN_IN", "rule": "10", "action": "drop"}
+    assert parse_rule_prefix("WAN_LOCAL-default-R")["action"] == "reject"
+    assert parse_rule_prefix("custom")["rule"] is None
+
+    packet = parse_firewall_line("Oct 19 10:00:01 vyos " + DROP.format(src="198.51.100.7", dpt=22))
+    assert (packet["action"], packet["in"], packet["out"]) == ("drop", "eth0", None)
+    assert (packet["src"], packet["proto"], packet["dpt"]) == ("198.51.100.7", "tcp", 22)
+    assert packet["timestamp"] is not None
+
+    assert parse_firewall_line("sshd[1]: Accepted password for admin from 10.0.0.2") is None
+    assert parse_firewall_line("kernel: [x-1-D] IN=eth0 SRC= DST=1.1.1.1") is None
+
+
+def test_space_saving_tracks_every_heavy_hitter_within_its_error():
+    counter = SpaceSavingCounter(capacity=8)
+    stream = ["a"] * 50 + ["b"] * 30 + [f"noise{i}" for i in range(100)] + ["a"] * 10
+    for key in stream:
+        counter.add(key)
+
+    # Anything seen more than total / capacity (190 / 8) times must be tracked
+    tracked = {key: (count, error) for key, count, error in counter.items()}
+    assert len(counter) == 8
+    assert counter.total == len(stream)
+    for key, true_count in (("a", 60), ("b", 30)):
+        count, error = tracked[key]
+        assert count - error <= true_count <= count
+
+
+def test_activity_window_counts_blocks_and_expires_old_buckets():
+    activity = FirewallActivity(window=600, buckets=10, capacity=10)
+    now = 1_000_000.0
+    lines = [DROP.format(src="198.51.100.7", dpt=22)] * 3 + [DROP.format(src="198.51.100.8", dpt=443), ACCEPT]
+    assert activity.record(lines, now=now) == 5
+
+    summary = activity.summary(limit=5, now=now)
+    assert (summary["logged"], summary["blocked"]) == (5, 4)
+    assert summary["top_sources"][0] == {"address": "198.51.100.7", "count": 3, "error": 0}
+    assert summary["top_ports"][0]["port"] == "tcp/22"
+    assert {rule["prefix"]: rule["blocking"] for rule in summary["rules"]} == {
+        "ipv4-NAM-WAN_IN-default-D": True, "WAN_LOCAL-10-A": False,
+    }
+
+    activity.record([], now=now + 600)
+    assert activity.summary(now=now + 600)["logged"] == 0
@@ -0,0 +1,44 @@
+"""Blocklist feed parsing and aggregation."""
+from app.modules.firewall_groups.feeds import (
+    collapse_feed,
+    iter_feed_entries,
+    merge_intervals,
+    render_group_members,
+)
+from app.modules.firewall_groups.utils import build_member_delta_operations
+
+
+def _ip(text):
+    a, b, c, d = (int(part) for part in text.split("."))
+    return (a << 24) | (b << 16) | (c << 8) | d
+
+
+def test_comments_blank_lines_and_csv_columns_are_skipped():
+    lines = ["# header", "", "10.0.0.1,spam", "10.0.0.2 ; trailing", "  ; comment", "﻿10.0.0.3"]
+
+    assert [entry for _, entry in iter_feed_entries(lines)] == ["10.0.0.1", "10.0.0.2", "10.0.0.3"]
+
+
+def test_overlapping_and_adjacent_intervals_merge():
+    assert merge_intervals([(5, 9), (1, 3), (4, 4), (20, 30), (25, 26)]) == [(1, 9), (20, 30)]
+
+
+def test_feed_collapses_to_minimal_prefixes():
+    feed = ["10.0.0.0/25", "10.0.0.128/25", "10.0.1.0", "10.0.1.1", "bogus", "2001:db8::1"]
+
+    result = collapse_feed(feed, 4)
+
+    assert result["accepted"] == 4
+    assert result["rejected"] == 2
+    assert [error["line"] for error in result["errors"]] == [5, 6]
+    assert result["intervals"] == [(_ip("10.0.0.0"), _ip("10.0.1.1"))]
+    assert render_group_members("network-group", result["intervals"]) == ["10.0.0.0/24", "10.0.1.0/31"]
+    assert render_group_members("address-group", result["intervals"]) == ["10.0.0.0-10.0.1.1"]
+
+
+def test_replacements_are_set_before_old_entries_are_deleted():
+    operations = build_member_delta_operations(
+        "network-group", "BLOCK", ["10.0.0.0/23"], ["10.0.0.0/24", "10.0.1.0/24"],
+    )
+
+    assert [op["op"] for op in operations] == ["set", "delete", "delete"]
@@ -0,0 +1,64 @@
+"""Firewall group index and group config paths."""
+from app.modules.firewall_groups.index import GroupIndex
+from app.modules.firewall_groups.utils import (
+    build_group_delete_commands,
+    build_member_delta_operations,
+    parse_firewall_groups,
+)
+
+GROUPS = {
+    "address-group": {"SERVERS": {"address": ["10.0.0.1", "10.0.0.2"]}},
+    "ipv6-address-group": {"SERVERS": {"address": "2001:db8::1"}},
+    "network-group": {"LANS": {"network": {"10.0.0.0/24": {}}}},
+    "dynamic-group": {"address-group": {"BANNED": {"description": "auto"}}},
+}
+
+FIREWALL = {
+    "ipv4": {
+        "name": {"WAN-LAN": {"rule": {"10": {"destination": {"group": {"address-group": "SERVERS"}}}}}},
+        "input": {"filter": {"rule": {"20": {
+            "source": {"group": {"network-group": "!LANS"}},
+            "add-address-to-group": {"source-address": {"address-group": "BANNED"}},
+        }}}},
+    },
+    "ipv6": {
+        "name": {"WAN6-LAN6": {"rule": {"5": {"destination": {"group": {"address-group": "SERVERS"}}}}}},
+    },
+}
+
+NAT = {"destination": {"rule": {"100": {"destination": {"group": {"address-group": "SERVERS"}}}}}}
+
+
+def test_references_are_recorded_per_group():
+    index = GroupIndex(GROUPS, FIREWALL, NAT)
+
+    assert [ref["ruleset"] for ref in index.references_for("address-group", "SERVERS")] == [
+        "firewall ipv4 name WAN-LAN", "nat destination",
+    ]
+    assert index.references_for("network-group", "LANS")[0]["rule"] == "20"
+    assert index.references_for("dynamic-group", "BANNED")[0]["side"] == "source"
+
+
+def test_ipv6_rules_reference_ipv6_groups():
+    index = GroupIndex(GROUPS, FIREWALL, NAT)
+
+    assert [ref["ruleset"] for ref in index.references_for("ipv6-address-group", "SERVERS")] == [
+        "firewall ipv6 name WAN6-LAN6",
+    ]
+
+
+def test_members_map_back_to_their_groups():
+    index = GroupIndex(GROUPS, FIREWALL, NAT)
+
+    assert index.groups_for_member("10.0.0.2") == ["address-group:SERVERS"]
+    assert index.get("network-group", "LANS")["members"] == ["10.0.0.0/24"]
+    assert index.names_by_type()["dynamic-group"] == ["BANNED"]
+
+
+def test_dynamic_group_paths_match_how_they_are_parsed():
+    assert parse_firewall_groups(GROUPS)["dynamic-group"][0]["name"] == "BANNED"
+    assert build_group_delete_commands("dynamic-group", "BANNED") == [
+        ["firewall", "group", "dynamic-group", "address-group", "BANNED"],
+    ]
+    operations = build_member_delta_operations("dynamic-group", "BANNED", ["192.0.2.1"], [])
+    assert operations[0]["path"][:5] == ["firewall", "group", "dynamic-group", "address-group", "BANNED"]
@@ -0,0 +1,24 @@
+"""Incremental group member changes."""
+from app.modules.firewall_groups.utils import build_member_delta_operations, diff_group_members
+
+
+def test_diff_keeps_input_order_and_drops_duplicates():
+    to_add, to_remove = diff_group_members(["a", "b", "c"], ["c", "d", "d", "e", "a"])
+
+    assert to_add == ["d", "e"]
+    assert to_remove == ["b"]
+
+
+def test_unchanged_members_produce_no_operations():
+    to_add, to_remove = diff_group_members(["a", "b"], ["b", "a"])
+
+    assert build_member_delta_operations("address-group", "G", to_add, to_remove) == []
+
+
+def test_delta_only_touches_changed_member_leaves():
+    operations = build_member_delta_operations("network-group", "NETS", ["10.1.0.0/16"], ["10.0.0.0/16"])
+
+    assert {(op["op"], tuple(op["path"])) for op in operations} == {
+        ("set", ("firewall", "group", "network-group", "NETS", "network", "10.1.0.0/16")),
+        ("delete", ("firewall", "group", "network-group", "NETS", "network", "10.0.0.0/16")),
+    }
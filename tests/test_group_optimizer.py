@@ -0,0 +1,27 @@
+"""Address and network group aggregation optimizer."""
+from app.modules.firewall_groups.optimizer import analyze_group
+
+
+def test_covered_and_adjacent_networks_collapse():
+    result = analyze_group("network-group", ["10.0.0.0/24", "10.0.0.128/25", "10.0.1.0/24", "192.0.2.0/24"])
+
+    assert result["optimized"] == ["10.0.0.0/23", "192.0.2.0/24"]
+    assert result["covered"] == [{"member": "10.0.0.128/25", "covered_by": "10.0.0.0/24"}]
+    assert result["merged"] == [{"members": ["10.0.0.0/24", "10.0.1.0/24"], "replacement": ["10.0.0.0/23"]}]
+    assert result["reduction"] == 2
+
+
+def test_already_minimal_group_is_unchanged():
+    members = ["10.0.0.1", "10.0.0.5-10.0.0.9"]
+
+    result = analyze_group("address-group", members)
+
+    assert result["optimized"] == members
+    assert result["merged"] == []
+    assert result["reduction"] == 0
+
+
+def test_unparseable_members_are_kept_as_they_are():
+    result = analyze_group("address-group", ["10.0.0.1", "10.0.0.2", "not-an-address"])
+
+    assert result["optimized"] == ["10.0.0.1-10.0.0.2", "not-an-address"]
@@ -0,0 +1,80 @@
+"""The interface detail parser must attach every line to the right interface."""
+from app.modules.interfaces.inventory import parse_interface_counters, parse_interface_detail
+
+DETAIL = """\
+eth0: <BROADCAST,MULTICAST,UP,LOWER_UP> mtu 1500 qdisc mq state UP group default qlen 1000
+    link/ether 00:50:56:00:00:01 brd ff:ff:ff:ff:ff:ff
+    inet 192.0.2.10/24 brd 192.0.2.255 scope global eth0
+    inet6 fe80::250:56ff:fe00:1/64 scope link
+    Description: WAN
+
+    RX:  bytes  packets  errors  dropped  overrun       mcast
+        123456     1000       0        0        0           3
+    TX:  bytes  packets  errors  dropped  carrier  collisions
+         65432      500       0        0        0           0
+
+eth0.20@eth0: <BROADCAST,MULTICAST,UP,LOWER_UP> mtu 1500 qdisc noqueue state UP group default qlen 1000
+    link/ether 00:50:56:00:00:01 brd ff:ff:ff:ff:ff:ff
+    inet 10.20.0.1/24 brd 10.20.0.255 scope global eth0.20
+    inet 10.21.0.1/24 brd 10.21.0.255 scope global eth0.20
+
+eth1: <BROADCAST,MULTICAST> mtu 9000 qdisc mq state DOWN group default qlen 1000
+    link/ether 00:50:56:00:00:02 brd ff:ff:ff:ff:ff:ff
+"""
+
+
+def test_detail_lines_are_attached_to_their_interface():
+    parsed, base = parse_interface_detail(DETAIL)
+
+    assert set(parsed) == {"eth0", "eth0.20@eth0", "eth1"}
+    assert base == {"eth0", "eth1"}
+
+    wan = parsed["eth0"]
+    assert (wan["state"], wan["mtu"], wan["mac"], wan["description"]) == ("UP", "1500", "00:50:56:00:00:01", "WAN")
+    assert wan["inet"] == ["192.0.2.10/24"]
+    assert wan["inet6"] == ["fe80::250:56ff:fe00:1/64"]
+    assert wan["rx"]["bytes"] == "123456"
+    assert wan["tx"]["collisions"] == "0"
+
+    assert parsed["eth0.20@eth0"]["inet"] == ["10.20.0.1/24", "10.21.0.1/24"]
+    assert parsed["eth0.20@eth0"]["rx"] == {}
+    assert (parsed["eth1"]["state"], parsed["eth1"]["mtu"]) == ("DOWN", "9000")
+
+
+def test_counter_rows_without_a_header_are_ignored():
+    parsed, _ = parse_interface_detail(
+        "eth2: <UP> mtu 1500 state UP\n"
+        "    1234 5678\n"
+        "    RX:  bytes  packets\n"
+        "    10 1\n"
+        "    20 2\n"
+    )
+
+    assert parsed["eth2"]["rx"] == {"bytes": "10", "packets": "1"}
+
+
+COUNTERS = """\
+Interface      Rx Packets    Rx Bytes    Tx Packets    Tx Bytes    Rx Dropped
+-------------  ------------  ----------  ------------  ----------  ------------
+eth0                   1000      123456           500       65432             0
+wg0                      12        2048
+br0.10                    1          64             2         128             1
+"""
+
+
+def test_counter_table_is_keyed_from_the_header():
+    counters = parse_interface_counters(COUNTERS)
+
+    assert [entry["name"] for entry in counters] == ["eth0", "wg0", "br0.10"]
+    assert counters[0]["rx_bytes"] == "123456"
+    assert counters[0]["rx_dropped"] == "0"
+    assert counters[1]["tx_bytes"] == ""
+    assert counters[2]["tx_packets"] == "2"
+
+
+def test_counters_fall_back_to_detail_blocks():
+    counters = parse_interface_counters(DETAIL)
+
+    assert counters[0]["name"] == "eth0"
+    assert counters[0]["rx_bytes"] == "123456"
+    assert counters[0]["tx_packets"] == "500"
@@ -0,0 +1,39 @@
+"""Enable/disable must resolve every interface type and skip no-op changes."""
+from app.modules.interfaces.power import plan_power_changes
+from app.modules.interfaces.types import interface_index
+
+INTERFACES = {
+    "ethernet": {"eth1": {"vif": {"10": {"disable": {}}}, "vif-s": {"100": {"vif-c": {"20": {}}}}}},
+    "wireguard": {"wg0": {"disable": {}}},
+    "bridge": "br0",
+    "unknown-type": {"x0": {}},
+}
+
+
+def test_registry_walks_every_type_and_sub_interface():
+    index = interface_index(INTERFACES)
+
+    assert set(index) == {"eth1", "eth1.10", "eth1.100", "eth1.100.20", "wg0", "br0"}
+    assert index["eth1.100.20"]["path"] == ["interfaces", "ethernet", "eth1", "vif-s", "100", "vif-c", "20"]
+    assert index["eth1.100.20"]["parent"] == "eth1.100"
+    assert index["wg0"]["type"] == "wireguard"
+
+
+def test_enable_only_touches_disabled_interfaces():
+    plan = plan_power_changes(["eth1.10@eth1", "wg0", "eth1", "eth9", "wg0"], "enable", INTERFACES)
+
+    assert plan["operations"] == [
+        {"op": "delete", "path": ["interfaces", "ethernet", "eth1", "vif", "10", "disable"]},
+        {"op": "delete", "path": ["interfaces", "wireguard", "wg0", "disable"]},
+    ]
+    assert [(result["iface"], result["status"]) for result in plan["results"]] == [
+        ("eth1.10", "pending"), ("wg0", "pending"), ("eth1", "unchanged"), ("eth9", "error"),
+    ]
+
+
+def test_disable_sets_the_flag_on_enabled_interfaces():
+    plan = plan_power_changes(["eth1.100.20", "wg0"], "disable", INTERFACES)
+
+    assert plan["operations"] == [
+        {"op": "set", "path": ["interfaces", "ethernet", "eth1", "vif-s", "100", "vif-c", "20", "disable"]},
+    ]
@@ -0,0 +1,62 @@
+"""Interface rates must follow the counters and survive bad samples."""
+import pytest
+
+from app.modules.interfaces import rates
+from app.modules.interfaces.device import DeviceCommandError
+from app.modules.interfaces.rates import RateTracker, RingBuffer
+from app.pyvyos.rest import ApiResponse
+
+
+def _sample(name, rx_bytes, rx_packets=0):
+    return {"name": name, "rx_bytes": str(rx_bytes), "rx_packets": str(rx_packets)}
+
+
+def test_ring_buffer_keeps_the_newest_values_in_order():
+    buffer = RingBuffer(3)
+    for value in range(5):
+        buffer.append(value)
+
+    assert buffer.values() == [2.0, 3.0, 4.0]
+    assert buffer.last() == 4.0
+
+
+def test_rates_are_deltas_over_elapsed_time_and_resets_are_skipped():
+    tracker = RateTracker(capacity=10)
+    tracker.record([_sample("eth0", 1000, 10)], now=100)
+    tracker.record([_sample("eth0", 3000, 30)], now=102)
+    tracker.record([_sample("eth0", 500, 5)], now=104)
+
+    history = tracker.history("eth0")
+    assert history["timestamps"] == [102.0]
+    assert history["rx_bps"] == [8000.0]
+    assert history["rx_pps"] == [10.0]
+
+
+def test_missing_interfaces_are_dropped_but_an_empty_sample_is_ignored():
+    tracker = RateTracker(capacity=10)
+    tracker.record([_sample("eth0", 0), _sample("eth1", 0)], now=100)
+    tracker.record([_sample("eth0", 100), _sample("eth1", 100)], now=101)
+
+    assert tracker.record([], now=102) == 0
+    assert set(tracker.current()) == {"eth0", "eth1"}
+    assert tracker.last_recorded == 101
+
+    tracker.record([_sample("eth0", 200)], now=103)
+    assert set(tracker.current()) == {"eth0"}
+
+
+def test_error_response_leaves_history_untouched(device, monkeypatch):
+    tracker = RateTracker(capacity=10)
+    monkeypatch.setattr(rates, "tracker", tracker)
+    device.shows["interfaces counters"] = (
+        "Interface  Rx Packets  Rx Bytes\n"
+        "---------  ----------  --------\n"
+        "eth0       10          1000\n"
+    )
+    rates.sample_interface_rates()
+
+    device.shows["interfaces counters"] = ApiResponse(status=500, request={}, result="", error="busy")
+    with pytest.raises(DeviceCommandError):
+        rates.sample_interface_rates()
+
+    assert set(tracker.current()) == {"eth0"}
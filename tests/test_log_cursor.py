@@ -0,0 +1,52 @@
+"""Log cursors must keep naming the same line as the log grows."""
+import pytest
+
+from app.modules.interfaces.device import DeviceCommandError
+from app.modules.logs.utils import LogFilter, fetch_log_lines, read_log_page, read_new_lines
+from app.pyvyos.rest import ApiResponse
+
+
+def _tail(log):
+    return lambda window: log[-window:]
+
+
+def test_appended_duplicate_is_not_dropped():
+    log = ["a 1", "b 2"]
+    _, cursor, _ = read_new_lines(None, _tail(log))
+
+    log += ["b 2", "c 3"]
+    new_lines, _, gap = read_new_lines(cursor, _tail(log))
+
+    assert [line for _, line in new_lines] == ["b 2", "c 3"]
+    assert not gap
+
+
+def test_follow_sees_every_line_of_a_repetitive_log():
+    log, seen, cursor = [], [], None
+    for step in range(200):
+        log += ["x", "y", "x", "x"][: step % 5]
+        new_lines, cursor, _ = read_new_lines(cursor, _tail(log))
+        seen += [line for _, line in new_lines]
+
+    assert seen == log
+
+
+def test_paging_back_through_periodic_lines_terminates():
+    log = [f"Jan  1 00:00:{i % 60:02d} host proc: message {i % 7}" for i in range(5000)]
+
+    page = read_log_page(LogFilter(), 1000, fetch=_tail(log))
+    total = len(page["entries"])
+    while page["older"]:
+        page = read_log_page(LogFilter(), 1000, before=page["older"], fetch=_tail(log))
+        total += len(page["entries"])
+
+    assert total == len(log)
+
+
+def test_failed_log_fetch_raises_instead_of_returning_no_lines(device):
+    device.shows["log tail 50"] = "Jan  1 00:00:01 host proc: one\n\nJan  1 00:00:02 host proc: two\n"
+    assert fetch_log_lines(50) == ["Jan  1 00:00:01 host proc: one", "Jan  1 00:00:02 host proc: two"]
+
+    device.shows["log tail 50"] = ApiResponse(status=200, request={}, result="", error="journal unavailable")
+    with pytest.raises(DeviceCommandError):
+        fetch_log_lines(50)
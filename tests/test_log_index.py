@@ -0,0 +1,42 @@
+"""The log index must ingest each line once and search it like the router's log."""
+import pytest
+
+from app.modules.interfaces.device import DeviceCommandError
+from app.modules.logs.index import build_match_query, index_stats, ingest_logs, search_logs
+from app.pyvyos.rest import ApiResponse
+
+LOG = [
+    "Oct 19 10:00:01 vyos dhcpd[812]: DHCPACK on 10.0.0.5 to 00:11:22:33:44:55 via eth1",
+    "Oct 19 10:00:02 vyos sshd[900]: Failed password for admin from 198.51.100.7 port 50000",
+    "Oct 19 10:00:03 vyos kernel: [FW-LAN-WAN-default-D] IN=eth1 OUT=eth0 SRC=10.0.0.5",
+]
+
+
+def test_match_query_quotes_terms_and_keeps_prefix_searches():
+    assert build_match_query('10.0.0.5 fail* "x') == '"10.0.0.5" AND "fail"* AND "x"'
+    assert build_match_query("  ") is None
+
+
+def test_ingest_is_incremental_and_search_filters(device):
+    device.shows["log tail 2000"] = "\n".join(LOG)
+    assert ingest_logs(now=1_000_000) == 3
+
+    device.shows["log tail 2000"] = "\n".join(LOG + ["Oct 19 10:00:04 vyos dhcpd[812]: DHCPACK on 10.0.0.6"])
+    assert ingest_logs(now=1_000_060) == 1
+
+    device.shows["log tail 2000"] = ApiResponse(status=500, request={}, result="", error=False)
+    with pytest.raises(DeviceCommandError):
+        ingest_logs(now=1_000_120)
+
+    assert [entry["message"] for entry in search_logs("10.0.0.5")["entries"]] == [LOG[2].split(": ", 1)[1], LOG[0].split(": ", 1)[1]]
+    assert len(search_logs(program="dhcpd")["entries"]) == 2
+    assert [entry["process"] for entry in search_logs("fail*")["entries"]] == ["sshd"]
+
+    first = search_logs(limit=2)
+    rest = search_logs(limit=2, before=first["next_before"])
+    assert len(first["entries"]) == 2 and len(rest["entries"]) == 2
+    assert first["entries"][0]["message"].endswith("10.0.0.6")
+    assert index_stats()["last_id"] == first["entries"][0]["id"]
+
+    with pytest.raises(ValueError):
+        search_logs(severity="loud")
@@ -0,0 +1,78 @@
+"""The RIB snapshot must parse FRR output compactly and page through it correctly."""
+import pytest
+
+from app.core import iter_lines
+from app.modules.interfaces.device import DeviceCommandError
+from app.modules.static_routes import rib
+from app.modules.static_routes.rib import RibTable
+from app.pyvyos.rest import ApiResponse
+
+SHOW_IP_ROUTE = """\
+Codes: K - kernel route, C - connected, S - static, R - RIP,
+       O - OSPF, I - IS-IS, B - BGP, E - EIGRP, N - NHRP,
+       > - selected route, * - FIB route, q - queued, r - rejected, b - backup
+
+S>* 0.0.0.0/0 [1/0] via 192.0.2.1, eth0, weight 1, 01:02:03
+C>* 10.0.0.0/16 is directly connected, eth1, 01:02:03
+B>* 10.1.0.0/24 [20/0] via 198.51.100.1, eth0, weight 1, 2d03h
+  *                    via 198.51.100.2, eth0, weight 1, 2d03h
+B   10.1.0.0/24 [200/0] via 198.51.100.9 (recursive), weight 1, 2d03h
+B>* 10.1.1.0/24 [20/0] via 198.51.100.1, eth0, weight 1, 2d03h
+  *                    via 198.51.100.2, eth0, weight 1, 2d03h
+S>* 172.16.0.0/12 [1/0] via 10.0.0.254, eth1, weight 1, 00:10:00
+"""
+
+
+def _table():
+    return RibTable(iter_lines(SHOW_IP_ROUTE))
+
+
+def test_routes_and_multipath_next_hops_are_parsed():
+    table = _table()
+
+    assert len(table) == 6
+    assert table.protocol_counts() == {"bgp": 3, "connected": 1, "static": 2}
+    assert len(table.group_values) == 5
+    assert table.groups[2] == table.groups[4]
+
+    ecmp = table.row(2)
+    assert ecmp["prefix"] == "10.1.0.0/24"
+    assert (ecmp["distance"], ecmp["selected"], ecmp["fib"]) == (20, True, True)
+    assert [hop["via"] for hop in ecmp["next_hops"]] == ["198.51.100.1", "198.51.100.2"]
+    assert ecmp["uptime"] == "2d03h"
+
+    backup = table.row(3)
+    assert (backup["selected"], backup["next_hops"][0]["via"]) == (False, "198.51.100.9")
+    assert table.row(1)["next_hops"] == [{"via": "", "interface": "eth1", "active": True}]
+
+
+def test_query_filters_and_pages():
+    table = _table()
+
+    inside = table.query(prefix="10.0.0.0/8")
+    assert [route["prefix"] for route in inside["routes"]] == ["10.0.0.0/16", "10.1.0.0/24", "10.1.0.0/24", "10.1.1.0/24"]
+
+    bgp = table.query(protocol="B", selected_only=True, offset=1, limit=1)
+    assert bgp["total"] == 2
+    assert [route["prefix"] for route in bgp["routes"]] == ["10.1.1.0/24"]
+
+    assert table.query(next_hop="10.0.0.254")["total"] == 1
+    assert table.query(offset=5, limit=10)["routes"][0]["prefix"] == "172.16.0.0/12"
+
+    with pytest.raises(ValueError):
+        table.query(protocol="carrier-pigeon")
+    with pytest.raises(ValueError):
+        table.query(prefix="2001:db8::/32")
+
+
+def test_failed_fetch_keeps_the_previous_table(device, monkeypatch):
+    monkeypatch.setattr(rib, "_snapshots", {})
+    device.shows["ip route"] = ApiResponse(status=200, request={}, result="", error="vtysh timed out")
+    with pytest.raises(DeviceCommandError):
+        rib.get_rib_table("ipv4", force=True)
+
+    device.shows["ip route"] = SHOW_IP_ROUTE
+    assert len(rib.get_rib_table("ipv4", force=True)) == 6
+
+    device.shows["ip route"] = ApiResponse(status=500, request={}, result="", error=False)
+    assert len(rib.get_rib_table("ipv4", force=True)) == 6
@@ -0,0 +1,49 @@
+"""Route imports and syncs must diff against the table and order adds before removes."""
+import io
+
+from app.modules.static_routes.sync import iter_route_list, iter_route_rows, plan_route_sync
+
+CURRENT = [
+    {"destination": "10.1.0.0/16", "next_hop": "192.0.2.1", "description": "branch"},
+    {"destination": "10.2.0.0/16", "next_hop": "192.0.2.1", "description": ""},
+    {"destination": "10.3.0.0/16", "next_hop": "192.0.2.3", "description": ""},
+]
+
+
+def test_sync_replaces_next_hops_with_adds_before_removes():
+    rows = iter_route_list([
+        {"destination": "10.1.0.0/16", "next_hop": "192.0.2.9", "description": "branch"},
+        {"destination": "10.2.0.0/16", "next_hop": "192.0.2.1", "description": "lab"},
+        {"destination": "10.4.0.5/16", "next_hop": "192.0.2.4"},
+    ])
+
+    plan = plan_route_sync(rows, CURRENT, prune=True)
+
+    assert [(op["op"], op["path"][3:]) for op in plan["operations"]] == [
+        ("set", ["10.1.0.0/16", "next-hop", "192.0.2.9"]),
+        ("set", ["10.4.0.0/16", "next-hop", "192.0.2.4"]),
+        ("set", ["10.2.0.0/16", "description", "lab"]),
+        ("delete", ["10.1.0.0/16", "next-hop", "192.0.2.1"]),
+        ("delete", ["10.3.0.0/16"]),
+    ]
+    assert plan["unchanged"] == 1
+    assert [route["destination"] for route in plan["remove"]] == ["10.1.0.0/16", "10.3.0.0/16"]
+
+
+def test_import_only_adds_and_rejects_bad_rows():
+    rows = iter_route_rows(io.StringIO(
+        "destination,next_hop,description\n"
+        "10.3.0.0/16,192.0.2.3,\n"
+        "10.5.0.0/16,192.0.2.5,new\n"
+        "10.5.0.0/16,192.0.2.5,new\n"
+        "10.6.0.0/16,192.0.2.6,one\n"
+        "10.6.0.0/16,192.0.2.7,two\n"
+        "not-a-prefix,192.0.2.8,\n"
+    ), "routes.csv")
+
+    plan = plan_route_sync(rows, CURRENT, prune=False)
+
+    assert plan["rejected"] == 3
+    assert [error["row"] for error in plan["errors"]] == [4, 6, 7]
+    assert plan["remove"] == []
+    assert [route["destination"] for route in plan["add"]] == ["10.5.0.0/16", "10.6.0.0/16"]
@@ -0,0 +1,64 @@
+"""The route table must answer longest-prefix and overlap queries like the router."""
+import ipaddress
+
+from app.modules.static_routes.table import PrefixTrie, RouteTable
+
+INTERFACES = {"ethernet": {
+    "eth0": {"address": "192.0.2.10/24"},
+    "eth1": {"address": ["10.0.0.1/16", "dhcp"]},
+}}
+STATIC = {
+    "route": {
+        "0.0.0.0/0": {"next-hop": {"192.0.2.1": {}}},
+        "10.0.5.0/24": {"next-hop": {"10.0.0.254": {}}},
+        "10.0.5.128/25": {"next-hop": {"10.0.0.254": {}}},
+        "172.16.0.0/12": {"next-hop": {"198.51.100.1": {}}},
+        "203.0.113.0/24": {"blackhole": {}},
+    },
+    "route6": {"2001:db8::/32": {"next-hop": {"fe80::1": {}}}},
+}
+
+
+def _table():
+    return RouteTable(STATIC, INTERFACES)
+
+
+def test_trie_yields_covering_prefixes_shortest_first_and_covered_ones():
+    trie = PrefixTrie(32)
+    for prefix in ("10.0.0.0/8", "10.1.0.0/16", "10.1.2.0/24", "10.2.0.0/16"):
+        trie.setdefault(ipaddress.ip_network(prefix), {"prefix": prefix})
+
+    address = int(ipaddress.ip_address("10.1.2.3"))
+    assert [entry["prefix"] for entry in trie.covering(address, 32)] == ["10.0.0.0/8", "10.1.0.0/16", "10.1.2.0/24"]
+    assert sorted(entry["prefix"] for entry in trie.covered(ipaddress.ip_network("10.0.0.0/8"))) == [
+        "10.1.0.0/16", "10.1.2.0/24", "10.2.0.0/16",
+    ]
+    assert trie.get(ipaddress.ip_network("10.3.0.0/16")) is None
+    assert trie.size == 4
+
+
+def test_lookup_takes_the_longest_prefix():
+    table = _table()
+
+    assert table.lookup("10.0.5.200") == {"prefix": "10.0.5.128/25", "source": "static", "next_hops": ["10.0.0.254"]}
+    assert table.lookup("10.0.9.9") == {"prefix": "10.0.0.0/16", "source": "connected", "interfaces": ["eth1"]}
+    assert table.lookup("8.8.8.8")["prefix"] == "0.0.0.0/0"
+    assert table.lookup("203.0.113.7") == {"prefix": "203.0.113.0/24", "source": "blackhole"}
+    assert table.lookup("2001:db8::1")["next_hops"] == ["fe80::1"]
+    assert table.lookup("2001:db9::1") is None
+
+
+def test_overlaps_and_route_analysis():
+    table = _table()
+
+    overlaps = table.overlaps("10.0.5.0/24")
+    assert [prefix["prefix"] for prefix in overlaps["covering"]] == ["0.0.0.0/0", "10.0.0.0/16"]
+    assert [prefix["prefix"] for prefix in overlaps["covered"]] == ["10.0.5.128/25"]
+
+    assert table.has_route("10.0.5.0/24", "10.0.0.254")
+    assert not table.has_route("10.0.5.0/24", "10.0.0.253")
+
+    issues = {issue["type"] for issue in table.analyse_route("10.0.5.128/25", "10.0.0.254")}
+    assert issues == {"overrides_connected", "redundant"}
+    assert {issue["type"] for issue in table.analyse_route("172.16.0.0/12", "198.51.100.1")} == {"unreachable_next_hop"}
+    assert {issue["type"] for issue in table.analyse_route("10.0.0.0/16", "10.0.0.9")} == {"shadowed"}
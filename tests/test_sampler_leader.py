@@ -0,0 +1,48 @@
+"""Only the worker holding the sampler lock may start the background samplers."""
+import fcntl
+import os
+import threading
+
+from flask import Flask
+
+from app.core import sampler
+
+
+def _isolate(monkeypatch, tmp_path):
+    monkeypatch.setattr(sampler, "SAMPLERS_ENABLED", True)
+    monkeypatch.setattr(sampler, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(sampler, "_leader_lock", None)
+    monkeypatch.setattr(sampler, "_samplers", {})
+    monkeypatch.setattr(sampler, "_threads", {})
+    monkeypatch.setattr(sampler, "_stop", threading.Event())
+
+
+def test_lock_held_elsewhere_starts_nothing(monkeypatch, tmp_path):
+    _isolate(monkeypatch, tmp_path)
+    sampler.register_sampler("noop", 60, lambda: None)
+
+    with open(os.path.join(tmp_path, "samplers.lock"), "w") as other_worker:
+        fcntl.flock(other_worker, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        assert not sampler.start_samplers(Flask(__name__), exclusive=True)
+    assert sampler._threads == {}
+
+
+def test_lock_holder_runs_each_sampler_once(monkeypatch, tmp_path):
+    _isolate(monkeypatch, tmp_path)
+    ran = threading.Event()
+    sampler.register_sampler("probe", 0.01, ran.set)
+    app = Flask(__name__)
+
+    try:
+        assert sampler.start_samplers(app, exclusive=True)
+        assert ran.wait(2)
+        thread = sampler._threads["probe"]
+        assert sampler.start_samplers(app, exclusive=True)
+        assert sampler._threads["probe"] is thread
+    finally:
+        sampler.stop_samplers()
+        sampler._threads["probe"].join(2)
+        sampler._leader_lock.close()
+
+    app.config["TESTING"] = True
+    assert not sampler.start_samplers(app)
@@ -0,0 +1,64 @@
+"""Bulk VLAN plans must catch every overlap and hand out subnet-ids in order."""
+import ipaddress
+
+from app.modules.interfaces.provision import NetworkIntervalIndex, plan_vlan_batch
+
+INTERFACES = {"ethernet": {
+    "eth1": {"address": "10.0.5.1/24"},
+    "eth0": {"address": "10.0.0.1/16"},
+    "eth2": {"address": ["192.168.1.1/24", "dhcp"]},
+}}
+
+
+def _plan(specs, interfaces=INTERFACES):
+    reserved = []
+
+    def allocate(dhcp_config):
+        reserved.append(len(reserved) + 1)
+        return reserved[-1]
+
+    return plan_vlan_batch(specs, interfaces, {}, {}, {}, allocate), reserved
+
+
+def test_existing_networks_are_indexed_even_when_they_overlap():
+    index = NetworkIntervalIndex()
+    index.cover(ipaddress.ip_network("10.0.5.0/24"), "eth1")
+    index.cover(ipaddress.ip_network("10.0.0.0/16"), "eth0")
+    index.cover(ipaddress.ip_network("10.0.5.0/24"), "eth3")
+
+    assert index.find_overlap(ipaddress.ip_network("10.0.9.0/24")) == "eth0"
+    assert index.find_overlap(ipaddress.ip_network("10.1.0.0/24")) is None
+
+
+def test_network_inside_a_wider_existing_network_is_rejected():
+    plan, reserved = _plan([{"parent": "eth2", "vlan_id": "9", "address": "10.0.9.1/24"}])
+
+    assert [error["message"] for error in plan["errors"]] == ["10.0.9.1/24 overlaps the network of eth0."]
+    assert reserved == []
+
+
+def test_batch_rejects_duplicates_and_overlaps_within_itself():
+    plan, _ = _plan([
+        {"parent": "eth2", "vlan_id": "10", "address": "10.10.0.1/24"},
+        {"parent": "eth2", "vlan_id": "10", "address": "10.11.0.1/24"},
+        {"parent": "eth2", "vlan_id": "11", "address": "10.10.0.129/25"},
+        {"parent": "eth9", "vlan_id": "12", "address": "10.12.0.1/24"},
+    ])
+
+    assert [error["index"] for error in plan["errors"]] == [1, 2, 3]
+    assert plan["commands"] == []
+
+
+def test_valid_batch_reserves_one_subnet_id_per_dhcp_scope():
+    plan, reserved = _plan([
+        {"parent": "eth2", "vlan_id": "20", "address": "10.20.0.1/24"},
+        {"parent": "eth2", "vlan_id": "21", "address": "10.21.0.1/24", "dhcp": False},
+        {"parent": "eth2", "vlan_id": "22", "mode": "dhcp"},
+        {"parent": "eth2", "vlan_id": "23", "address": "10.23.0.1/24"},
+    ])
+
+    assert plan["errors"] == []
+    assert plan["vlans"] == ["eth2.20", "eth2.21", "eth2.22", "eth2.23"]
+    assert plan["subnet_ids"] == reserved == [1, 2]
+    assert ["interfaces", "ethernet", "eth2", "vif", "22", "address", "dhcp"] in plan["commands"]
+    assert len(plan["commands"]) == len({tuple(command) for command in plan["commands"]})
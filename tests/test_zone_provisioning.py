@@ -0,0 +1,35 @@
+"""Bulk zone provisioning plans."""
+from app.modules.firewall.zone.utils import build_zone_provisioning_plan, should_seed_accept
+
+
+def _accepting(plan):
+    return {path[3] for path in plan if path[-2:] == ["action", "accept"]}
+
+
+def test_new_zone_accepts_intra_zone_local_and_wan_traffic():
+    plan = build_zone_provisioning_plan([("DMZ", ["eth3"])], {"LAN": {}, "LOCAL": {}, "WAN": {}}, set())
+
+    assert _accepting(plan) == {"DMZ-DMZ", "DMZ-LOCAL", "DMZ-WAN", "LOCAL-DMZ"}
+    assert ["firewall", "zone", "DMZ", "intra-zone-filtering", "firewall", "name", "DMZ-DMZ"] in plan
+    assert ["firewall", "zone", "DMZ", "member", "interface", "eth3"] in plan
+
+
+def test_existing_zone_pairs_are_not_seeded_accept():
+    assert not should_seed_accept("LAN", "LAN", {"DMZ"})
+    assert not should_seed_accept("LAN", "DMZ", {"DMZ"})
+
+
+def test_new_zones_are_bound_to_each_other_and_existing_zones_once():
+    plan = build_zone_provisioning_plan([("A", []), ("B", [])], {"LAN": {}}, set())
+
+    bindings = [path for path in plan if len(path) > 3 and path[3] == "from"]
+    assert len(bindings) == len({tuple(path) for path in bindings})
+    pairs = {(path[4], path[2]) for path in bindings}
+    assert pairs == {("A", "LAN"), ("LAN", "A"), ("B", "LAN"), ("LAN", "B"), ("A", "B"), ("B", "A")}
+
+
+def test_existing_firewalls_are_bound_but_not_reseeded():
+    plan = build_zone_provisioning_plan([("DMZ", [])], {"LAN": {}}, {"DMZ-LAN"})
+
+    assert not any(path[:4] == ["firewall", "ipv4", "name", "DMZ-LAN"] for path in plan)
+    assert ["firewall", "zone", "LAN", "from", "DMZ", "firewall", "name", "DMZ-LAN"] in plan
@@ -0,0 +1,59 @@
+"""Addresses must resolve to the zone of the interface that reaches them."""
+from app.modules.firewall.zone.resolver import ZoneResolver
+
+ZONES = {
+    "LAN": {"member": {"interface": ["eth1"]}},
+    "WAN": {"member": {"interface": ["eth0"]}},
+    "DMZ": {"member": {"interface": ["eth2"]}},
+}
+
+INTERFACES = {
+    "ethernet": {
+        "eth0": {"address": "192.0.2.2/24"},
+        "eth1": {"address": ["10.0.0.1/24", "2001:db8:1::1/64"]},
+        "eth2": {"address": "172.31.0.1/24"},
+    },
+}
+
+STATIC = {
+    "route": {
+        "0.0.0.0/0": {"next-hop": {"192.0.2.1": {}}},
+        "10.50.0.0/16": {"next-hop": {"10.0.0.254": {}}},
+        "10.50.1.0/24": {"next-hop": {"10.99.0.1": {}}},
+        "10.70.0.0/16": {"interface": {"eth2": {}}},
+    },
+}
+
+
+def _resolver(zones=ZONES):
+    return ZoneResolver(zones, INTERFACES, STATIC)
+
+
+def test_connected_and_local_addresses():
+    resolver = _resolver()
+
+    assert resolver.resolve("10.0.0.20") == "LAN"
+    assert resolver.resolve("2001:db8:1::20") == "LAN"
+    assert resolver.resolve("172.31.0.9") == "DMZ"
+    assert resolver.resolve("10.0.0.1") == "LAN"
+    assert resolver.resolve("not-an-address") is None
+
+    with_local = _resolver({**ZONES, "LOCAL": {"local-zone": {}}})
+    assert with_local.resolve("10.0.0.1") == "LOCAL"
+
+
+def test_static_routes_take_the_zone_of_their_next_hop_or_interface():
+    resolver = _resolver()
+
+    assert resolver.resolve("10.50.7.7") == "LAN"
+    assert resolver.resolve("10.70.0.9") == "DMZ"
+    assert resolver.resolve("198.51.100.7") == "WAN"
+    assert resolver.resolve("2001:db8:2::1") is None
+
+
+def test_next_hops_resolve_against_connected_subnets_only():
+    # 10.99.0.1 is not on a connected subnet; the default route inserted
+    # before it must not hand its zone to 10.50.1.0/24
+    resolver = _resolver()
+
+    assert resolver.resolve("10.50.1.5") == "LAN"
@@ -0,0 +1,11 @@
+"""
+WSGI entry point for production servers.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+The app is built without background samplers; gunicorn.conf.py starts them
+in one worker after the fork.
+"""
+from app import create_app
+
+app = create_app(start_background=False)